@@ -0,0 +1,140 @@
+"""
+Microbenchmark of calldata encoding on the swap paths.
+
+Compares the precomputed encoders of src.utils.calldata with the way the
+swap modules built the same calldata before (keccak per call, string
+padding, contract.encode_abi) and checks both produce identical bytes:
+
+    python -m benchmarks.calldata_benchmark --number 20000
+"""
+
+import argparse
+import time
+import timeit
+
+from eth_abi import abi
+from tabulate import tabulate
+from web3 import Web3
+
+from src.utils import calldata
+from src.utils.constants import ERC20_ABI
+
+# Kept here rather than imported from src.model.monad_xyz, whose package
+# import pulls in the whole monad_xyz module tree
+IZUMI_ROUTER_ABI = [
+    {"inputs": [{"name": "data", "type": "bytes[]"}], "name": "multicall", "outputs": [], "stateMutability": "payable", "type": "function"},
+    {"inputs": [], "name": "refundETH", "outputs": [], "stateMutability": "payable", "type": "function"},
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "path", "type": "bytes"},
+                    {"name": "recipient", "type": "address"},
+                    {"name": "amount", "type": "uint128"},
+                    {"name": "minAcquired", "type": "uint256"},
+                    {"name": "deadline", "type": "uint256"},
+                ],
+                "name": "params",
+                "type": "tuple",
+            }
+        ],
+        "name": "swapAmount",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {"inputs": [{"name": "minAmount", "type": "uint256"}, {"name": "recipient", "type": "address"}], "name": "unwrapWETH9", "outputs": [], "stateMutability": "payable", "type": "function"},
+]
+
+WEB3 = Web3()
+OWNER = "0x5B38Da6a701c568545dCfcB03FcB875f56beddC4"
+SPENDER = "0x88B96aF200c8a9c35442C8AC6cd3D22695AaE4F0"
+TOKEN = "0x760AfE86e5de5fa0Ee542fc7B7B713e1c5425701"
+TOKEN_OUT = "0xf817257fed379853cDe0fa4F97AB987181B1E5Ea"
+AMOUNT = 1234567890123456789
+DEADLINE = int(time.time()) + 3600
+# Built once, as get_contract serves them from its cache
+TOKEN_CONTRACT = WEB3.eth.contract(address=TOKEN, abi=ERC20_ABI)
+IZUMI_ROUTER = WEB3.eth.contract(abi=IZUMI_ROUTER_ABI)
+
+
+def approve_before() -> bytes:
+    function_signature = WEB3.keccak(text="approve(address,uint256)")[0:4]
+    padded_address = SPENDER[2:].zfill(64)
+    padded_amount = hex(AMOUNT)[2:].zfill(64)
+    return bytes.fromhex(function_signature.hex() + padded_address + padded_amount)
+
+
+def approve_after() -> bytes:
+    return calldata.approve(SPENDER, AMOUNT)
+
+
+def erc20_before(name: str, *args) -> bytes:
+    return bytes.fromhex(TOKEN_CONTRACT.encode_abi(name, list(args))[2:])
+
+
+def user_cmd_before() -> bytes:
+    encode_data = abi.encode(
+        ["address", "address", "uint16", "bool", "bool", "uint256", "uint8", "uint256", "uint256", "uint8"],
+        ["0x0000000000000000000000000000000000000000", TOKEN, 36000, True, True, AMOUNT, 0, 2**120, 0, 0],
+    )
+    function_selector = WEB3.keccak(text="userCmd(uint16,bytes)")[:4]
+    return function_selector + abi.encode(["uint16", "bytes"], [1, encode_data])
+
+
+def user_cmd_after() -> bytes:
+    cmd = calldata.ambient_swap_cmd(
+        "0x0000000000000000000000000000000000000000", TOKEN, 36000, True, True, AMOUNT, 0, 2**120, 0, 0
+    )
+    return calldata.ambient_user_cmd(1, cmd)
+
+
+def izumi_before() -> bytes:
+    path = bytes.fromhex(TOKEN[2:] + format(10000, "06x") + TOKEN_OUT[2:])
+    calls = [
+        IZUMI_ROUTER.encode_abi("swapAmount", [(path, SPENDER, AMOUNT, 0, DEADLINE)]),
+        IZUMI_ROUTER.encode_abi("unwrapWETH9", [0, OWNER]),
+        IZUMI_ROUTER.encode_abi("refundETH"),
+    ]
+    return bytes.fromhex(IZUMI_ROUTER.encode_abi("multicall", [calls])[2:])
+
+
+def izumi_after() -> bytes:
+    path = calldata.izumi_path(TOKEN, 10000, TOKEN_OUT)
+    calls = [
+        calldata.izumi_swap_amount(path, SPENDER, AMOUNT, 0, DEADLINE),
+        calldata.izumi_unwrap_weth9(0, OWNER),
+        calldata.izumi_refund_eth(),
+    ]
+    return calldata.izumi_multicall(calls)
+
+
+CASES = [
+    ("approve", approve_before, approve_after),
+    ("transfer", lambda: erc20_before("transfer", OWNER, AMOUNT), lambda: calldata.transfer(OWNER, AMOUNT)),
+    ("balanceOf", lambda: erc20_before("balanceOf", OWNER), lambda: calldata.balance_of(OWNER)),
+    ("allowance", lambda: erc20_before("allowance", OWNER, SPENDER), lambda: calldata.allowance(OWNER, SPENDER)),
+    ("Ambient userCmd", user_cmd_before, user_cmd_after),
+    ("Izumi swap multicall", izumi_before, izumi_after),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calldata encoding")
+    parser.add_argument("--number", type=int, default=5000, help="Encodings per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements, the best is reported")
+    args = parser.parse_args()
+
+    rows = []
+    for name, before, after in CASES:
+        if bytes(before()) != after():
+            raise SystemExit(f"{name}: encoders disagree")
+        before_us = min(timeit.repeat(before, number=args.number, repeat=args.repeat)) / args.number * 1e6
+        after_us = min(timeit.repeat(after, number=args.number, repeat=args.repeat)) / args.number * 1e6
+        rows.append([name, before_us, after_us, before_us / after_us])
+
+    print(tabulate(rows, headers=["Call", "Before (us)", "After (us)", "Speedup"], floatfmt=".1f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, keccak
+
+CHAIN_ID = 10143
+DEFAULT_BALANCE = 1000 * 10**18
+BASE_FEE = 50 * 10**9
+PRIORITY_FEE = 2 * 10**9
+GAS_ESTIMATE = 100_000
+
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector(
+    "aggregate3((address,bool,bytes)[])"
+)
+GET_ETH_BALANCE_SELECTOR = function_signature_to_4byte_selector("getEthBalance(address)")
+
+ZERO_HASH = "0x" + "00" * 32
+EMPTY_BLOOM = "0x" + "00" * 256
+
+
+class FakeMonadRPC:
+    """
+    Local stand-in for the Monad JSON-RPC endpoint.
+
+    Implements the methods the farm uses with an in-memory chain: every
+    address starts with DEFAULT_BALANCE, sent transactions bump the sender
+    nonce and get a successful receipt after block_time seconds. Every
+    request is delayed by latency_ms (plus up to jitter_ms) and a share of
+    HTTP requests, error_rate, is answered with 429 to exercise failover.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        jitter_ms: float = 20,
+        error_rate: float = 0.0,
+        block_time: float = 0.5,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.block_time = block_time
+
+        self.nonces: Dict[str, int] = defaultdict(int)
+        self.receipts: Dict[str, Dict] = {}
+        self.mined_at: Dict[str, float] = {}
+        self.started = time.monotonic()
+
+        self.http_requests = 0
+        self.rejected_requests = 0
+        self.calls: Counter = Counter()
+
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _block_number(self) -> int:
+        return int((time.monotonic() - self.started) / self.block_time) + 1
+
+    def _block(self, number: int) -> Dict[str, Any]:
+        return {
+            "number": hex(number),
+            "hash": "0x" + keccak(number.to_bytes(32, "big")).hex(),
+            "parentHash": ZERO_HASH,
+            "nonce": "0x0000000000000000",
+            "sha3Uncles": ZERO_HASH,
+            "logsBloom": EMPTY_BLOOM,
+            "transactionsRoot": ZERO_HASH,
+            "stateRoot": ZERO_HASH,
+            "receiptsRoot": ZERO_HASH,
+            "miner": "0x" + "00" * 20,
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "size": "0x0",
+            "gasLimit": hex(150_000_000),
+            "gasUsed": "0x0",
+            "timestamp": hex(int(time.time())),
+            "transactions": [],
+            "uncles": [],
+            "baseFeePerGas": hex(BASE_FEE),
+            "mixHash": ZERO_HASH,
+        }
+
+    def _call(self, tx: Dict[str, Any]) -> str:
+        data = bytes.fromhex(tx.get("data", tx.get("input", "0x"))[2:])
+        if data[:4] == AGGREGATE3_SELECTOR:
+            (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+            results = []
+            for _, _, call_data in calls:
+                if call_data[:4] == GET_ETH_BALANCE_SELECTOR:
+                    results.append((True, encode(["uint256"], [DEFAULT_BALANCE])))
+                else:
+                    results.append((True, encode(["uint256"], [0])))
+            return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+        # Anything else is answered like a balanceOf/allowance read
+        return "0x" + encode(["uint256"], [0]).hex()
+
+    def _send_raw_transaction(self, raw_tx: str) -> str:
+        sender = Account.recover_transaction(raw_tx).lower()
+        tx_hash = "0x" + keccak(hexstr=raw_tx).hex()
+        self.nonces[sender] += 1
+        self.mined_at[tx_hash] = time.monotonic() + self.block_time
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "blockHash": ZERO_HASH,
+            "from": sender,
+            "to": None,
+            "cumulativeGasUsed": hex(GAS_ESTIMATE),
+            "effectiveGasPrice": hex(BASE_FEE + PRIORITY_FEE),
+            "gasUsed": hex(GAS_ESTIMATE),
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": EMPTY_BLOOM,
+            "status": "0x1",
+            "type": "0x2",
+        }
+        return tx_hash
+
+    def _receipt(self, tx_hash: str) -> Optional[Dict]:
+        mined_at = self.mined_at.get(tx_hash)
+        if mined_at is None or time.monotonic() < mined_at:
+            return None
+        return {**self.receipts[tx_hash], "blockNumber": hex(self._block_number())}
+
+    def _result(self, method: str, params: list) -> Any:
+        if method == "eth_chainId":
+            return hex(CHAIN_ID)
+        if method == "net_version":
+            return str(CHAIN_ID)
+        if method == "eth_blockNumber":
+            return hex(self._block_number())
+        if method == "eth_getBlockByNumber":
+            return self._block(self._block_number())
+        if method == "eth_maxPriorityFeePerGas":
+            return hex(PRIORITY_FEE)
+        if method == "eth_gasPrice":
+            return hex(BASE_FEE + PRIORITY_FEE)
+        if method == "eth_getBalance":
+            return hex(DEFAULT_BALANCE)
+        if method == "eth_getTransactionCount":
+            return hex(self.nonces[params[0].lower()])
+        if method == "eth_estimateGas":
+            return hex(GAS_ESTIMATE)
+        if method == "eth_call":
+            return self._call(params[0])
+        if method == "eth_sendRawTransaction":
+            return self._send_raw_transaction(params[0])
+        if method == "eth_getTransactionReceipt":
+            return self._receipt(params[0])
+        raise KeyError(method)
+
+    def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        self.calls[method] += 1
+        try:
+            result = self._result(method, request.get("params", []))
+        except KeyError:
+            error = {"code": -32601, "message": f"the method {method} does not exist"}
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+        except Exception as e:
+            error = {"code": -32000, "message": str(e)}
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        await asyncio.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            self.rejected_requests += 1
+            return web.Response(status=429, text="Too Many Requests")
+
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self._respond(item) for item in body])
+        return web.json_response(self._respond(body))
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application(client_max_size=64 * 1024**2)
+        app.router.add_post("/", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}/"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
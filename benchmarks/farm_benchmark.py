@@ -0,0 +1,151 @@
+"""
+Offline throughput benchmark of the farm.
+
+Runs the account flow of Start for N synthetic wallets against a local
+fake Monad JSON-RPC server and reports accounts/minute, RPC calls per
+account and task latency. Run from the repository root, next to
+config.yaml and tasks.py:
+
+    python -m benchmarks.farm_benchmark --wallets 500 --threads 64 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from eth_account import Account
+from loguru import logger
+from tabulate import tabulate
+
+from benchmarks.fake_rpc import FakeMonadRPC
+from src.model.start import Start
+from src.utils.config import Config, get_config
+from src.utils.scheduler import Scheduler
+from src.utils.state_store import state_store
+from src.utils.web3_pool import close_web3_pool
+
+# On-chain only tasks, they need no proxies, captchas or third-party APIs
+DEFAULT_TASKS = ["magma", "apriori", "kintsu", "owlto", "logs"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the farm against a local fake RPC")
+    parser.add_argument("--wallets", type=int, default=200, help="Number of synthetic wallets")
+    parser.add_argument("--threads", type=int, default=50, help="Accounts processed at once")
+    parser.add_argument("--tasks", nargs="+", default=DEFAULT_TASKS, help="Tasks of every account")
+    parser.add_argument("--latency-ms", type=float, default=50, help="RPC response latency")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Random extra RPC latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--block-time", type=float, default=0.5, help="Seconds until a transaction is mined")
+    parser.add_argument(
+        "--action-pause", type=int, default=0, help="Seconds between the tasks of an account"
+    )
+    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args()
+
+
+def prepare_config(path: str, url: str, tasks: List[str], action_pause: int) -> Config:
+    """Load config.yaml pointed at the fake RPC, without retries and with fixed pauses."""
+    config = Config.load(path)
+    config.RPC.MONAD_RPC_URLS = [url]
+    config.FLOW.TASKS = list(tasks)
+    config.STATE.SKIP_COMPLETED_WITHIN_HOURS = 0
+    config.SETTINGS.ATTEMPTS = 1
+    config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS = (0, 0)
+    config.SETTINGS.PAUSE_BETWEEN_SWAPS = (0, 0)
+    config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS = (0, 0)
+    config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS = (action_pause, action_pause)
+    config.SETTINGS.RANDOM_INITIALIZATION_PAUSE = (0, 0)
+    # get_web3 and the fee oracle read the singleton
+    get_config._config = config
+    return config
+
+
+def percentile(values: List[float], percent: int) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    server = FakeMonadRPC(args.latency_ms, args.jitter_ms, args.error_rate, args.block_time)
+    url = await server.start()
+    config = prepare_config(args.config, url, args.tasks, args.action_pause)
+    state_store.path = os.path.join(tempfile.mkdtemp(), "state.db")
+
+    task_latencies: List[float] = []
+
+    class TimedStart(Start):
+        async def execute_task(self, task):
+            started = time.monotonic()
+            try:
+                return await super().execute_task(task)
+            finally:
+                task_latencies.append(time.monotonic() - started)
+
+    private_keys = [Account.create().key.hex() for _ in range(args.wallets)]
+    scheduler = Scheduler(args.threads)
+
+    async def account_flow(index: int, private_key: str) -> bool:
+        async with scheduler.slot():
+            instance = TimedStart(index, "", private_key, "", "", config)
+            return await instance.flow()
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *[account_flow(i, key) for i, key in enumerate(private_keys, start=1)]
+    )
+    elapsed = time.monotonic() - started
+
+    await close_web3_pool()
+    state_store.close()
+    await server.stop()
+
+    return {
+        "wallets": args.wallets,
+        "threads": args.threads,
+        "tasks": args.tasks,
+        "latency_ms": args.latency_ms,
+        "error_rate": args.error_rate,
+        "elapsed_seconds": round(elapsed, 2),
+        "accounts_per_minute": round(args.wallets / elapsed * 60, 1),
+        "failed_accounts": results.count(False),
+        "rpc_calls_per_account": round(server.total_calls / args.wallets, 2),
+        "http_requests_per_account": round(server.http_requests / args.wallets, 2),
+        "rejected_requests": server.rejected_requests,
+        "transactions_sent": server.calls["eth_sendRawTransaction"],
+        "task_latency_p50": round(percentile(task_latencies, 50), 3),
+        "task_latency_p95": round(percentile(task_latencies, 95), 3),
+        "calls_by_method": dict(server.calls.most_common()),
+    }
+
+
+def main():
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    report = asyncio.run(run(args))
+
+    rows = [[key, value] for key, value in report.items() if key != "calls_by_method"]
+    print(tabulate(rows, tablefmt="simple"))
+    print()
+    print(tabulate(report["calls_by_method"].items(), headers=["Method", "Calls"]))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
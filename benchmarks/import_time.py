@@ -0,0 +1,98 @@
+"""
+Cold-start import time of the farm.
+
+Imports a module in fresh interpreters and reports the median wall time
+plus the heaviest imports from python -X importtime. With --compare the
+same measurement is taken on another git revision, checked out into a
+temporary worktree:
+
+    python -m benchmarks.import_time --runs 10 --compare HEAD~1
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from tabulate import tabulate
+
+TIMER = "import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def run_python(root: str, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        [sys.executable, *args], cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"python {' '.join(args)} failed in {root}:\n{result.stderr}")
+    return result
+
+
+def measure(root: str, module: str, runs: int) -> List[float]:
+    """Seconds to import module in runs fresh interpreters started in root."""
+    timings = []
+    for _ in range(runs):
+        output = run_python(root, "-c", TIMER.format(module=module)).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def heaviest_imports(root: str, module: str, top: int) -> List[Tuple[str, float]]:
+    """Top-level packages by time spent importing their own modules, in milliseconds."""
+    stderr = run_python(root, "-X", "importtime", "-c", f"import {module}").stderr
+
+    packages: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, package = int(match.group(1)), match.group(2).split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us / 1000
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def report(label: str, root: str, args: argparse.Namespace) -> float:
+    timings = measure(root, args.module, args.runs)
+    median = statistics.median(timings)
+    print(f"{label}: import {args.module} median {median * 1000:.0f} ms "
+          f"(min {min(timings) * 1000:.0f} ms, {args.runs} runs)")
+    print(tabulate(heaviest_imports(root, args.module, args.top), headers=["Package", "ms"], floatfmt=".0f"))
+    print()
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("--module", default="process", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Heaviest packages to list")
+    parser.add_argument("--compare", metavar="REV", help="Also measure this git revision")
+    args = parser.parse_args()
+
+    root = os.getcwd()
+    current = report("working tree", root, args)
+    if not args.compare:
+        return
+
+    worktree = os.path.join(tempfile.mkdtemp(), "baseline")
+    subprocess.run(["git", "worktree", "add", "--detach", worktree, args.compare], check=True, capture_output=True)
+    try:
+        # config.yaml and tasks.py may be untracked local files
+        for name in ("config.yaml", "tasks.py"):
+            if os.path.exists(name) and not os.path.exists(os.path.join(worktree, name)):
+                shutil.copy(name, worktree)
+        baseline = report(args.compare, worktree, args)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], check=True)
+
+    print(f"Speedup: {baseline / current:.2f}x ({(baseline - current) * 1000:.0f} ms saved)")
+
+
+if __name__ == "__main__":
+    main()
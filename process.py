@@ -1,51 +1,58 @@
 import asyncio
+import functools
+import itertools
+import multiprocessing
+import queue as queue_module
 import random
+from typing import Callable, Iterable, List, Optional, Tuple
 
 from loguru import logger
 
-from src.model.disperse_from_one.instance import DisperseFromOneWallet
-from src.model.disperse_one_one.instance import DisperseOneOne
 import src.utils
-from src.utils.logs import report_error, report_success
+import src.utils.logs
+from src.utils.logs import LogSettings, configure_logging, report_error, report_success
 from src.utils.output import show_dev_info, show_logo
 import src.model
 from src.utils.statistics import print_wallets_stats
+from src.model.help.stats import collect_fleet_stats, derive_addresses
+from src.utils.chain_balances import chain_balances
+from src.utils.account_source import AccountSource, count_lines
+from src.utils.web3_pool import close_web3_pool
+from src.utils.state_store import state_store
+from src.model.aircraft.database import aircraft_database
+from src.utils.scheduler import Scheduler, pause
 
 
 async def start():
-    async def launch_wrapper(index, proxy, private_key, discord_token, email):
-        async with semaphore:
-            await account_flow(
-                index,
-                proxy,
-                private_key,
-                discord_token,
-                email,
-                config,
-                lock,
-            )
-
     show_logo()
     show_dev_info()
 
     print("\nAvailable options:\n")
     print("[1] 😈 Start farm")
     print("[2] 🔧 Edit config")
-    print("[3] 👋 Exit")
+    print("[3] 📊 Wallets stats")
+    print("[4] 👋 Exit")
     print()
 
     try:
-        choice = input("Enter option (1-3): ").strip()
+        choice = input("Enter option (1-4): ").strip()
     except Exception as e:
         logger.error(f"Input error: {e}")
         return
 
-    if choice == "3" or not choice:
+    if choice == "4" or not choice:
         return
     elif choice == "2":
         config_ui = src.utils.ConfigUI()
         config_ui.run()
         return
+    elif choice == "3":
+        config = src.utils.get_config()
+        private_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
+        await collect_fleet_stats(config, private_keys)
+        await close_web3_pool()
+        print_wallets_stats(config)
+        return
     elif choice == "1":
         pass
     else:
@@ -53,105 +60,356 @@ async def start():
         return
 
     config = src.utils.get_config()
+    if await run_farm(config) is not None:
+        print_wallets_stats(config)
+
+
+def disperse_result(success: bool) -> Tuple[int, int]:
+    """分发任务的结果，整个分发算作一次运行"""
+    return (1, 0) if success else (0, 1)
 
-    # 读取所有文件
-    proxies = src.utils.read_txt_file("proxies", "data/proxies.txt")
-    if len(proxies) == 0:
-        logger.error("No proxies found in data/proxies.txt")
-        return
+
+async def run_farm(
+    config: src.utils.config.Config,
+    keys_path: str = "data/private_keys.txt",
+    proxies_path: str = "data/proxies.txt",
+    faucet_keys_path: str = "data/keys_for_faucet.txt",
+    on_account_done: Optional[Callable[[int, bool], None]] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    运行配置中的任务，不显示菜单
+
+    参数：
+    config: 配置
+    keys_path: 私钥文件
+    proxies_path: 代理文件
+    faucet_keys_path: 农场账户私钥文件
+    on_account_done: 每个账户完成后调用 (账户索引, 是否成功)
+
+    返回：
+    (成功数量, 失败数量)，如果没有运行账户则为 None。分发任务作为一次运行计数
+    """
+
+    # 检查代理文件
+    if count_lines(proxies_path) == 0:
+        logger.error(f"No proxies found in {proxies_path}")
+        return None
 
     if "disperse_farm_accounts" in config.FLOW.TASKS:
-        main_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
-        farm_keys = src.utils.read_txt_file("private keys", "data/keys_for_faucet.txt")
+        from src.model.disperse_one_one.instance import DisperseOneOne
+
+        proxies = src.utils.read_txt_file("proxies", proxies_path)
+        main_keys = src.utils.read_txt_file("private keys", keys_path)
+        farm_keys = src.utils.read_txt_file("private keys", faucet_keys_path)
         disperse_one_one = DisperseOneOne(main_keys, farm_keys, proxies, config)
-        await disperse_one_one.disperse()
-        return
+        success = await disperse_one_one.disperse()
+        await close_web3_pool()
+        return disperse_result(success)
     elif "disperse_from_one_wallet" in config.FLOW.TASKS:
-        main_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
-        farm_keys = src.utils.read_txt_file("private keys", "data/keys_for_faucet.txt")
+        from src.model.disperse_from_one.instance import DisperseFromOneWallet
+
+        proxies = src.utils.read_txt_file("proxies", proxies_path)
+        main_keys = src.utils.read_txt_file("private keys", keys_path)
+        farm_keys = src.utils.read_txt_file("private keys", faucet_keys_path)
         disperse_one_wallet = DisperseFromOneWallet(
             farm_keys[0], main_keys, proxies, config
         )
-        await disperse_one_wallet.disperse()
-        return
+        success = await disperse_one_wallet.disperse()
+        await close_web3_pool()
+        return disperse_result(success)
 
     if "farm_faucet" in config.FLOW.TASKS:
-        private_keys = src.utils.read_txt_file(
-            "private keys", "data/keys_for_faucet.txt"
+        keys_path = faucet_keys_path
+
+    # 账户从文件中按需读取，不会一次加载所有私钥和代理
+    source = AccountSource.from_config(config, keys_path, proxies_path)
+    total_accounts = source.count()
+    if total_accounts == 0:
+        logger.error(f"No accounts selected from {keys_path}")
+        return None
+    logger.success(f"Successfully loaded {total_accounts} private keys.")
+
+    if source.uses_exact_accounts():
+        logger.info(
+            f"Using specific accounts: {config.SETTINGS.EXACT_ACCOUNTS_TO_USE}"
         )
+    logger.info(f"Starting with {total_accounts} accounts in random order...")
+
+    threads = config.SETTINGS.THREADS
+
+    await check_refuel_sources(config, source.private_keys())
+
+    processes = min(config.SETTINGS.PROCESSES, total_accounts)
+    if processes > 1:
+        succeeded, failed = await run_sharded(config, source, processes, on_account_done)
     else:
-        private_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
+        succeeded, failed = await run_accounts(config, source, threads, on_account_done)
+    await close_web3_pool()
+
+    logger.info(f"Task state: {state_store.summary()}")
+    state_store.close()
+    logger.success("Saved accounts and private keys to a file.")
+
+    return succeeded, failed
+
+
+# 每个并发位置最多同时存在的账户数（包括暂停中的账户）
+ACCOUNTS_IN_FLIGHT_PER_THREAD = 4
+# 运行前检查补充余额来源时每次读取的私钥数
+REFUEL_CHECK_CHUNK_SIZE = 5000
+# 警告中列出的无来源钱包数，完整列表只在 DEBUG 级别输出
+UNFUNDED_SAMPLE_SIZE = 5
+
+# 补充余额的任务 -> (配置部分, 目标链)
+REFUEL_TASKS = {
+    "gaszip": ("GASZIP", "Monad"),
+    "memebridge": ("MEMEBRIDGE", "Monad"),
+    "testnet_bridge": ("TESTNET_BRIDGE", "Sepolia"),
+}
+
+
+def _flow_task_names(tasks: List) -> List[str]:
+    """FLOW.TASKS 中的所有任务名称，包括 [] 和 () 中的任务"""
+    names = []
+    for task_item in tasks:
+        if isinstance(task_item, (list, tuple)):
+            names.extend(str(task).lower() for task in task_item)
+        else:
+            names.append(str(task_item).lower())
+    return names
 
-    # 定义帐户范围
-    start_index = config.SETTINGS.ACCOUNTS_RANGE[0]
-    end_index = config.SETTINGS.ACCOUNTS_RANGE[1]
 
-    # 如果两者都为 0，请检查 EXACT_ACCOUNTS_TO_USE
-    if start_index == 0 and end_index == 0:
-        if config.SETTINGS.EXACT_ACCOUNTS_TO_USE:
-            # 将帐号转换为索引（数字 - 1）
-            selected_indices = [i - 1 for i in config.SETTINGS.EXACT_ACCOUNTS_TO_USE]
-            accounts_to_process = [private_keys[i] for i in selected_indices]
+async def check_refuel_sources(
+    config: src.utils.config.Config, private_keys: Iterable[str]
+) -> None:
+    """
+    运行前一次性检查整个账户列表可以从哪些网络补充余额
+
+    私钥按 REFUEL_CHECK_CHUNK_SIZE 分块读取，每块每条链一次 Multicall3 查询，
+    所有链并发。只记录日志，账户运行时仍然会检查自己的余额
+    """
+    refuel_tasks = [task for task in REFUEL_TASKS if task in _flow_task_names(config.FLOW.TASKS)]
+    if not refuel_tasks:
+        return
+
+    try:
+        # 任务 -> [需要补充的钱包数, 无法补充的钱包数, 每个网络可以补充的钱包数]
+        totals = {task: [0, 0, {}] for task in refuel_tasks}
+        keys = iter(private_keys)
+        while True:
+            chunk = list(itertools.islice(keys, REFUEL_CHECK_CHUNK_SIZE))
+            if not chunk:
+                break
+            addresses = await derive_addresses(chunk)
+
+            for task in refuel_tasks:
+                section, destination = REFUEL_TASKS[task]
+                task_config = getattr(config, section)
+                networks = task_config.NETWORKS_TO_REFUEL_FROM
+                if not networks:
+                    continue
+
+                balances = await chain_balances.scan(addresses, [destination])
+                need_refuel = [
+                    address
+                    for address in addresses
+                    if float(balances.get(destination, {}).get(address, 0))
+                    < task_config.MINIMUM_BALANCE_TO_REFUEL
+                ]
+                if not need_refuel:
+                    continue
+
+                amount = task_config.AMOUNT_TO_REFUEL[1]
+                funding = await chain_balances.funding_networks(need_refuel, networks, amount)
+                unfunded = [address for address, sources in funding.items() if not sources]
+                total = totals[task]
+                total[0] += len(need_refuel)
+                total[1] += len(unfunded)
+                for network in networks:
+                    total[2][network] = total[2].get(network, 0) + sum(
+                        network in sources for sources in funding.values()
+                    )
+                if unfunded:
+                    sample = ", ".join(unfunded[:UNFUNDED_SAMPLE_SIZE])
+                    more = len(unfunded) - UNFUNDED_SAMPLE_SIZE
+                    logger.warning(
+                        f"{task}: {len(unfunded)} wallets have no network to refuel from: "
+                        f"{sample}" + (f" and {more} more" if more > 0 else "")
+                    )
+                    logger.debug(f"{task}: wallets with no network to refuel from: {', '.join(unfunded)}")
+
+        for task, (need_refuel, unfunded, per_network) in totals.items():
+            if not need_refuel:
+                logger.info(f"{task}: no wallet needs a refuel")
+                continue
+            amount = getattr(config, REFUEL_TASKS[task][0]).AMOUNT_TO_REFUEL[1]
             logger.info(
-                f"Using specific accounts: {config.SETTINGS.EXACT_ACCOUNTS_TO_USE}"
+                f"{task}: {need_refuel} wallets need a refuel of up to {amount}, "
+                f"{unfunded} of them have no source, "
+                f"wallets able to fund it per network: {per_network}"
             )
+    except Exception as e:
+        logger.error(f"Failed to check refuel sources: {e}")
 
-            # 为了与其他代码兼容
-            start_index = min(config.SETTINGS.EXACT_ACCOUNTS_TO_USE)
-            end_index = max(config.SETTINGS.EXACT_ACCOUNTS_TO_USE)
+
+async def run_accounts(
+    config: src.utils.config.Config,
+    accounts: Iterable[Tuple[int, str, str]],
+    threads: int,
+    on_account_done: Optional[Callable[[int, bool], None]] = None,
+) -> Tuple[int, int]:
+    """
+    在当前事件循环中运行账户 (账户索引, 代理, 私钥)
+
+    最多 threads 个账户同时工作，账户暂停时释放其位置给其他账户。
+    账户按需从 accounts 中读取，同时存在的账户最多为
+    threads * ACCOUNTS_IN_FLIGHT_PER_THREAD 个，内存不随账户数量增长
+
+    返回：
+    (成功数量, 失败数量)
+    """
+
+    def record(index, success):
+        nonlocal succeeded, failed
+        if success:
+            succeeded += 1
         else:
-            # 如果列表为空，我们将像以前一样处理所有帐户
-            accounts_to_process = private_keys
-            start_index = 1
-            end_index = len(private_keys)
-    else:
-        # Python 切片不包含最后一个元素，因此 +1
-        accounts_to_process = private_keys[start_index - 1 : end_index]
+            failed += 1
+        if on_account_done is not None:
+            on_account_done(index, success)
+
+    async def launch_wrapper(index, proxy, private_key):
+        success = False
+        try:
+            async with scheduler.slot():
+                success = await account_flow(
+                    index,
+                    proxy,
+                    private_key,
+                    "",
+                    "",
+                    config,
+                    lock,
+                )
+        finally:
+            in_flight.release()
+        record(index, success)
 
-    discord_tokens = [""] * len(accounts_to_process)
-    emails = [""] * len(accounts_to_process)
+    def launch_done(index, task):
+        running.discard(task)
+        # 异常结束的账户记为失败
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"[{index}] | Account crashed: {task.exception()}")
+            record(index, False)
 
-    threads = config.SETTINGS.THREADS
+    lock = asyncio.Lock()
+    scheduler = Scheduler(threads)
+    in_flight = asyncio.Semaphore(max(1, threads) * ACCOUNTS_IN_FLIGHT_PER_THREAD)
+    running = set()
+    succeeded = failed = 0
 
-    # 我们为选定的账户准备代理
-    cycled_proxies = [
-        proxies[i % len(proxies)] for i in range(len(accounts_to_process))
-    ]
+    for account in accounts:
+        await in_flight.acquire()
+        task = asyncio.create_task(launch_wrapper(*account))
+        running.add(task)
+        task.add_done_callback(functools.partial(launch_done, account[0]))
 
-    # 创建索引列表并对其进行打乱
-    shuffled_indices = list(range(len(accounts_to_process)))
-    random.shuffle(shuffled_indices)
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    return succeeded, failed
 
-    # 创建按帐户顺序排列的行
-    account_order = " ".join(str(start_index + idx) for idx in shuffled_indices)
+
+async def run_sharded(
+    config: src.utils.config.Config,
+    source: AccountSource,
+    processes: int,
+    on_account_done: Optional[Callable[[int, bool], None]] = None,
+) -> Tuple[int, int]:
+    """
+    将账户分配给多个工作进程，每个进程有自己的事件循环和 RPC 连接池
+
+    THREADS 是所有进程的总并发数。每个进程自己从文件中读取属于它的账户，
+    进度和钱包统计信息通过队列汇总到父进程。
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    threads = max(1, -(-config.SETTINGS.THREADS // processes))
+
+    workers = []
+    for shard_id in range(processes):
+        shard = source.for_shard(shard_id, processes)
+        worker = context.Process(
+            target=run_shard,
+            args=(shard_id + 1, config, shard, threads, queue, src.utils.logs.log_settings),
+            name=f"shard-{shard_id + 1}",
+        )
+        worker.start()
+        workers.append(worker)
     logger.info(
-        f"Starting with accounts {start_index} to {end_index} in random order..."
+        f"Started {processes} worker processes with {threads} threads each"
     )
-    logger.info(f"Accounts order: {account_order}")
 
-    lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(value=threads)
-    tasks = []
-
-    # 使用随机索引创建任务
-    for shuffled_idx in shuffled_indices:
-        tasks.append(
-            asyncio.create_task(
-                launch_wrapper(
-                    start_index + shuffled_idx,
-                    cycled_proxies[shuffled_idx],
-                    accounts_to_process[shuffled_idx],
-                    discord_tokens[shuffled_idx],
-                    emails[shuffled_idx],
-                )
-            )
+    loop = asyncio.get_running_loop()
+    succeeded = failed = 0
+    running = len(workers)
+    while running:
+        try:
+            message = await loop.run_in_executor(None, queue.get, True, 1)
+        except queue_module.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                logger.error(f"{running} worker processes exited without reporting")
+                break
+            continue
+
+        if message[0] == "account":
+            _, index, success = message
+            if success:
+                succeeded += 1
+            else:
+                failed += 1
+            if on_account_done is not None:
+                on_account_done(index, success)
+        elif message[0] == "done":
+            _, shard_id, wallets = message
+            config.WALLETS.wallets.extend(wallets)
+            running -= 1
+
+    for worker in workers:
+        worker.join()
+    # 工作进程不压缩共享的 AirCraft 日志，全部退出后由父进程合并
+    aircraft_database.reload()
+    aircraft_database.compact()
+    return succeeded, failed
+
+
+def run_shard(
+    shard_id: int,
+    config: src.utils.config.Config,
+    source: AccountSource,
+    threads: int,
+    queue,
+    log_settings: LogSettings,
+) -> None:
+    """工作进程入口，使用父进程的日志级别和输出"""
+    # 多个进程追加同一个日志文件，只有父进程可以轮转日志和压缩 AirCraft 数据库
+    configure_logging(
+        log_settings, prefix=f"<magenta>shard {shard_id}</magenta> | ", rotate=False
+    )
+    src.utils.config.get_config._config = config
+    aircraft_database.auto_compact = False
+
+    async def main():
+        await run_accounts(
+            config,
+            source,
+            threads,
+            lambda index, success: queue.put(("account", index, success)),
         )
+        await close_web3_pool()
 
-    await asyncio.gather(*tasks)
-
-    logger.success("Saved accounts and private keys to a file.")
-
-    print_wallets_stats(config)
+    asyncio.run(main())
+    state_store.close()
+    queue.put(("done", shard_id, config.WALLETS.wallets))
 
 
 async def account_flow(
@@ -162,14 +420,14 @@ async def account_flow(
     email: str,
     config: src.utils.config.Config,
     lock: asyncio.Lock,
-):
+) -> bool:
     try:
-        pause = random.randint(
+        pause_time = random.randint(
             config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[0],
             config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[1],
         )
-        logger.info(f"[{account_index}] Sleeping for {pause} seconds before start...")
-        await asyncio.sleep(pause)
+        logger.info(f"[{account_index}] Sleeping for {pause_time} seconds before start...")
+        await pause(pause_time)
 
         report = False
 
@@ -190,15 +448,18 @@ async def account_flow(
         else:
             await report_success(lock, private_key, proxy, discord_token)
 
-        pause = random.randint(
+        pause_time = random.randint(
             config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[0],
             config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[1],
         )
-        logger.info(f"Sleeping for {pause} seconds before next account...")
-        await asyncio.sleep(pause)
+        logger.info(f"Sleeping for {pause_time} seconds before next account...")
+        await pause(pause_time)
+
+        return not report
 
     except Exception as err:
         logger.error(f"{account_index} | Account flow failed: {err}")
+        return False
 
 
 async def wrapper(function, config: src.utils.config.Config, *args, **kwargs):
@@ -213,14 +474,14 @@ async def wrapper(function, config: src.utils.config.Config, *args, **kwargs):
                 return True
 
         if attempt < attempts - 1:  # Don't sleep after the last attempt
-            pause = random.randint(
+            pause_time = random.randint(
                 config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                 config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
             )
             logger.info(
-                f"Sleeping for {pause} seconds before next attempt {attempt+1}/{config.SETTINGS.ATTEMPTS}..."
+                f"Sleeping for {pause_time} seconds before next attempt {attempt+1}/{config.SETTINGS.ATTEMPTS}..."
             )
-            await asyncio.sleep(pause)
+            await pause(pause_time)
 
     return result
 
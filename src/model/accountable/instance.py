@@ -1,16 +1,20 @@
-import asyncio
 import random
 from typing import Dict
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.utils.client import create_client
 from src.utils.config import Config
 from loguru import logger
 from src.model.accountable.constants import ACCOUNTABLE_ABI
+from src.utils.scheduler import pause
 
 
 class Accountable:
@@ -29,24 +33,16 @@ class Accountable:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
         self.nft_contract_address = "0xfa67a16ccC5d2C3d80e5DaF692DDfbb53F8D7Cfd"
-        self.nft_contract = self.web3.eth.contract(
+        self.nft_contract = get_contract(self.web3,
             address=self.nft_contract_address,
             abi=ACCOUNTABLE_ABI
         )
 
     async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
     
     async def get_mint_signature(self, token_id: int):
         """Get signature for minting NFT."""
@@ -84,7 +80,7 @@ class Accountable:
                     logger.error(f"[{self.account_index}] Failed to get signature after {max_retries} attempts: {str(e)}")
                     return None
                 logger.error(f"[{self.account_index}] Attempt {attempt + 1} failed: {str(e)}")
-                await asyncio.sleep(random.randint(
+                await pause(random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
                 ))
@@ -154,7 +150,6 @@ class Accountable:
                     signature_bytes
                 ).build_transaction({
                     'from': self.account.address,
-                    'nonce': await self.web3.eth.get_transaction_count(self.account.address),
                     'gas': int(gas_estimate * 1.1),
                     'chainId': 10143,
                     'type': 2,
@@ -162,11 +157,10 @@ class Accountable:
                 })
 
                 # Sign and send transaction
-                signed_txn = self.web3.eth.account.sign_transaction(mint_txn, self.private_key)
-                tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                tx_hash = await sign_and_send(self.web3, mint_txn, self.private_key)
 
                 logger.info(f"[{self.account_index}] Waiting for mint transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt['status'] == 1:
                     logger.success(f"[{self.account_index}] Successfully minted NFT #{token_id}. TX: {EXPLORER_URL}{tx_hash.hex()}")
@@ -185,6 +179,6 @@ class Accountable:
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1]
                 )
                 logger.error(f"[{self.account_index}] Error minting NFT: {str(e)}. Sleeping for {random_pause} seconds")
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
         return False
@@ -0,0 +1,90 @@
+import json
+import os
+from typing import Dict, Optional
+
+from loguru import logger
+
+SNAPSHOT_PATH = "src/model/aircraft/database.json"
+LOG_PATH = "src/model/aircraft/database.jsonl"
+# Compact once the log holds this many more lines than there are wallets
+COMPACT_SLACK = 1000
+
+
+class AircraftDatabase:
+    """
+    AirCraft user info by wallet address, kept in memory.
+
+    The database.json snapshot and the database.jsonl append-only log are
+    read once on first use. Every save appends a single line to the log;
+    once the log grows well past the number of wallets it is folded back
+    into the snapshot.
+    """
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH, log_path: str = LOG_PATH):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self._data: Optional[Dict[str, Dict]] = None
+        self._log_lines = 0
+        self.auto_compact = True
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._data is not None:
+            return self._data
+
+        data = {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            logger.warning(f"Invalid JSON in {self.snapshot_path}, starting from an empty database")
+
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line of an interrupted write
+                        continue
+                    data[entry["address"]] = entry["user_info"]
+                    self._log_lines += 1
+        except FileNotFoundError:
+            pass
+
+        self._data = data
+        return data
+
+    def get(self, address: str) -> Optional[Dict]:
+        return self._load().get(address)
+
+    def save(self, address: str, user_info: Dict) -> None:
+        data = self._load()
+        data[address] = user_info
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"address": address, "user_info": user_info}) + "\n")
+        self._log_lines += 1
+
+        if self.auto_compact and self._log_lines > len(data) + COMPACT_SLACK:
+            self.compact()
+
+    def reload(self) -> None:
+        """Drop the in-memory state, the next access re-reads what other processes wrote."""
+        self._data = None
+        self._log_lines = 0
+
+    def compact(self) -> None:
+        """Write the in-memory state to the snapshot and empty the log."""
+        data = self._load()
+        if not self._log_lines:
+            return
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, self.snapshot_path)
+        open(self.log_path, "w", encoding="utf-8").close()
+        self._log_lines = 0
+
+
+aircraft_database = AircraftDatabase()
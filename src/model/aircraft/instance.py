@@ -1,19 +1,20 @@
-import asyncio
 import random
-import json
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from typing import Dict, Optional
 from eth_account.messages import encode_defunct
 import functools
 
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
-
-# Global database lock for thread safety
-_db_lock = asyncio.Lock()
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.model.aircraft.database import aircraft_database
+from src.utils.scheduler import pause
 
 def with_retries(func):
     """Decorator to add retry functionality to async methods."""
@@ -32,44 +33,13 @@ def with_retries(func):
                 if attempt < attempts - 1:  # Don't sleep on the last attempt
                     pause_time = random.uniform(pause_range[0], pause_range[1])
                     logger.info(f"[{self.account_index}] Waiting {pause_time:.2f} seconds before next attempt...")
-                    await asyncio.sleep(pause_time)
+                    await pause(pause_time)
                 
         logger.error(f"[{self.account_index}] All {attempts} attempts failed for {func.__name__}")
         raise last_exception
 
     return wrapper
 
-async def read_database() -> Dict:
-    """Thread-safe function to read the database file."""
-    try:
-        async with _db_lock:
-            try:
-                with open("src/model/aircraft/database.json", "r", encoding='utf-8') as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                # Create new database file if it doesn't exist
-                with open("src/model/aircraft/database.json", "w", encoding='utf-8') as f:
-                    json.dump({}, f)
-                return {}
-            except json.JSONDecodeError:
-                # Reset database if JSON is invalid
-                with open("src/model/aircraft/database.json", "w", encoding='utf-8') as f:
-                    json.dump({}, f)
-                return {}
-    except Exception as e:
-        logger.error(f"Error reading database: {e}")
-        return {}
-
-async def write_database(data: Dict) -> None:
-    """Thread-safe function to write to the database file."""
-    async with _db_lock:
-        try:
-            with open("src/model/aircraft/database.json", "w", encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            logger.error(f"Error writing to database: {e}")
-            raise
-
 class Aircraft:
     def __init__(
         self,
@@ -87,7 +57,7 @@ class Aircraft:
         self.auth_token = None
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     def get_auth_headers(self) -> Dict[str, str]:
         """Get headers with authorization if token is available."""
@@ -99,17 +69,7 @@ class Aircraft:
     @with_retries
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     @with_retries
     async def estimate_gas(self, transaction: dict) -> int:
@@ -203,26 +163,17 @@ class Aircraft:
             raise e
 
     async def check_database(self, address: str) -> Optional[Dict]:
-        """Thread-safe check if address has user info in database."""
+        """Check if address has user info in database."""
         try:
-            data = await read_database()
-            # logger.debug(f"[{self.account_index}] Database content: {json.dumps(data, indent=2)}")
-            return data.get(address)
+            return aircraft_database.get(address)
         except Exception as e:
             logger.error(f"[{self.account_index}] Error checking database: {e}")
             return None
 
     async def save_to_database(self, address: str, user_info: Dict) -> None:
-        """Thread-safe save user info to database."""
+        """Save user info to database."""
         try:
-            # Read current database
-            data = await read_database()
-            
-            # Update data with user info
-            data[address] = user_info
-            
-            # Save back to file
-            await write_database(data)
+            aircraft_database.save(address, user_info)
             logger.info(f"[{self.account_index}] Saved user info to database")
             
         except Exception as e:
@@ -414,8 +365,8 @@ class Aircraft:
             
         return response_data['data']
 
-    async def prepare_and_sign_transaction(self, payment_data: Dict) -> tuple:
-        """Prepare and sign the transaction."""
+    async def prepare_transaction(self, payment_data: Dict) -> tuple:
+        """Prepare the feed transaction."""
         # Sign the user hashed message
         message_hash = payment_data['params']['userHashedMessage']
         message = encode_defunct(hexstr=message_hash)
@@ -444,14 +395,12 @@ class Aircraft:
             bytes.fromhex(params['integritySignature'][2:])
         )
         
-        # Get nonce and gas parameters
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
+        # Get gas parameters
         gas_params = await self.get_gas_params()
         
         # Build transaction
         tx = await transaction.build_transaction({
             'from': self.account.address,
-            'nonce': nonce,
             **gas_params
         })
         
@@ -463,9 +412,7 @@ class Aircraft:
             logger.error(f"[{self.account_index}] Error estimating gas: {e}. Using default gas limit")
             raise
         
-        # Sign transaction
-        signed_tx = self.account.sign_transaction(tx)
-        return signed_tx, user_signature
+        return tx, user_signature
 
     @with_retries
     async def create_feed_order(self, candidate_id: str) -> Dict:
@@ -481,14 +428,14 @@ class Aircraft:
             # Create initial feed order
             order_data = await self.create_feed_order_request(candidate_id, user_info)
             
-            # Prepare and sign transaction
-            signed_tx, _ = await self.prepare_and_sign_transaction(order_data['payment'])
+            # Prepare transaction
+            tx, _ = await self.prepare_transaction(order_data['payment'])
             
-            # Send transaction and wait for confirmation
-            tx_hash, _ = await self.send_and_wait_transaction(signed_tx)
+            # Sign, send transaction and wait for confirmation
+            tx_hash, _ = await self.send_and_wait_transaction(tx)
             
             # Add delay after transaction confirmation
-            await asyncio.sleep(5)
+            await pause(5)
             
             # Confirm the feed order
             await self.confirm_feed_order(
@@ -539,12 +486,12 @@ class Aircraft:
         return connect_data
 
     @with_retries
-    async def send_and_wait_transaction(self, signed_tx) -> tuple:
-        """Send transaction and wait for receipt."""
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    async def send_and_wait_transaction(self, tx: Dict) -> tuple:
+        """Sign and send transaction and wait for receipt."""
+        tx_hash = await sign_and_send(self.web3, tx, self.account.key)
         logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
         
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
         
         if receipt['status'] == 1:
             logger.success(f"[{self.account_index}] Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
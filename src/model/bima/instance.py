@@ -1,13 +1,18 @@
-import asyncio
 import random
 from typing import Dict
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.scheduler import pause
 from .constants import (
     FAUCET_ADDRESS,
     FAUCET_ABI,
@@ -35,7 +40,7 @@ class Bima:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     async def login(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
@@ -90,7 +95,7 @@ class Bima:
                 logger.error(
                     f"[{self.account_index}] Error in login Bima: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
         return False
 
@@ -100,7 +105,7 @@ class Bima:
                 logger.info(f"[{self.account_index}] Lending on Bima...")
 
                 # 创建代币合约
-                token_contract = self.web3.eth.contract(address=bmBTC, abi=TOKEN_ABI)
+                token_contract = get_contract(self.web3, address=bmBTC, abi=TOKEN_ABI)
 
                 # 我们得到了代币的余额
                 balance = await token_contract.functions.balanceOf(
@@ -143,12 +148,12 @@ class Bima:
                 logger.info(
                     f"[{self.account_index}] Sleeping for {random_pause} seconds after approve"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
                 # 2. 然后我们确实提供抵押品
                 logger.info(f"[{self.account_index}] Supplying collateral...")
 
-                lending_contract = Web3().eth.contract(
+                lending_contract = get_contract(None,
                     address=SPENDER_ADDRESS, abi=LENDING_ABI
                 )
                 gas_params = await self._get_gas_params()
@@ -174,27 +179,18 @@ class Bima:
                 # 添加剩余交易参数
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 # 等待交易确认
                 logger.info(
                     f"[{self.account_index}] Waiting for supply confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully supplied collateral. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -209,7 +205,7 @@ class Bima:
                 logger.error(
                     f"[{self.account_index}] Error in lend Bima: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
 
         return False
@@ -217,7 +213,7 @@ class Bima:
     # 批准代币支出的辅助方法
     async def _approve_token(self, amount: int):
         """Helper method to approve token spending"""
-        contract = Web3().eth.contract(address=bmBTC, abi=TOKEN_ABI)
+        contract = get_contract(None, address=bmBTC, abi=TOKEN_ABI)
         gas_params = await self._get_gas_params()
 
         transaction = {
@@ -236,22 +232,15 @@ class Bima:
 
         transaction.update(
             {
-                "nonce": await self.web3.eth.get_transaction_count(
-                    self.account.address,
-                    "latest",
-                ),
                 "gas": estimated_gas,
                 **gas_params,
             }
         )
 
-        signed_txn = self.web3.eth.account.sign_transaction(
-            transaction, self.private_key
-        )
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
         logger.info(f"[{self.account_index}] Waiting for approve confirmation...")
-        await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        await wait_for_receipt(self.web3, tx_hash)
 
         logger.success(
             f"[{self.account_index}] Successfully approved bmBTC for lending. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -269,7 +258,7 @@ class Bima:
                 )
 
                 # 创建用于编码数据的同步版本的合约
-                contract = Web3().eth.contract(address=FAUCET_ADDRESS, abi=FAUCET_ABI)
+                contract = get_contract(None, address=FAUCET_ADDRESS, abi=FAUCET_ABI)
                 gas_params = await self._get_gas_params() # 从网络获取当前气体参数。
 
                 # 创建 gas 定价的基本交易
@@ -291,27 +280,18 @@ class Bima:
                 # 添加剩余交易参数
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 # 等待交易确认
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully got tokens from Bima faucet. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -326,7 +306,7 @@ class Bima:
                 logger.error(
                     f"[{self.account_index}] Error in get_faucet_tokens Bima: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
         return False
 
@@ -369,24 +349,14 @@ class Bima:
                 logger.error(
                     f"[{self.account_index}] Error in _get_nonce Bima: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
         return "", ""
 
     # 从网络获取当前气体参数。
     async def _get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     # 估算交易所需的 gas 并添加一些缓冲。
     async def _estimate_gas(self, transaction: dict) -> int:
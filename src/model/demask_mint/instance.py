@@ -1,12 +1,16 @@
-import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.utils.config import Config
+from src.utils.scheduler import pause
 from loguru import logger
 
 # 使用附加方法更新 NFT 合约的 ABI
@@ -61,10 +65,10 @@ class Demask:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
         self.nft_contract_address = "0x2CDd146Aa75FFA605ff7c5Cc5f62D3B52C140f9c"  # 更新了 DeMask 的合约地址
-        self.nft_contract: Contract = self.web3.eth.contract(
+        self.nft_contract: Contract = get_contract(self.web3,
             address=self.nft_contract_address, abi=ERC1155_ABI
         )
 
@@ -174,26 +178,16 @@ class Demask:
                     {
                         "from": self.account.address,
                         "value": self.web3.to_wei(0.1, "ether"),  # Оплата 0.1 MON
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "maxFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
+                        "maxPriorityFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
                     }
                 )
 
                 # 我们签署交易
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    mint_txn, self.private_key
-                )
-
-                # 发送交易
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, mint_txn, self.private_key)
 
                 # 我们正在等待确认
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -214,6 +208,6 @@ class Demask:
                 logger.error(
                     f"[{self.account_index}] Error in mint on DeMask: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
         return False
@@ -1,11 +1,13 @@
 import asyncio
 from loguru import logger
-from web3 import AsyncHTTPProvider, AsyncWeb3
 from typing import List
 import random
 
 from src.utils.config import Config
-from src.utils.constants import RPC_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from .utils import get_monad_balance, WalletInfo
 
 
@@ -17,10 +19,17 @@ class DisperseFromOneWallet:
         self.main_keys = main_keys
         self.proxies = proxies
         self.config = config
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     async def disperse(self):
         try:
+            if self.config.DISPERSE.MULTI_SEND:
+                from .multi_send import MultiSendDisperse
+
+                return await MultiSendDisperse(
+                    self.web3, self.farm_key, self.main_keys, self.config
+                ).disperse()
+
             logger.info("Starting disperse from one wallet process")
             # Get farm wallet account
             farm_account = self.web3.eth.account.from_key(self.farm_key)
@@ -29,9 +38,6 @@ class DisperseFromOneWallet:
             success_count = 0
             total_transfers = 0
 
-            # Get initial nonce
-            nonce = await self.web3.eth.get_transaction_count(farm_account.address)
-
             logger.info(f"Processing {len(self.main_keys)} main wallets")
             for index, main_key in enumerate(self.main_keys):
                 logger.info(f"Processing wallet {index+1}/{len(self.main_keys)}")
@@ -94,13 +100,12 @@ class DisperseFromOneWallet:
                     f"Initiating transfer of {amount_needed} MON to {main_account.address[:8]}..."
                 )
                 success = await self.transfer_to_wallet(
-                    farm_account, main_account.address, amount_needed, nonce
+                    farm_account, main_account.address, amount_needed
                 )
 
                 if success:
                     success_count += 1
-                    nonce += 1
-                    logger.info(f"Transfer successful. New nonce: {nonce}")
+                    logger.info("Transfer successful")
                 else:
                     logger.error("Transfer failed")
 
@@ -124,7 +129,6 @@ class DisperseFromOneWallet:
         farm_account,
         to_address: str,
         amount_eth: float,
-        nonce: int,
     ) -> bool:
         """Process a single transfer from farm wallet to main wallet."""
         try:
@@ -135,8 +139,7 @@ class DisperseFromOneWallet:
                 "from": farm_account.address,
                 "to": to_address,
                 "value": amount_wei,
-                "nonce": nonce,
-                "gasPrice": await self.web3.eth.gas_price,
+                "gasPrice": await get_fee_oracle(self.web3).get_gas_price(),
             }
 
             # Estimate gas and update transaction
@@ -144,15 +147,10 @@ class DisperseFromOneWallet:
             transaction["gas"] = gas
 
             # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                transaction, self.farm_key
-            )
-            tx_hash = await self.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
-            )
+            tx_hash = await sign_and_send(self.web3, transaction, self.farm_key)
 
             # Wait for transaction receipt
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
 
             if receipt["status"] == 1:
                 random_pause = random.uniform(
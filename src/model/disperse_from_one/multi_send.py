@@ -0,0 +1,262 @@
+import asyncio
+import random
+from typing import Dict, List, Optional, Tuple
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.exceptions import TimeExhausted
+
+from src.model.help.stats import derive_addresses
+from src.utils import calldata
+from src.utils.balance_scanner import scan_raw_balances
+from src.utils.config import Config
+from src.utils.constants import EXPLORER_URL, MULTICALL3_ADDRESS
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+
+# Gas set aside per recipient when budgeting the farm balance, a value call
+# to an empty account costs about 34k inside aggregate3Value
+MULTI_SEND_GAS_PER_RECIPIENT = 40_000
+# Base cost of every transaction, set aside once per chunk
+TRANSACTION_BASE_GAS = 21_000
+GAS_ESTIMATE_BUFFER = 1.1
+# Gas limit of an individual fallback transfer
+TRANSFER_GAS_LIMIT = int(TRANSACTION_BASE_GAS * GAS_ESTIMATE_BUFFER)
+
+# (recipient address, amount in wei)
+Transfer = Tuple[str, int]
+
+# Outcomes of a sent transaction
+CONFIRMED = "confirmed"
+FAILED = "failed"
+# No receipt within the timeout, or the send failed without a known hash:
+# the transaction may still be mined
+UNCONFIRMED = "unconfirmed"
+
+
+class MultiSendDisperse:
+    """
+    disperse_from_one_wallet with one transaction per chunk of recipients.
+
+    The farm wallet and all main wallets are read with one Multicall3
+    balance scan and every top-up amount is computed from that snapshot.
+    Recipients are then funded MULTI_SEND_CHUNK_SIZE at a time through
+    Multicall3.aggregate3Value, all chunks sent back to back and their
+    receipts awaited together. A chunk that cannot be estimated or that
+    reverts funded nobody (allowFailure is off), its recipients are paid
+    with individual transfers instead, also pipelined, as far as the farm
+    balance left after the gas the reverted chunk burnt allows. A chunk
+    whose outcome is unknown is never paid again.
+    """
+
+    def __init__(self, web3: AsyncWeb3, farm_key: str, main_keys: List[str], config: Config):
+        self.web3 = web3
+        self.farm_key = farm_key
+        self.main_keys = main_keys
+        self.config = config
+        self.farm_address = web3.eth.account.from_key(farm_key).address
+
+    def _chunk_cost(self, chunk: List[Transfer], gas_price: int) -> int:
+        """Farm balance set aside for a chunk: its amounts and gas."""
+        gas = TRANSACTION_BASE_GAS + MULTI_SEND_GAS_PER_RECIPIENT * len(chunk)
+        return sum(amount for _, amount in chunk) + gas_price * gas
+
+    async def plan(
+        self, gas_price: int, chunk_size: int
+    ) -> Optional[Tuple[List[Transfer], int]]:
+        """
+        Top-ups of every main wallet below its target balance, with the base
+        gas of each chunk of chunk_size set aside.
+
+        Returns:
+            (transfers, farm balance left unassigned), None if the farm balance is unknown
+        """
+        addresses = await derive_addresses(self.main_keys)
+        balances = await scan_raw_balances(
+            self.web3, [(self.farm_address, None)] + [(address, None) for address in addresses]
+        )
+        farm_balance, wallet_balances = balances[0], balances[1:]
+        if farm_balance is None:
+            logger.error("Failed to get farm wallet balance")
+            return None
+        logger.info(f"Farm wallet balance: {self.web3.from_wei(farm_balance, 'ether')} MON")
+
+        min_balance_range = self.config.DISPERSE.MIN_BALANCE_FOR_DISPERSE
+        remaining = farm_balance
+        transfers = []
+        for address, balance in zip(addresses, wallet_balances):
+            if balance is None:
+                logger.error(f"Failed to get balance for wallet {address[:8]}...")
+                continue
+
+            target = self.web3.to_wei(
+                random.uniform(min_balance_range[0], min_balance_range[1]), "ether"
+            )
+            if balance >= target:
+                continue
+
+            amount = target - balance
+            cost = amount + gas_price * MULTI_SEND_GAS_PER_RECIPIENT
+            if len(transfers) % chunk_size == 0:
+                # First recipient of a new chunk
+                cost += gas_price * TRANSACTION_BASE_GAS
+            if cost > remaining:
+                logger.warning(
+                    f"Farm wallet doesn't have enough balance left for transfer of "
+                    f"{self.web3.from_wei(amount, 'ether')} MON to {address[:8]}..."
+                )
+                continue
+            remaining -= cost
+            transfers.append((address, amount))
+        return transfers, remaining
+
+    def _chunk_transaction(self, chunk: List[Transfer], gas_price: int) -> Dict:
+        return {
+            "from": self.farm_address,
+            "to": MULTICALL3_ADDRESS,
+            "value": sum(amount for _, amount in chunk),
+            "data": calldata.to_hex(
+                calldata.multicall3_aggregate3_value(
+                    [(address, False, amount, b"") for address, amount in chunk]
+                )
+            ),
+            "gasPrice": gas_price,
+        }
+
+    async def _estimate(self, transaction: Dict) -> Optional[Dict]:
+        """transaction with its gas limit set, None if the estimate failed."""
+        try:
+            transaction["gas"] = int(await self.web3.eth.estimate_gas(transaction) * GAS_ESTIMATE_BUFFER)
+            return transaction
+        except Exception as e:
+            logger.error(f"Failed to estimate gas of transfer to {transaction['to'][:8]}...: {e}")
+            return None
+
+    async def _send_all(
+        self, transactions: List[Optional[Dict]]
+    ) -> List[Tuple[str, Optional[HexBytes], int]]:
+        """
+        Broadcast the transactions back to back, the nonce manager hands out
+        consecutive nonces, and wait for all receipts together.
+
+        Returns (outcome, hash, wei spent on gas by a reverted transaction)
+        per transaction, None entries are FAILED without spending anything.
+        """
+        sent = []
+        for transaction in transactions:
+            if transaction is None:
+                sent.append((FAILED, None))
+                continue
+            try:
+                sent.append((None, await sign_and_send(self.web3, transaction, self.farm_key)))
+            except Exception as e:
+                # The node may have accepted it before failing, sending again could pay twice
+                logger.error(f"Failed to send transaction to {transaction['to'][:8]}...: {e}")
+                sent.append((UNCONFIRMED, None))
+
+        async def outcome(
+            transaction: Optional[Dict], result: Optional[str], tx_hash: Optional[HexBytes]
+        ) -> Tuple[str, Optional[HexBytes], int]:
+            if result is not None:
+                return result, None, 0
+            try:
+                receipt = await wait_for_receipt(self.web3, tx_hash)
+            except TimeExhausted:
+                logger.warning(f"No receipt yet for {EXPLORER_URL}{tx_hash.hex()}")
+                return UNCONFIRMED, tx_hash, 0
+            except Exception as e:
+                logger.warning(f"Failed to get receipt of {EXPLORER_URL}{tx_hash.hex()}: {e}")
+                return UNCONFIRMED, tx_hash, 0
+            if receipt["status"] != 1:
+                logger.error(f"Transaction failed: {EXPLORER_URL}{tx_hash.hex()}")
+                gas_price = receipt.get("effectiveGasPrice", transaction["gasPrice"])
+                return FAILED, tx_hash, receipt["gasUsed"] * gas_price
+            return CONFIRMED, tx_hash, 0
+
+        return await asyncio.gather(
+            *[
+                outcome(transaction, result, tx_hash)
+                for transaction, (result, tx_hash) in zip(transactions, sent)
+            ]
+        )
+
+    async def send_individually(self, transfers: List[Transfer], gas_price: int) -> int:
+        """Pay transfers with one pipelined transaction each, returns how many succeeded."""
+        transactions = await asyncio.gather(
+            *[
+                self._estimate(
+                    {"from": self.farm_address, "to": address, "value": amount, "gasPrice": gas_price}
+                )
+                for address, amount in transfers
+            ]
+        )
+        outcomes = await self._send_all(transactions)
+
+        success_count = 0
+        for (address, amount), (outcome, _, _) in zip(transfers, outcomes):
+            if outcome == CONFIRMED:
+                success_count += 1
+                logger.success(
+                    f"Successfully transferred {self.web3.from_wei(amount, 'ether')} MON to {address[:8]}..."
+                )
+        return success_count
+
+    async def disperse(self) -> bool:
+        logger.info("Starting multi-send disperse from one wallet")
+        logger.info(f"Farm wallet address: {self.farm_address[:8]}...")
+
+        gas_price = await get_fee_oracle(self.web3).get_gas_price()
+        chunk_size = max(1, self.config.DISPERSE.MULTI_SEND_CHUNK_SIZE)
+        planned = await self.plan(gas_price, chunk_size)
+        if planned is None:
+            return False
+        transfers, remaining = planned
+        if not transfers:
+            logger.info("No transfers needed")
+            return True
+
+        chunks = [transfers[i : i + chunk_size] for i in range(0, len(transfers), chunk_size)]
+        logger.info(f"Funding {len(transfers)} wallets with {len(chunks)} multi-send transactions")
+
+        transactions = await asyncio.gather(
+            *[self._estimate(self._chunk_transaction(chunk, gas_price)) for chunk in chunks]
+        )
+        outcomes = await self._send_all(transactions)
+
+        success_count = 0
+        fallback = []
+        for index, (chunk, (outcome, tx_hash, spent)) in enumerate(zip(chunks, outcomes), 1):
+            if outcome == FAILED:
+                # Nothing of the chunk was paid, only the gas it burnt is gone
+                remaining += self._chunk_cost(chunk, gas_price) - spent
+                fallback.extend(chunk)
+            elif outcome == UNCONFIRMED:
+                # The chunk may still land, paying it again could fund twice
+                logger.warning(f"Chunk {index}/{len(chunks)} is unconfirmed, not retrying its {len(chunk)} wallets")
+            else:
+                success_count += len(chunk)
+                logger.success(
+                    f"Chunk {index}/{len(chunks)} funded {len(chunk)} wallets: "
+                    f"{EXPLORER_URL}{tx_hash.hex()}"
+                )
+
+        affordable = []
+        for address, amount in fallback:
+            cost = amount + gas_price * TRANSFER_GAS_LIMIT
+            if cost > remaining:
+                logger.warning(
+                    f"Farm wallet doesn't have enough balance left for transfer of "
+                    f"{self.web3.from_wei(amount, 'ether')} MON to {address[:8]}..."
+                )
+                continue
+            remaining -= cost
+            affordable.append((address, amount))
+
+        if affordable:
+            logger.warning(f"Falling back to individual transfers for {len(affordable)} wallets")
+            success_count += await self.send_individually(affordable, gas_price)
+
+        logger.info(f"Disperse completed. Success: {success_count}/{len(transfers)} transfers")
+        return success_count > 0
@@ -1,12 +1,19 @@
 from loguru import logger
-from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3 import AsyncWeb3
 import random
 import asyncio
 from typing import List
 
-from src.utils.constants import RPC_URL
+from src.utils.web3_pool import get_web3
 from src.utils.config import Config
-from .utils import get_all_balances, WalletInfo, WalletGroup, process_single_transfer
+from src.utils.scheduler import Scheduler, pause
+from .utils import (
+    get_all_balances,
+    WalletInfo,
+    WalletGroup,
+    allocate_farm_wallets,
+    process_single_transfer,
+)
 
 
 class DisperseOneOne:
@@ -15,7 +22,7 @@ class DisperseOneOne:
         self.farm_keys = farm_keys
         self.proxies = proxies
         self.config = config
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     async def disperse(self):
         try:
@@ -44,43 +51,55 @@ class DisperseOneOne:
             return False
 
     async def process_wallet_group(
-        self, wallet_group: WalletGroup, semaphore: asyncio.Semaphore, config: Config
+        self, wallet_group: WalletGroup, scheduler: Scheduler, config: Config
     ) -> bool:
-        """Process all transfers for a single wallet group sequentially."""
-        results = []
+        """
+        Process all transfers for a single wallet group sequentially.
 
-        # Process transfers one by one within the group
-        for farm_wallet in wallet_group.farm_wallets:
-            result = await process_single_transfer(
-                self.web3,
-                farm_wallet,
-                wallet_group.main_wallet.address,
-                semaphore,
-                config,
-            )
-            results.append(result)
+        The group holds one scheduler slot while sending, pauses between
+        transfers give it to another group.
+        """
+        results = []
 
-            # Add pause between transfers within the group
-            if result:  # If transfer was successful
-                random_pause = random.uniform(
-                    config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                    config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+        async with scheduler.slot():
+            # Process transfers one by one within the group
+            for farm_wallet in wallet_group.farm_wallets:
+                result = await process_single_transfer(
+                    self.web3,
+                    farm_wallet,
+                    wallet_group.main_wallet.address,
+                    None,
+                    config,
                 )
-                logger.info(
-                    f"Transfer completed. Pausing for {random_pause:.2f} seconds..."
-                )
-                await asyncio.sleep(random_pause)
+                results.append(result)
+
+                # Add pause between transfers within the group
+                if result:  # If transfer was successful
+                    random_pause = random.uniform(
+                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                    )
+                    logger.info(
+                        f"Transfer completed. Pausing for {random_pause:.2f} seconds..."
+                    )
+                    await pause(random_pause)
 
         return all(results)  # Return True only if all transfers succeeded
 
     async def start_disperse(self, wallet_groups: List[WalletGroup]) -> bool:
-        """Start the disperse process for all wallet groups concurrently."""
+        """
+        Start the disperse process for all wallet groups concurrently.
+
+        Groups have disjoint senders, so up to THREADS of them run at once.
+        Nonces of every farm wallet come from the nonce manager and all
+        receipts are polled by the shared receipt watcher.
+        """
         try:
-            semaphore = asyncio.Semaphore(self.config.SETTINGS.THREADS)
+            scheduler = Scheduler(self.config.SETTINGS.THREADS)
 
             # Create tasks for each wallet group to process concurrently
             tasks = [
-                self.process_wallet_group(group, semaphore, self.config)
+                self.process_wallet_group(group, scheduler, self.config)
                 for group in wallet_groups
             ]
 
@@ -110,14 +129,14 @@ class DisperseOneOne:
         self, main_wallets: List[WalletInfo], farm_wallets: List[WalletInfo]
     ) -> List[WalletGroup]:
         """Create groups of wallets for dispersing funds."""
-        # Filter out farm wallets with zero balance and copy the list
+        # Filter out farm wallets with zero balance
         available_farm_wallets = [
             wallet for wallet in farm_wallets if wallet.balance_eth > 0
         ]
-        wallet_groups = []
-
         min_balance_range = self.config.DISPERSE.MIN_BALANCE_FOR_DISPERSE
 
+        # (main wallet, amount needed, target balance) of every main wallet below its target
+        needs = []
         for main_wallet in main_wallets:
             # Get random target balance between min and max from config
             target_balance = random.uniform(min_balance_range[0], min_balance_range[1])
@@ -126,38 +145,39 @@ class DisperseOneOne:
             if main_wallet.balance_eth >= target_balance:
                 continue
 
-            needed_balance = target_balance - main_wallet.balance_eth
-            current_farm_wallets = []
-            current_sum = 0
+            needs.append(
+                (main_wallet, target_balance - main_wallet.balance_eth, target_balance)
+            )
 
-            # Try to find enough farm wallets to reach target balance
-            for farm_wallet in available_farm_wallets[:]:
-                current_farm_wallets.append(farm_wallet)
-                current_sum += farm_wallet.balance_eth
-                available_farm_wallets.remove(farm_wallet)
+        allocation = allocate_farm_wallets(
+            [(main_wallet, needed) for main_wallet, needed, _ in needs],
+            available_farm_wallets,
+        )
 
-                if current_sum >= needed_balance:
-                    break
+        wallet_groups = []
+        for (main_wallet, needed_balance, target_balance), current_farm_wallets in zip(
+            needs, allocation
+        ):
+            if not current_farm_wallets:
+                logger.warning(
+                    f"No available farm wallets with balance for main wallet "
+                    f"{main_wallet.address[:8]}..."
+                )
+                continue
 
             # Create group even if we didn't reach target balance but have some funds
-            if current_sum > 0:
-                group = WalletGroup(
+            wallet_groups.append(
+                WalletGroup(
                     main_wallet=main_wallet,
                     farm_wallets=current_farm_wallets,
                     target_balance=target_balance,
                 )
-                wallet_groups.append(group)
-                if current_sum < needed_balance:
-                    logger.warning(
-                        f"Insufficient balance for main wallet {main_wallet.address[:8]}... "
-                        f"(needed: {needed_balance}, found: {current_sum}, but proceeding anyway)"
-                    )
-            else:
-                # Return farm wallets back to pool if we couldn't get any balance
-                available_farm_wallets.extend(current_farm_wallets)
+            )
+            current_sum = sum(wallet.balance_eth for wallet in current_farm_wallets)
+            if current_sum < needed_balance:
                 logger.warning(
-                    f"No available farm wallets with balance for main wallet "
-                    f"{main_wallet.address[:8]}..."
+                    f"Insufficient balance for main wallet {main_wallet.address[:8]}... "
+                    f"(needed: {needed_balance}, found: {current_sum}, but proceeding anyway)"
                 )
 
         return wallet_groups
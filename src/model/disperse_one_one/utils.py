@@ -1,11 +1,16 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
 from loguru import logger
 from web3 import AsyncWeb3
 import asyncio
-from typing import List
+import heapq
+from typing import List, Optional, Tuple
 import random
 
 from src.utils.config import Config
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 
 
 @dataclass
@@ -83,26 +88,58 @@ async def get_all_balances(
     return [result for result in results if result is not None]
 
 
+def allocate_farm_wallets(
+    needs: List[Tuple[WalletInfo, float]], farm_wallets: List[WalletInfo]
+) -> List[List[WalletInfo]]:
+    """
+    Assign farm wallets to the main wallets of needs (main wallet, amount
+    needed), every farm wallet to at most one main wallet.
+
+    Bin packing with a max-heap of main wallets keyed by the amount they
+    still miss: farm wallets are taken largest first and each one goes to
+    the main wallet missing the most, which leaves the heap once covered.
+    When farm balances run short the shortfall is spread over all main
+    wallets instead of starving the last ones. O((n + m) log(n + m)) for
+    n main and m farm wallets.
+
+    Returns:
+        Farm wallets of every entry of needs, in the same order
+    """
+    allocation: List[List[WalletInfo]] = [[] for _ in needs]
+    # (-missing, index), the index breaks ties in main wallet order
+    missing = [(-needed, index) for index, (_, needed) in enumerate(needs) if needed > 0]
+    heapq.heapify(missing)
+
+    for farm_wallet in sorted(farm_wallets, key=lambda wallet: wallet.balance_wei, reverse=True):
+        if not missing:
+            break
+        if farm_wallet.balance_eth <= 0:
+            break
+        still_needed, index = heapq.heappop(missing)
+        allocation[index].append(farm_wallet)
+        still_needed += farm_wallet.balance_eth
+        if still_needed < 0:
+            heapq.heappush(missing, (still_needed, index))
+
+    return allocation
+
+
 async def process_single_transfer(
     web3: AsyncWeb3,
     farm_wallet: WalletInfo,
     main_address: str,
-    semaphore: asyncio.Semaphore,
+    semaphore: Optional[asyncio.Semaphore],
     config: Config,
 ) -> bool:
     """Process a single transfer from farm wallet to main wallet."""
-    async with semaphore:
+    async with semaphore or nullcontext():
         try:
-            # Get the nonce for this wallet
-            nonce = await web3.eth.get_transaction_count(farm_wallet.address)
-
             # Create transaction
             transaction = {
                 "from": farm_wallet.address,
                 "to": main_address,
                 "value": farm_wallet.balance_wei,  # Send entire balance
-                "nonce": nonce,
-                "gasPrice": await web3.eth.gas_price,
+                "gasPrice": await get_fee_oracle(web3).get_gas_price(),
             }
 
             # Estimate gas and update transaction
@@ -114,13 +151,10 @@ async def process_single_transfer(
             transaction["value"] = farm_wallet.balance_wei - gas_cost
 
             # Sign and send transaction
-            signed_txn = web3.eth.account.sign_transaction(
-                transaction, farm_wallet.private_key
-            )
-            tx_hash = await web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            tx_hash = await sign_and_send(web3, transaction, farm_wallet.private_key)
 
             # Wait for transaction receipt
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -6,14 +6,19 @@ import base64
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from typing import Dict, Optional, List
 from eth_account.messages import encode_defunct
 import functools
 import time
 
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.scheduler import pause
 
 
 def with_retries(func):
@@ -33,7 +38,7 @@ def with_retries(func):
                 if attempt < attempts - 1:  # Don't sleep on the last attempt
                     pause_time = random.uniform(pause_range[0], pause_range[1])
                     logger.info(f"[{self.account_index}] Waiting {pause_time:.2f} seconds before next attempt...")
-                    await asyncio.sleep(pause_time)
+                    await pause(pause_time)
                 
         logger.error(f"[{self.account_index}] All {attempts} attempts failed for {func.__name__}")
         raise last_exception
@@ -58,7 +63,7 @@ class Dusted:
         self.ws_connection = None
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     def get_auth_headers(self) -> Dict[str, str]:
         """Get headers with authorization if token is available."""
@@ -70,17 +75,7 @@ class Dusted:
     @with_retries
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     @with_retries
     async def estimate_gas(self, transaction: dict) -> int:
@@ -222,7 +217,7 @@ class Dusted:
             logger.info(f"[{self.account_index}] Authentication message sent, waiting for server response...")
             
             # Very short wait between messages
-            await asyncio.sleep(0.2)  # 200ms wait between messages
+            await pause(0.2)  # 200ms wait between messages
             
             # Send a second message with a static payload
             second_message = b'\x08\x02\x2a\x00'  # This corresponds to base64 "CAIqAA=="
@@ -287,7 +282,7 @@ class Dusted:
             
             # Simple heartbeat mechanism sending a ping every 25 seconds
             while self.ws_connection and not self.ws_connection.closed:
-                await asyncio.sleep(25)
+                await pause(25)
                 
                 if self.ws_connection and not self.ws_connection.closed:
                     try:
@@ -565,7 +560,7 @@ class Dusted:
                         break
                     
                     # Add a small delay between requests
-                    await asyncio.sleep(random.uniform(1, 3))
+                    await pause(random.uniform(1, 3))
             except Exception as e:
                 logger.warning(f"[{self.account_index}] Error during lasso gameplay: {e}. Will still try to claim rewards.")
             
@@ -760,7 +755,6 @@ class Dusted:
             contract = self.web3.eth.contract(address=contract_address, abi=abi)
             
             # Prepare transaction
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
             
             # Convert signature to bytes if it's a string
@@ -775,7 +769,6 @@ class Dusted:
                 signature_bytes
             ).build_transaction({
                 'from': self.account.address,
-                'nonce': nonce,
                 'chainId': 10143,
                 **gas_params
             })
@@ -789,8 +782,7 @@ class Dusted:
                 tx['gas'] = 300000  # Default gas limit
                 
             # Sign and send transaction
-            signed_tx = self.account.sign_transaction(tx)
-            tx_hash, receipt = await self.send_and_wait_transaction(signed_tx)
+            tx_hash, receipt = await self.send_and_wait_transaction(tx)
             
             logger.success(f"[{self.account_index}] Successfully claimed rewards for score: {score}")
             return True
@@ -800,12 +792,12 @@ class Dusted:
             raise e
 
     @with_retries
-    async def send_and_wait_transaction(self, signed_tx) -> tuple:
-        """Send transaction and wait for receipt."""
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    async def send_and_wait_transaction(self, tx: Dict) -> tuple:
+        """Sign and send transaction and wait for receipt."""
+        tx_hash = await sign_and_send(self.web3, tx, self.account.key)
         logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
         
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
         
         if receipt['status'] == 1:
             logger.success(f"[{self.account_index}] Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -847,7 +839,7 @@ class Dusted:
             # Add a delay before claiming rewards to allow backend processing
             delay = random.uniform(5, 8)
             logger.info(f"[{self.account_index}] Waiting {delay:.2f} seconds before claiming rewards...")
-            await asyncio.sleep(delay)
+            await pause(delay)
             
             # Get score information before claiming
             await self.get_lasso_score()
@@ -857,7 +849,7 @@ class Dusted:
             
             # Wait some time to observe any final WebSocket responses
             logger.info(f"[{self.account_index}] Execution completed, waiting 10 seconds for any final WebSocket messages...")
-            await asyncio.sleep(10)
+            await pause(10)
             
             # Finally close the WebSocket connection
             logger.info(f"[{self.account_index}] Closing WebSocket connection...")
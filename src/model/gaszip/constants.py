@@ -1,9 +1,3 @@
-GASZIP_RPCS = {
-    "Arbitrum": "https://rpc.ankr.com/arbitrum",
-    "Optimism": "https://rpc.ankr.com/optimism",
-    "Base": "https://rpc.ankr.com/base",
-}
-
 GASZIP_EXPLORERS = {
     "Arbitrum": "https://arbiscan.io/tx/0x",
     "Optimism": "https://optimistic.etherscan.io/tx/0x",
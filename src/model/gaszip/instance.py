@@ -3,16 +3,19 @@ from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 import random
-import asyncio
 from loguru import logger
 from src.utils.config import Config
 from src.model.gaszip.constants import (
-    GASZIP_RPCS, 
     REFUEL_ADDRESS, 
     REFUEL_CALLLDATA,
     GASZIP_EXPLORERS
 )
-from src.utils.constants import RPC_URL
+from src.utils.chain_balances import chain_balances
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.arrival_watcher import wait_for_arrival
 
 
 class Gaszip:
@@ -28,7 +31,7 @@ class Gaszip:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.monad_web3 = get_web3()
         
     # 获取原生 MON 余额。
     async def get_monad_balance(self) -> float:
@@ -44,38 +47,26 @@ class Gaszip:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(GASZIP_RPCS[network]))
-            balance_wei = await web3.eth.get_balance(self.account.address)
-            return float(web3.from_wei(balance_wei, 'ether'))
+            return float(await chain_balances.get_balance(network, self.account.address))
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return 0
 
     # 加油后等待MON余额增加。
-    async def wait_for_balance_increase(self, initial_balance: float) -> bool:
+    async def wait_for_balance_increase(self, initial_balance: int) -> bool:
         """Wait for MON balance to increase after refuel."""
-        # 使用配置中的超时
         timeout = self.config.GASZIP.MAX_WAIT_TIME
-        
+        web3 = self.monad_web3
+
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # 每 5 秒检查一次余额，直至超时
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_monad_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # 每 15 秒记录一次进度
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await wait_for_arrival(web3, self.account.address, initial_balance, timeout)
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {web3.from_wei(initial_balance, 'ether')} "
+                f"to {web3.from_wei(current_balance, 'ether')} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
 
@@ -88,7 +79,10 @@ class Gaszip:
         """
         try:
             # 首先检查当前 MON 余额是否足够
-            current_mon_balance = await self.get_monad_balance()
+            # MON 和所有来源网络的余额在一次并发查询中获取
+            networks = self.config.GASZIP.NETWORKS_TO_REFUEL_FROM
+            balances = await chain_balances.get_balances(self.account.address, ["Monad", *networks])
+            current_mon_balance = float(balances.get("Monad", 0))
             logger.info(f"[{self.account_index}] Current MON balance: {current_mon_balance}")
             
             if current_mon_balance >= self.config.GASZIP.MINIMUM_BALANCE_TO_REFUEL:
@@ -107,8 +101,8 @@ class Gaszip:
             
             logger.info(f"[{self.account_index}] Checking balances for refueling {amount_to_refuel} MON")
             # 检查各个网络是否存在原生代币余额（Arbitrum、Optimism、Base），并且找到余额足够的网络
-            for network in self.config.GASZIP.NETWORKS_TO_REFUEL_FROM:
-                balance = await self.get_native_balance(network)
+            for network in networks:
+                balance = float(balances.get(network, 0))
                 logger.info(f"[{self.account_index}] {network} balance: {balance}")
                 # 如果余额足够，将网络添加到 eligible_networks 列表中
                 if balance > amount_to_refuel:
@@ -131,15 +125,7 @@ class Gaszip:
     # 获取交易的 gas 参数。
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(web3).get_gas_params()
     
     # 执行加油交易。
     async def refuel(self) -> bool:
@@ -151,17 +137,18 @@ class Gaszip:
                 return False
                 
             network, amount = network_info
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(GASZIP_RPCS[network]))
+            web3 = get_web3(network)
             
             # 如果我们要等待 MON 余额增加，请获取初始余额
             initial_balance = 0
             if self.config.GASZIP.WAIT_FOR_FUNDS_TO_ARRIVE:
-                initial_balance = await self.get_monad_balance() 
-                logger.info(f"[{self.account_index}] Initial MON balance: {initial_balance}")
+                initial_balance = await self.monad_web3.eth.get_balance(self.account.address)
+                logger.info(
+                    f"[{self.account_index}] Initial MON balance: {self.monad_web3.from_wei(initial_balance, 'ether')}"
+                )
             
             # Prepare transaction
             amount_wei = web3.to_wei(amount, 'ether')
-            nonce = await web3.eth.get_transaction_count(self.account.address)  # 随机数
             gas_params = await self.get_gas_params(web3) # 获取交易的 gas 参数。
             
             # 预估gas
@@ -177,18 +164,16 @@ class Gaszip:
                 'to': REFUEL_ADDRESS, # 加油地址发送到外部地址
                 'value': amount_wei,
                 'data': REFUEL_CALLLDATA,
-                'nonce': nonce,
                 'gas': int(gas_estimate * 1.1),  # Add 10% buffer to gas estimate
                 'chainId': await web3.eth.chain_id,
                 **gas_params
             }
             
             # Sign and send transaction
-            signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await sign_and_send(web3, tx, self.private_key)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{GASZIP_EXPLORERS[network]}{tx_hash.hex()}"
             
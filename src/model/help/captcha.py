@@ -1,4 +1,3 @@
-import asyncio
 from loguru import logger
 from primp import AsyncClient
 import requests
@@ -6,6 +5,8 @@ from typing import Optional, Dict
 from enum import Enum
 import time
 
+from src.utils.scheduler import pause
+
 
 class CaptchaError(Exception):
     """Base exception for captcha errors"""
@@ -328,7 +329,7 @@ class Capsolver:
                     logger.error(f"Error getting result: {result}")
                     return None
 
-                await asyncio.sleep(3)
+                await pause(3)
 
             except Exception as e:
                 logger.error(f"Error getting result: {e}")
@@ -1,13 +1,22 @@
-from web3 import AsyncWeb3
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 from eth_account import Account
 from loguru import logger
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from threading import Lock
 
-from src.utils.constants import RPC_URL
+from src.utils.web3_pool import get_web3
+from src.utils.balance_scanner import MAX_CALLS_PER_MULTICALL, NATIVE, scan_balances
 from src.utils.config import Config
 
+# Addresses per eth_getTransactionCount batch and requests in flight at once
+NONCE_BATCH_SIZE = 100
+FLEET_STATS_CONCURRENCY = 4
+# Below this many keys deriving addresses in-process beats spawning workers
+PARALLEL_DERIVE_THRESHOLD = 1000
+
 
 @dataclass
 class WalletInfo:
@@ -21,7 +30,7 @@ class WalletInfo:
 class WalletStats:
     def __init__(self, config: Config):
         # Используем публичную RPC ноду Base
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.w3 = get_web3()
         self.config = config
         self._lock = Lock()
 
@@ -43,13 +52,13 @@ class WalletStats:
             account = Account.from_key(private_key)
             address = account.address
 
-            # 查询ETH余额
-            balance_wei = await self.w3.eth.get_balance(address)
+            # 同时查询ETH余额和交易数量（nonce），两个请求会合并为一个批次
+            balance_wei, tx_count = await asyncio.gather(
+                self.w3.eth.get_balance(address),
+                self.w3.eth.get_transaction_count(address),
+            )
             balance_eth = self.w3.from_wei(balance_wei, "ether")
 
-            # 获取交易数量（nonce）
-            tx_count = await self.w3.eth.get_transaction_count(address)
-
             wallet_info = WalletInfo(
                 account_index=account_index, # 账户索引
                 private_key=private_key,    # 私钥
@@ -71,3 +80,119 @@ class WalletStats:
         except Exception as e:
             logger.error(f"Error getting wallet stats: {e}")
             return False
+
+
+def _derive_addresses(private_keys: List[str]) -> List[str]:
+    return [Account.from_key(private_key).address for private_key in private_keys]
+
+
+async def derive_addresses(private_keys: List[str]) -> List[str]:
+    """Addresses of the private keys, derived on all CPU cores for large key files."""
+    if len(private_keys) < PARALLEL_DERIVE_THRESHOLD:
+        return _derive_addresses(private_keys)
+
+    workers = os.cpu_count() or 1
+    chunk_size = -(-len(private_keys) // workers)
+    chunks = [
+        private_keys[i : i + chunk_size]
+        for i in range(0, len(private_keys), chunk_size)
+    ]
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = await asyncio.gather(
+            *[loop.run_in_executor(pool, _derive_addresses, chunk) for chunk in chunks]
+        )
+    return [address for part in parts for address in part]
+
+
+async def collect_fleet_stats(config: Config, private_keys: List[str]) -> bool:
+    """
+    获取所有钱包的余额和交易数量并保存到配置，不运行任何任务
+
+    余额通过 Multicall3 getEthBalance 批量获取，交易数量通过批量
+    eth_getTransactionCount 请求获取，同时进行的请求数量有限
+
+    参数：
+    config: 配置
+    private_keys: data/private_keys.txt 中的私钥
+
+    返回：
+    bool: 如果成功则为 True，如果错误则为 False
+    """
+    try:
+        w3 = get_web3()
+        addresses = await derive_addresses(private_keys)
+        logger.info(f"Collecting stats for {len(addresses)} wallets...")
+
+        semaphore = asyncio.Semaphore(FLEET_STATS_CONCURRENCY)
+        balances = {}
+        tx_counts = {}
+
+        async def fetch_balances(chunk: List[str]):
+            # scan_balances 在 Multicall 失败时自己退回到单个请求
+            async with semaphore:
+                try:
+                    balances.update(await scan_balances(w3, chunk, {}))
+                except Exception as e:
+                    logger.warning(f"Failed to get balances of {len(chunk)} wallets: {e}")
+
+        async def fetch_tx_count(address: str):
+            try:
+                tx_counts[address] = await w3.eth.get_transaction_count(address)
+            except Exception as e:
+                logger.warning(f"Failed to get transaction count of {address}: {e}")
+
+        async def fetch_tx_counts(chunk: List[str]):
+            async with semaphore:
+                try:
+                    responses = await w3.provider.make_batch_request(
+                        [("eth_getTransactionCount", [address, "latest"]) for address in chunk]
+                    )
+                    if not isinstance(responses, list):
+                        raise ValueError(responses.get("error", responses))
+                    for address, response in zip(chunk, responses):
+                        if "result" in response:
+                            tx_counts[address] = int(response["result"], 16)
+                except Exception as e:
+                    logger.warning(
+                        f"Transaction count batch of {len(chunk)} wallets failed, "
+                        f"querying them one by one: {e}"
+                    )
+                # 批次失败或部分地址出错时逐个查询
+                await asyncio.gather(
+                    *[fetch_tx_count(address) for address in chunk if address not in tx_counts]
+                )
+
+        await asyncio.gather(
+            *[
+                fetch_balances(addresses[i : i + MAX_CALLS_PER_MULTICALL])
+                for i in range(0, len(addresses), MAX_CALLS_PER_MULTICALL)
+            ],
+            *[
+                fetch_tx_counts(addresses[i : i + NONCE_BATCH_SIZE])
+                for i in range(0, len(addresses), NONCE_BATCH_SIZE)
+            ],
+        )
+
+        missing = 0
+        for index, (private_key, address) in enumerate(zip(private_keys, addresses), start=1):
+            if NATIVE not in balances.get(address, {}) or address not in tx_counts:
+                missing += 1
+                continue
+            config.WALLETS.wallets.append(
+                WalletInfo(
+                    account_index=index,
+                    private_key=private_key,
+                    address=address,
+                    balance=float(balances[address][NATIVE]),
+                    transactions=tx_counts[address],
+                )
+            )
+
+        if missing:
+            logger.warning(f"Failed to get stats for {missing} wallets")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error getting fleet stats: {e}")
+        return False
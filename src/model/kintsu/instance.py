@@ -1,14 +1,19 @@
-import asyncio
 from decimal import Decimal
 import random
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
 from typing import Dict
 
 from src.utils.config import Config
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.contracts import get_contract
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.scheduler import pause
 from .constants import STAKE_ADDRESS, STAKE_ABI
 
 
@@ -28,22 +33,12 @@ class Kintsu:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     # 获取当前网络的 gas 参数。
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     # 估算交易的 gas 并添加一些缓冲。
     async def estimate_gas(self, transaction: dict) -> int:
@@ -80,7 +75,7 @@ class Kintsu:
                 )
 
                 # 创建用于编码数据的同步合约版本
-                contract = Web3().eth.contract(address=STAKE_ADDRESS, abi=STAKE_ABI)
+                contract = get_contract(None, address=STAKE_ADDRESS, abi=STAKE_ABI)
                 amount_wei = Web3.to_wei(random_amount, "ether")
                 gas_params = await self.get_gas_params()
 
@@ -101,27 +96,18 @@ class Kintsu:
                 # 添加剩余交易参数
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 # 等待交易确认
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully staked {random_amount} MON on Kintsu. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -145,7 +131,7 @@ class Kintsu:
                 logger.error(
                     f"[{self.account_index}] | Error in stake_mon on Kintsu: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
         return False
 
     async def get_token_balance(self, token_symbol: str) -> Decimal:
@@ -1,14 +1,13 @@
 
 
 
-import asyncio
 import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from src.utils.config import Config
-from src.utils.constants import RPC_URL
+from src.utils.web3_pool import get_web3
+from src.utils.scheduler import pause
 
 
 class Kuru:
@@ -27,7 +26,7 @@ class Kuru:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     async def create_wallet(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
@@ -41,7 +40,7 @@ class Kuru:
                 logger.error(
                     f"[{self.account_index}] Error in create_wallet Kuru: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
         return False
 
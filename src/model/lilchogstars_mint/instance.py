@@ -1,12 +1,16 @@
-import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.utils.config import Config
+from src.utils.scheduler import pause
 from loguru import logger
 
 # 更新 NFT 合约的 ABI
@@ -61,12 +65,12 @@ class Lilchogstars:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
         self.nft_contract_address = (
             "0xb33D7138c53e516871977094B249C8f2ab89a4F4"  # 更新合约地址
         )
-        self.nft_contract: Contract = self.web3.eth.contract(
+        self.nft_contract: Contract = get_contract(self.web3,
             address=self.nft_contract_address, abi=ERC1155_ABI
         )
 
@@ -119,26 +123,16 @@ class Lilchogstars:
                     {
                         "from": self.account.address,
                         "value": self.web3.to_wei(0, "ether"),  # Бесплатный минт
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "maxFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
+                        "maxPriorityFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
                     }
                 )
 
                 # 我们签署交易
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    mint_txn, self.private_key
-                )
-
-                # 发送交易
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, mint_txn, self.private_key)
 
                 # 我们正在等待确认
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -159,6 +153,6 @@ class Lilchogstars:
                 logger.error(
                     f"[{self.account_index}] Error in mint on Lilchogstars: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
         return False
@@ -1,10 +1,11 @@
 import random
-import asyncio
 from loguru import logger
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from primp import AsyncClient
 
+from src.utils.scheduler import pause
+
 
 async def get_mint_data(
     session: AsyncClient,
@@ -101,7 +102,7 @@ async def get_mint_data(
                                 f"⚠️ MagicEden API server error ({response.status_code}): {response.text}. "
                                 f"Retrying in {wait_time}s (attempt {attempt}/{max_retries})"
                             )
-                    await asyncio.sleep(wait_time)
+                    await pause(wait_time)
                 else:
                     if "no healthy upstream" in response.text:
                         logger.error(
@@ -133,7 +134,7 @@ async def get_mint_data(
                             f"⚠️ Error getting mint data: {e}. "
                             f"Retrying in {wait_time}s (attempt {attempt}/{max_retries})"
                         )
-                await asyncio.sleep(wait_time)
+                await pause(wait_time)
             else:
                 if "connection" in str(e).lower():
                     logger.error(
@@ -2,11 +2,15 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 
 from src.utils.config import Config
+from src.utils.contracts import get_contract
 from src.model.magiceden.get_mint_data import get_mint_data
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 
 
 class MagicEden:
@@ -19,7 +23,7 @@ class MagicEden:
         self.account = Account.from_key(private_key)
         self.session: AsyncClient = session
 
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     async def mint(self) -> bool:
         """
@@ -93,22 +97,16 @@ class MagicEden:
                         gas_estimate = sale_step["items"][0].get("gasEstimate", 500000)
 
                         # 使用来自 API 的数据创建交易
-                        base_fee = await self.web3.eth.gas_price
+                        base_fee = await get_fee_oracle(self.web3).get_gas_price()
                         priority_fee = int(base_fee * 0.1)  # 10% priority fee
                         max_fee_per_gas = base_fee + priority_fee
 
-                        # 我们收到了随机数
-                        nonce = await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        )
-
                         # 使用更新的参数创建交易
                         tx = {
                             "from": from_address,
                             "to": to_address,
                             "value": value,
                             "data": data,
-                            "nonce": nonce,
                             "maxFeePerGas": max_fee_per_gas,
                             "maxPriorityFeePerGas": priority_fee,
                             "chainId": 10143,
@@ -136,21 +134,14 @@ class MagicEden:
                             return False
 
                         # 我们签署并发送交易
-                        signed_tx = self.web3.eth.account.sign_transaction(
-                            tx, self.private_key
-                        )
-                        tx_hash = await self.web3.eth.send_raw_transaction(
-                            signed_tx.raw_transaction
-                        )
+                        tx_hash = await sign_and_send(self.web3, tx, self.private_key)
 
                         logger.info(
                             f"[{self.account_index}] | 📤 MagicEden transaction sent: {EXPLORER_URL}{tx_hash.hex()}"
                         )
 
                         # 等待交易确认
-                        tx_receipt = await self.web3.eth.wait_for_transaction_receipt(
-                            tx_hash
-                        )
+                        tx_receipt = await wait_for_receipt(self.web3, tx_hash)
 
                         if tx_receipt["status"] == 1:
                             logger.success(
@@ -180,10 +171,10 @@ class MagicEden:
                 )
 
                 # 创建合约实例
-                contract = self.web3.eth.contract(address=nft_contract, abi=ABI)
+                contract = get_contract(self.web3, address=nft_contract, abi=ABI)
 
                 # 获取当前 gas 价格并计算最高费用
-                base_fee = await self.web3.eth.gas_price
+                base_fee = await get_fee_oracle(self.web3).get_gas_price()
                 priority_fee = int(base_fee * 0.1)  # 10% priority fee
                 max_fee_per_gas = base_fee + priority_fee
 
@@ -191,9 +182,6 @@ class MagicEden:
                 tx_params = {
                     "from": self.account.address,
                     "value": total_price,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
                     "maxFeePerGas": max_fee_per_gas,
                     "maxPriorityFeePerGas": priority_fee,
                     "chainId": 10143,  # 我们明确指定 Monad 的 chainId
@@ -222,19 +210,14 @@ class MagicEden:
                     1, self.account.address
                 ).build_transaction(tx_params)
 
-                # Sign transaction
-                signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-
-                # Send transaction
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_tx.raw_transaction
-                )
+                # Sign and send transaction
+                tx_hash = await sign_and_send(self.web3, tx, self.private_key)
                 logger.info(
                     f"[{self.account_index}] | 📤 MagicEden transaction sent: {tx_hash.hex()}"
                 )
 
                 # Wait for transaction receipt
-                tx_receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                tx_receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if tx_receipt["status"] == 1:
                     logger.success(
@@ -3,16 +3,19 @@ from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 import random
-import asyncio
 from loguru import logger
 from src.utils.config import Config
 from src.model.memebridge.constansts import (
-    MEMEBRIDGE_RPCS, 
     MEMEBRIDGE_ADDRESS, 
     MEMEBRIDGE_CALLLDATA,
     MEMEBRIDGE_EXPLORERS
 )
-from src.utils.constants import RPC_URL
+from src.utils.chain_balances import chain_balances
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.arrival_watcher import wait_for_arrival
 
 
 class Memebridge:
@@ -28,7 +31,7 @@ class Memebridge:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.monad_web3 = get_web3()
         
     async def get_monad_balance(self) -> float:
         """Get native MON balance."""
@@ -42,37 +45,25 @@ class Memebridge:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
-            balance_wei = await web3.eth.get_balance(self.account.address)
-            return float(web3.from_wei(balance_wei, 'ether'))
+            return float(await chain_balances.get_balance(network, self.account.address))
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return 0
 
-    async def wait_for_balance_increase(self, initial_balance: float) -> bool:
+    async def wait_for_balance_increase(self, initial_balance: int) -> bool:
         """Wait for MON balance to increase after refuel."""
-        # Use the timeout from config
         timeout = self.config.MEMEBRIDGE.MAX_WAIT_TIME
-        
+        web3 = self.monad_web3
+
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_monad_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await wait_for_arrival(web3, self.account.address, initial_balance, timeout)
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {web3.from_wei(initial_balance, 'ether')} "
+                f"to {web3.from_wei(current_balance, 'ether')} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
 
@@ -83,7 +74,10 @@ class Memebridge:
         """
         try:
             # First check if current MON balance is already sufficient
-            current_mon_balance = await self.get_monad_balance()
+            # MON and source network balances are read in one concurrent query
+            networks = self.config.MEMEBRIDGE.NETWORKS_TO_REFUEL_FROM
+            balances = await chain_balances.get_balances(self.account.address, ["Monad", *networks])
+            current_mon_balance = float(balances.get("Monad", 0))
             logger.info(f"[{self.account_index}] Current MON balance: {current_mon_balance}")
             
             if current_mon_balance >= self.config.MEMEBRIDGE.MINIMUM_BALANCE_TO_REFUEL:
@@ -101,8 +95,8 @@ class Memebridge:
             
             logger.info(f"[{self.account_index}] Checking balances for refueling {amount_to_refuel} MON")
             
-            for network in self.config.MEMEBRIDGE.NETWORKS_TO_REFUEL_FROM:
-                balance = await self.get_native_balance(network)
+            for network in networks:
+                balance = float(balances.get(network, 0))
                 logger.info(f"[{self.account_index}] {network} balance: {balance}")
                 
                 if balance > amount_to_refuel:
@@ -123,15 +117,7 @@ class Memebridge:
 
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(web3).get_gas_params()
     
     async def refuel(self) -> bool:
         """Execute the refueling transaction."""
@@ -141,17 +127,18 @@ class Memebridge:
                 return False
                 
             network, amount = network_info
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
+            web3 = get_web3(network)
             
             # Get initial MON balance if we're going to wait for it to increase
             initial_balance = 0
             if self.config.MEMEBRIDGE.WAIT_FOR_FUNDS_TO_ARRIVE:
-                initial_balance = await self.get_monad_balance()
-                logger.info(f"[{self.account_index}] Initial MON balance: {initial_balance}")
+                initial_balance = await self.monad_web3.eth.get_balance(self.account.address)
+                logger.info(
+                    f"[{self.account_index}] Initial MON balance: {self.monad_web3.from_wei(initial_balance, 'ether')}"
+                )
             
             # Prepare transaction
             amount_wei = web3.to_wei(amount, 'ether')
-            nonce = await web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params(web3)
             
             # Estimate gas
@@ -167,18 +154,16 @@ class Memebridge:
                 'to': MEMEBRIDGE_ADDRESS,
                 'value': amount_wei,
                 'data': MEMEBRIDGE_CALLLDATA,
-                'nonce': nonce,
                 'gas': int(gas_estimate * 1.1),  # Add 10% buffer to gas estimate
                 'chainId': await web3.eth.chain_id,
                 **gas_params
             }
             
             # Sign and send transaction
-            signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await sign_and_send(web3, tx, self.private_key)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{MEMEBRIDGE_EXPLORERS[network]}{tx_hash.hex()}"
             
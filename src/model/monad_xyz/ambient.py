@@ -1,37 +1,35 @@
-from web3 import AsyncWeb3
 from eth_account import Account
-import asyncio
 from typing import Dict, Optional, List, Tuple
-from eth_abi import abi
 from decimal import Decimal
-from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
+from src.utils.constants import EXPLORER_URL, ERC20_ABI
+from src.utils.contracts import get_contract
+from src.utils import calldata
+from src.utils.allowance_cache import allowance_cache
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.balance_scanner import get_token_balances
 from src.model.monad_xyz.constants import AMBIENT_ABI, AMBIENT_TOKENS, AMBIENT_CONTRACT, ZERO_ADDRESS, POOL_IDX, RESERVE_FLAGS, TIP, MAX_SQRT_PRICE, MIN_SQRT_PRICE
 from loguru import logger
 import random
 from src.utils.config import Config
+from src.utils.scheduler import pause
 
     
 class AmbientDex:
     def __init__(self, private_key: str, proxy: Optional[str] = None, config: Config = None):
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         self.account = Account.from_key(private_key)
         self.proxy = proxy
-        self.router_contract = self.web3.eth.contract(
+        self.router_contract = get_contract(self.web3,
             address=self.web3.to_checksum_address(AMBIENT_CONTRACT),
             abi=AMBIENT_ABI
         )
         self.config = config
 
     async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest') # 获取最新区块
-        base_fee = latest_block['baseFeePerGas'] # 基础费用
-        max_priority_fee = await self.web3.eth.max_priority_fee # 最高优先级费用
-        max_fee = base_fee + max_priority_fee
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     # 根据代币小数将金额转换为wei。
     def convert_to_wei(self, amount: float, token: str) -> int:
@@ -54,41 +52,32 @@ class AmbientDex:
         """Get list of tokens with non-zero balances, including native token."""
         tokens_with_balance = []
         
-        # 检查原生代币余额
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        # 一次 multicall 获取原生代币和所有代币余额
+        balances = await get_token_balances(self.web3, self.account.address, AMBIENT_TOKENS)
+        
+        native_balance = balances.pop("native", 0)
         if native_balance > 0:
-            native_amount = float(self.web3.from_wei(native_balance, 'ether'))
-            tokens_with_balance.append(("native", native_amount))
+            tokens_with_balance.append(("native", float(native_balance)))
         
         # 检查其他代币余额
-        for token in AMBIENT_TOKENS:
-            try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(AMBIENT_TOKENS[token]["address"]),
-                    abi=ERC20_ABI
-                )
-                balance = await token_contract.functions.balanceOf(self.account.address).call()
+        for token, balance in balances.items():
+            if balance > 0:
+                amount = float(balance)
                 
-                if balance > 0:
-                    decimals = AMBIENT_TOKENS[token]["decimals"]
-                    amount = float(Decimal(str(balance)) / Decimal(str(10 ** decimals)))
+                # 余额较低时跳过 SETH 和 WETH
+                if token.lower() in ["seth", "weth"] and amount < 0.001:
+                    # logger.info(f"Skipping {token} with low balance ({amount}) for potential swaps")
+                    continue
                     
-                    # 余额较低时跳过 SETH 和 WETH
-                    if token.lower() in ["seth", "weth"] and amount < 0.001:
-                        # logger.info(f"Skipping {token} with low balance ({amount}) for potential swaps")
-                        continue
-                        
-                    tokens_with_balance.append((token, amount))
-                
-            except Exception as e:
-                logger.error(f"Failed to get balance for {token}: {str(e)}")
-                continue
+                tokens_with_balance.append((token, amount))
         
         return tokens_with_balance
     
     # 为 Ambient DEX 生成交换交易数据。
-    async def generate_swap_data(self, token_in: str, token_out: str, amount_in_wei: int) -> Dict:
-        """Generate swap transaction data for Ambient DEX."""
+    async def generate_swap_data(
+        self, token_in: str, token_out: str, amount_in_wei: int, gas_limit: Optional[int] = None
+    ) -> Dict:
+        """Generate swap transaction data for Ambient DEX, gas_limit skips the gas estimation."""
         try:
             is_native = token_in == "native"
             
@@ -99,44 +88,37 @@ class AmbientDex:
             )
             
             # 对交换参数进行编码
-            encode_data = abi.encode(
-                ['address', 'address', 'uint16', 'bool', 'bool', 'uint256', 'uint8', 'uint256', 'uint256', 'uint8'],
-                [
-                    ZERO_ADDRESS,
-                    self.web3.to_checksum_address(token_address),
-                    POOL_IDX,
-                    is_native,
-                    is_native,
-                    amount_in_wei,
-                    TIP,
-                    MAX_SQRT_PRICE if is_native else MIN_SQRT_PRICE,
-                    0,
-                    RESERVE_FLAGS
-                ]
+            swap_cmd = calldata.ambient_swap_cmd(
+                ZERO_ADDRESS,
+                self.web3.to_checksum_address(token_address),
+                POOL_IDX,
+                is_native,
+                is_native,
+                amount_in_wei,
+                TIP,
+                MAX_SQRT_PRICE if is_native else MIN_SQRT_PRICE,
+                0,
+                RESERVE_FLAGS
             )
             
-            # 为 userCmd 生成函数选择器
-            function_selector = self.web3.keccak(text="userCmd(uint16,bytes)")[:4]
-            
-            # 对 userCmd 的参数进行编码
-            cmd_params = abi.encode(['uint16', 'bytes'], [1, encode_data])
-            
-            # 组合函数选择器和参数
-            tx_data = function_selector.hex() + cmd_params.hex()
+            # 组合 userCmd 选择器和参数
+            tx_data = calldata.to_hex(calldata.ambient_user_cmd(1, swap_cmd))
 
-            # Estimate gas
-            gas_estimate = await self.web3.eth.estimate_gas({
-                'to': AMBIENT_CONTRACT,
-                'from': self.account.address,
-                'data': '0x' + tx_data,
-                'value': amount_in_wei if is_native else 0
-            })
+            if gas_limit is None:
+                # Estimate gas
+                gas_estimate = await self.web3.eth.estimate_gas({
+                    'to': AMBIENT_CONTRACT,
+                    'from': self.account.address,
+                    'data': tx_data,
+                    'value': amount_in_wei if is_native else 0
+                })
+                gas_limit = int(gas_estimate * 1.1)  # Add 10% buffer
 
             return {
                 "to": AMBIENT_CONTRACT,
-                "data": '0x' + tx_data,
+                "data": tx_data,
                 "value": amount_in_wei if is_native else 0,
-                "gas": int(gas_estimate * 1.1)  # Add 10% buffer
+                "gas": gas_limit
             }
 
         except Exception as e:
@@ -146,23 +128,21 @@ class AmbientDex:
     # 执行交易并等待确认。
     async def execute_transaction(self, tx_data: Dict) -> str:
         """Execute a transaction and wait for confirmation."""
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
         gas_params = await self.get_gas_params()
         
         transaction = {
             "from": self.account.address,
-            "nonce": nonce,
             "type": 2,
             "chainId": 10143,
             **tx_data,
             **gas_params,
         }
 
-        signed_txn = self.web3.eth.account.sign_transaction(transaction, self.account.key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = await sign_and_send(self.web3, transaction, self.account.key)
         
         logger.info("等待交易确认...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
+        allowance_cache.record_receipt(receipt)
         
         if receipt['status'] == 1:
             logger.success(f"交易成功！浏览器 URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -171,46 +151,46 @@ class AmbientDex:
             raise Exception("Transaction failed")
         return tx_hash.hex()
     
+    def token_address(self, token: str) -> Optional[str]:
+        """Checksum address of an Ambient token, None for native MON."""
+        if token == "native":
+            return None
+        return self.web3.to_checksum_address(AMBIENT_TOKENS[token.lower()]["address"])
+
     # 批准 Ambient DEX 的代币支出。
     async def approve_token(self, token: str, amount: int) -> str:
         """Approve token spending for Ambient DEX."""
         try:
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(AMBIENT_TOKENS[token.lower()]["address"]),
-                abi=ERC20_ABI
-            )
+            token_address = self.token_address(token)
             
-            # Check current allowance
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address,
-                AMBIENT_CONTRACT
-            ).call()
-            
-            if current_allowance >= amount:
+            # Check current allowance, known allowances need no RPC call
+            if await allowance_cache.is_sufficient(
+                self.web3, self.account.address, token_address, AMBIENT_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
             
+            token_contract = get_contract(self.web3, address=token_address, abi=ERC20_ABI)
+            
             # 准备批准交易
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
             
             approve_tx = await token_contract.functions.approve(
                 AMBIENT_CONTRACT,
-                amount
+                allowance_cache.approval_amount(amount)
             ).build_transaction({
                 'from': self.account.address,
-                'nonce': nonce,
                 'type': 2,
                 'chainId': 10143,
                 **gas_params,
             })
             
             # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(approve_tx, self.account.key)
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            tx_hash = await sign_and_send(self.web3, approve_tx, self.account.key)
             
             logger.info(f"Waiting for {token} approval confirmation...")
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
+            allowance_cache.record_receipt(receipt)
             
             if receipt['status'] == 1:
                 logger.success(f"Approval successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -258,17 +238,20 @@ class AmbientDex:
                             self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
                         )
                         logger.info(f"Swapping {balance} {token_in} to MON. Sleeping {random_pause} seconds after approve")
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
                         
                         logger.info(f"Collecting {balance} {token_in} to native")
                         
                         # 生成并执行掉期交易
-                        tx_data = await self.generate_swap_data(token_in, "native", amount_wei)
-                        tx_hash = await self.execute_transaction(tx_data)
+                        async with allowance_cache.spending(
+                            self.account.address, self.token_address(token_in), AMBIENT_CONTRACT, amount_wei
+                        ):
+                            tx_data = await self.generate_swap_data(token_in, "native", amount_wei)
+                            await self.execute_transaction(tx_data)
                         
                         # 交换之间等待
                         if token_in != tokens_to_swap[-1][0]:  # If not the last token
-                            await asyncio.sleep(random.randint(5, 10))
+                            await pause(random.randint(5, 10))
                     except Exception as e:
                         logger.error(f"Failed to collect {token_in} to native: {str(e)}")
                         continue
@@ -306,15 +289,18 @@ class AmbientDex:
                 
                 # 批准代币支出（如果不是本地）
                 await self.approve_token(token_in, amount_wei)
-                await asyncio.sleep(random.randint(5, 10))
+                await pause(random.randint(5, 10))
             
             logger.info(f"Swapping {amount_token} {token_in} to {token_out}")
             
-            # 创建 swap 交易
-            tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
-            
-            # 执行交易
-            return await self.execute_transaction(tx_data)
+            async with allowance_cache.spending(
+                self.account.address, self.token_address(token_in), AMBIENT_CONTRACT, amount_wei
+            ):
+                # 创建 swap 交易
+                tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
+                
+                # 执行交易
+                return await self.execute_transaction(tx_data)
 
         except Exception as e:
             logger.error(f"Ambient swap failed: {str(e)}")
@@ -1,36 +1,34 @@
-from web3 import AsyncWeb3
 from eth_account import Account
-import asyncio
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 import random
 from loguru import logger
-from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
+from src.utils.constants import EXPLORER_URL, ERC20_ABI
+from src.utils.contracts import get_contract
+from src.utils.allowance_cache import allowance_cache
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.balance_scanner import get_token_balances
 from src.model.monad_xyz.constants import BEAN_CONTRACT, BEAN_ABI, BEAN_TOKENS
 import time
 from src.utils.config import Config
+from src.utils.scheduler import pause
 
 class BeanDex:
     def __init__(self, private_key: str, proxy: Optional[str] = None, config: Config = None):
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         self.account = Account.from_key(private_key)
         self.proxy = proxy
-        self.router_contract = self.web3.eth.contract(
+        self.router_contract = get_contract(self.web3,
             address=self.web3.to_checksum_address(BEAN_CONTRACT),
             abi=BEAN_ABI
         )
         self.config = config
 
     async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     async def get_token_balance(self, token: str) -> float:
         try:
@@ -38,7 +36,7 @@ class BeanDex:
                 balance_wei = await self.web3.eth.get_balance(self.account.address)
                 return float(self.web3.from_wei(balance_wei, 'ether'))
             
-            token_contract = self.web3.eth.contract(
+            token_contract = get_contract(self.web3,
                 address=self.web3.to_checksum_address(BEAN_TOKENS[token]["address"]),
                 abi=ERC20_ABI
             )
@@ -55,57 +53,46 @@ class BeanDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
         
+        # Native and token balances in one multicall
+        balances = await get_token_balances(self.web3, self.account.address, BEAN_TOKENS)
+        
         # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        native_balance = balances.pop("native", 0)
         if native_balance > 0:
-            native_amount = float(self.web3.from_wei(native_balance, 'ether'))
-            tokens_with_balance.append(("native", native_amount))
+            tokens_with_balance.append(("native", float(native_balance)))
         
         # Check other tokens
-        for token in BEAN_TOKENS:
-            try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(BEAN_TOKENS[token]["address"]),
-                    abi=ERC20_ABI
-                )
-                balance = await token_contract.functions.balanceOf(self.account.address).call()
-                
-                if balance > 0:
-                    decimals = BEAN_TOKENS[token]["decimals"]
-                    amount = float(Decimal(str(balance)) / Decimal(str(10 ** decimals)))
-                    tokens_with_balance.append((token, amount))
-                    
-            except Exception as e:
-                logger.error(f"Failed to get balance for {token}: {str(e)}")
-                continue
+        for token, balance in balances.items():
+            if balance > 0:
+                tokens_with_balance.append((token, float(balance)))
         
         return tokens_with_balance
 
+    def token_address(self, token: str) -> Optional[str]:
+        """Checksum address of a token, None for native MON."""
+        if token == "native":
+            return None
+        return self.web3.to_checksum_address(BEAN_TOKENS[token]["address"])
+
     async def approve_token(self, token: str, amount: int) -> Optional[str]:
         try:
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(BEAN_TOKENS[token]["address"]),
-                abi=ERC20_ABI
-            )
+            token_address = self.token_address(token)
             
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address,
-                BEAN_CONTRACT
-            ).call()
-            
-            if current_allowance >= amount:
+            # Known allowances need no RPC call
+            if await allowance_cache.is_sufficient(
+                self.web3, self.account.address, token_address, BEAN_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
             
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
+            token_contract = get_contract(self.web3, address=token_address, abi=ERC20_ABI)
             gas_params = await self.get_gas_params()
             
             approve_tx = await token_contract.functions.approve(
                 BEAN_CONTRACT,
-                amount
+                allowance_cache.approval_amount(amount)
             ).build_transaction({
                 'from': self.account.address,
-                'nonce': nonce,
                 'type': 2,
                 'chainId': 10143,
                 **gas_params,
@@ -118,11 +105,11 @@ class BeanDex:
             raise
 
     async def execute_transaction(self, transaction: Dict) -> str:
-        signed_txn = self.web3.eth.account.sign_transaction(transaction, self.account.key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = await sign_and_send(self.web3, transaction, self.account.key)
         
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
+        allowance_cache.record_receipt(receipt)
         
         if receipt['status'] == 1:
             logger.success(f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -131,8 +118,10 @@ class BeanDex:
             logger.error(f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
             raise Exception("Transaction failed")
 
-    async def generate_swap_data(self, token_in: str, token_out: str, amount_in: int, min_amount_out: int) -> Dict:
-        """Generate swap transaction data based on token types."""
+    async def generate_swap_data(
+        self, token_in: str, token_out: str, amount_in: int, min_amount_out: int, gas_limit: Optional[int] = None
+    ) -> Dict:
+        """Generate swap transaction data based on token types, gas_limit skips the gas estimation."""
         try:
             # Calculate deadline as current timestamp + 30 minutes (in seconds)
             current_time = int(time.time())
@@ -187,16 +176,17 @@ class BeanDex:
                 )
                 value = 0
 
-            gas_estimate = await method.estimate_gas({
-                'from': self.account.address,
-                'value': value
-            })
+            if gas_limit is None:
+                gas_estimate = await method.estimate_gas({
+                    'from': self.account.address,
+                    'value': value
+                })
+                gas_limit = int(gas_estimate * 1.1)
 
             tx_data = await method.build_transaction({
                 'from': self.account.address,
                 'value': value,
-                'gas': int(gas_estimate * 1.1),
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address),
+                'gas': gas_limit,
                 **await self.get_gas_params(),
             })
 
@@ -231,35 +221,25 @@ class BeanDex:
                         
                         # First check and approve if needed
                         logger.info(f"Checking allowance for {balance} {token_in}")
-                        token_contract = self.web3.eth.contract(
-                            address=self.web3.to_checksum_address(BEAN_TOKENS[token_in]["address"]),
-                            abi=ERC20_ABI
-                        )
-                        
-                        current_allowance = await token_contract.functions.allowance(
-                            self.account.address,
-                            BEAN_CONTRACT
-                        ).call()
-                        
-                        if current_allowance < amount_wei:
-                            logger.info(f"Approving {balance} {token_in} for Bean router")
-                            await self.approve_token(token_in, amount_wei)
+                        if await self.approve_token(token_in, amount_wei):
+                            logger.info(f"Approved {balance} {token_in} for Bean router")
                             random_pause = random.randint(
                                 self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
                                 self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
                             )
                             logger.info(f"Sleeping {random_pause} seconds after approve")
-                            await asyncio.sleep(random_pause)
-                        else:
-                            logger.info(f"Allowance sufficient for {token_in}")
+                            await pause(random_pause)
                         
                         logger.info(f"Collecting {balance} {token_in} to native")
                         
-                        tx_data = await self.generate_swap_data(token_in, "native", amount_wei, 0)
-                        await self.execute_transaction(tx_data)
+                        async with allowance_cache.spending(
+                            self.account.address, self.token_address(token_in), BEAN_CONTRACT, amount_wei
+                        ):
+                            tx_data = await self.generate_swap_data(token_in, "native", amount_wei, 0)
+                            await self.execute_transaction(tx_data)
                         
                         if token_in != tokens_to_swap[-1][0]:
-                            await asyncio.sleep(random.randint(5, 10))
+                            await pause(random.randint(5, 10))
                             
                     except Exception as e:
                         logger.error(f"Failed to collect {token_in} to native: {str(e)}")
@@ -304,12 +284,15 @@ class BeanDex:
                     # Approve token spending
                     logger.info(f"Approving {amount_token} {token_in} for Bean router")
                     await self.approve_token(token_in, amount_wei)
-                    await asyncio.sleep(random.randint(5, 10))
+                    await pause(random.randint(5, 10))
                 
                 min_amount_out = 0  # Add slippage calculation if needed
                 logger.info(f"Generating swap data for {token_in} -> {token_out}")
-                tx_data = await self.generate_swap_data(token_in, token_out, amount_wei, min_amount_out)
-                return await self.execute_transaction(tx_data)
+                async with allowance_cache.spending(
+                    self.account.address, self.token_address(token_in), BEAN_CONTRACT, amount_wei
+                ):
+                    tx_data = await self.generate_swap_data(token_in, token_out, amount_wei, min_amount_out)
+                    return await self.execute_transaction(tx_data)
 
         except Exception as e:
             logger.error(f"Swap failed: {str(e)}")
@@ -0,0 +1,263 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from eth_account import Account
+from loguru import logger
+
+from src.model.monad_xyz.ambient import AmbientDex
+from src.model.monad_xyz.bean import BeanDex
+from src.model.monad_xyz.constants import (
+    AMBIENT_CONTRACT,
+    AMBIENT_TOKENS,
+    BEAN_CONTRACT,
+    BEAN_TOKENS,
+    IZUMI_CONTRACT,
+    IZUMI_TOKENS,
+)
+from src.model.monad_xyz.izumi import IzumiDex
+from src.model.monad_xyz.uniswap_swaps import MonadSwap
+from src.utils import calldata
+from src.utils.allowance_cache import allowance_cache
+from src.utils.balance_scanner import get_token_balances
+from src.utils.config import Config
+from src.utils.constants import EXPLORER_URL, TOKENS
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.web3_pool import get_web3
+
+# A swap sent right behind its approve cannot be gas-estimated (it would
+# revert on the missing allowance), these limits are used instead. Monad
+# charges the gas limit, not the gas used, so they are kept close to what
+# the calls actually need.
+APPROVE_GAS_LIMIT = 80_000
+SWAP_GAS_LIMIT = 350_000
+
+# Same skip rules as the collect loops of the single DEX classes
+BEAN_SKIPPED_TOKENS = {"wmon", "bean"}
+IZUMI_SKIPPED_TOKENS = {"wmon"}
+IZUMI_MIN_BALANCE = Decimal("0.0001")
+AMBIENT_MIN_BALANCE = {"seth": Decimal("0.001"), "weth": Decimal("0.001")}
+# MonadSwap tokens are all 18 decimals
+MONAD_SWAP_DECIMALS = 18
+DEX_SPENDERS = {"ambient": AMBIENT_CONTRACT, "bean": BEAN_CONTRACT, "izumi": IZUMI_CONTRACT}
+
+
+@dataclass
+class CollectStep:
+    """One transaction of the collect plan."""
+
+    label: str
+    transaction: Dict
+    token: str
+    spender: str
+    amount: int
+    is_approve: bool = False
+
+
+class PipelinedCollector:
+    """
+    collect_all_to_monad in one pass over all DEXes.
+
+    Every token balance is read with a single multicall, each token is
+    assigned to the first DEX (MonadSwap, Ambient, Bean, Izumi) that trades
+    it, and the approve + swap transactions of all tokens are built up
+    front. They are then broadcast back to back with consecutive nonces and
+    their receipts awaited together, instead of approve, wait, sleep, swap,
+    wait per token and DEX.
+    """
+
+    def __init__(self, account_index: int, private_key: str, proxy: str, config: Config):
+        self.account_index = account_index
+        self.private_key = private_key
+        self.config = config
+        self.web3 = get_web3()
+        self.account = Account.from_key(private_key)
+        self.monad_swap = MonadSwap(private_key, proxy)
+        self.ambient = AmbientDex(private_key, proxy, config)
+        self.bean = BeanDex(private_key, proxy, config)
+        self.izumi = IzumiDex(private_key, proxy, config)
+
+    async def _snapshot(self) -> Dict[str, Decimal]:
+        """Balance of every token of every DEX, by lowercase address, in one eth_call."""
+        tokens = {
+            address.lower(): {"address": address, "decimals": MONAD_SWAP_DECIMALS}
+            for name, address in TOKENS.items()
+            if name != "native"
+        }
+        for dex_tokens in (AMBIENT_TOKENS, BEAN_TOKENS, IZUMI_TOKENS):
+            for info in dex_tokens.values():
+                tokens.setdefault(info["address"].lower(), info)
+        balances = await get_token_balances(self.web3, self.account.address, tokens)
+        balances.pop("native", None)
+        return balances
+
+    def _candidates(self, balances: Dict[str, Decimal]) -> List[Tuple[str, str, str, Decimal, int]]:
+        """(dex, token name, token address, balance, decimals) of every token to collect."""
+        candidates = []
+        claimed = set()
+
+        def claim(dex: str, name: str, address: str, decimals: int) -> None:
+            balance = balances.get(address.lower(), Decimal(0))
+            if balance > 0 and address.lower() not in claimed:
+                claimed.add(address.lower())
+                candidates.append((dex, name, address, balance, decimals))
+
+        for name, address in TOKENS.items():
+            if name != "native":
+                claim("monad", name, address, MONAD_SWAP_DECIMALS)
+        for name, info in AMBIENT_TOKENS.items():
+            if balances.get(info["address"].lower(), Decimal(0)) >= AMBIENT_MIN_BALANCE.get(name, 0):
+                claim("ambient", name, info["address"], info["decimals"])
+        for name, info in BEAN_TOKENS.items():
+            if name not in BEAN_SKIPPED_TOKENS:
+                claim("bean", name, info["address"], info["decimals"])
+        for name, info in IZUMI_TOKENS.items():
+            if (
+                name not in IZUMI_SKIPPED_TOKENS
+                and balances.get(info["address"].lower(), Decimal(0)) >= IZUMI_MIN_BALANCE
+            ):
+                claim("izumi", name, info["address"], info["decimals"])
+        return candidates
+
+    async def _swap_transaction(
+        self, dex: str, name: str, balance: Decimal, decimals: int, approved: bool
+    ) -> Optional[Tuple[Dict, str, int]]:
+        """(swap transaction, spender, amount in wei) of one token to MON."""
+        gas_limit = None if approved else SWAP_GAS_LIMIT
+
+        if dex == "monad":
+            quote = await self.monad_swap.get_swap_quote(float(balance), "native", token_in=name)
+            if quote is None:
+                return None
+            return quote, quote["to"], self.web3.to_wei(balance, "ether")
+
+        if dex == "ambient" and name == "seth":
+            # Leave a small random amount of SETH, as AmbientDex.swap does
+            balance -= Decimal(str(random.uniform(0.00001, 0.0001)))
+        amount = int(balance * Decimal(10**decimals))
+
+        if dex == "ambient":
+            tx = await self.ambient.generate_swap_data(name, "native", amount, gas_limit)
+            return tx, AMBIENT_CONTRACT, amount
+        if dex == "bean":
+            tx = await self.bean.generate_swap_data(name, "native", amount, 0, gas_limit)
+            return tx, BEAN_CONTRACT, amount
+        tx = await self.izumi.generate_swap_data(name, "native", amount, gas_limit)
+        return tx, IZUMI_CONTRACT, amount
+
+    async def plan(self) -> List[CollectStep]:
+        """Approve and swap transactions collecting every token to MON, from one balance snapshot."""
+        steps = []
+        for dex, name, address, balance, decimals in self._candidates(await self._snapshot()):
+            try:
+                address = self.web3.to_checksum_address(address)
+                spender = DEX_SPENDERS.get(dex)
+                # MonadSwap's spender is only known from the quote
+                approved = spender is not None and await allowance_cache.is_sufficient(
+                    self.web3,
+                    self.account.address,
+                    address,
+                    spender,
+                    int(balance * Decimal(10**decimals)),
+                )
+
+                swap = await self._swap_transaction(dex, name, balance, decimals, approved)
+                if swap is None:
+                    continue
+                swap_tx, spender, amount = swap
+                spender = self.web3.to_checksum_address(spender)
+                if dex == "monad":
+                    approved = await allowance_cache.is_sufficient(
+                        self.web3, self.account.address, address, spender, amount
+                    )
+
+                if not approved:
+                    steps.append(
+                        CollectStep(
+                            f"approve {name} for {dex}",
+                            {
+                                "to": address,
+                                "data": calldata.to_hex(
+                                    calldata.approve(spender, allowance_cache.approval_amount(amount))
+                                ),
+                                "value": 0,
+                                "gas": APPROVE_GAS_LIMIT,
+                            },
+                            address,
+                            spender,
+                            amount,
+                            is_approve=True,
+                        )
+                    )
+                steps.append(CollectStep(f"swap {name} to MON on {dex}", swap_tx, address, spender, amount))
+            except Exception as e:
+                logger.error(f"[{self.account_index}] | Failed to prepare collect of {name} on {dex}: {e}")
+        return steps
+
+    async def _submit(self, steps: List[CollectStep]) -> List[Tuple[CollectStep, object]]:
+        """Broadcast the steps back to back, the nonce manager hands out consecutive nonces."""
+        gas_params = await get_fee_oracle(self.web3).get_gas_params()
+        sent = []
+        failed_approve = None
+        for step in steps:
+            if not step.is_approve and failed_approve == (step.token, step.spender):
+                logger.warning(f"[{self.account_index}] | Skipping {step.label}, its approve was not sent")
+                continue
+            transaction = {
+                **step.transaction,
+                "from": self.account.address,
+                "type": 2,
+                "chainId": 10143,
+                **gas_params,
+            }
+            transaction.pop("nonce", None)
+            try:
+                sent.append((step, await sign_and_send(self.web3, transaction, self.private_key)))
+            except Exception as e:
+                logger.error(f"[{self.account_index}] | Failed to send {step.label}: {e}")
+                if step.is_approve:
+                    failed_approve = (step.token, step.spender)
+        return sent
+
+    async def collect(self) -> bool:
+        """Collect every token to MON, True if all swaps succeeded."""
+        steps = await self.plan()
+        swaps = sum(1 for step in steps if not step.is_approve)
+        if not swaps:
+            logger.info(f"[{self.account_index}] | No tokens to collect to native")
+            return True
+
+        logger.info(
+            f"[{self.account_index}] | Collecting {swaps} tokens to MON with {len(steps)} pipelined transactions"
+        )
+        sent = await self._submit(steps)
+        receipts = await asyncio.gather(
+            *[wait_for_receipt(self.web3, tx_hash) for _, tx_hash in sent],
+            return_exceptions=True,
+        )
+
+        succeeded = 0
+        for (step, tx_hash), receipt in zip(sent, receipts):
+            try:
+                if step.is_approve:
+                    if isinstance(receipt, BaseException):
+                        raise receipt
+                    allowance_cache.record_receipt(receipt)
+                    continue
+                async with allowance_cache.spending(self.account.address, step.token, step.spender, step.amount):
+                    if isinstance(receipt, BaseException):
+                        raise receipt
+                    allowance_cache.record_receipt(receipt)
+                    if receipt["status"] != 1:
+                        raise Exception(f"Transaction failed: {EXPLORER_URL}{tx_hash.hex()}")
+                succeeded += 1
+                logger.success(f"[{self.account_index}] | {step.label}: {EXPLORER_URL}{tx_hash.hex()}")
+            except Exception as e:
+                logger.error(f"[{self.account_index}] | {step.label} failed: {e}")
+
+        logger.info(f"[{self.account_index}] | Collected {succeeded}/{swaps} tokens to MON")
+        return succeeded == swaps
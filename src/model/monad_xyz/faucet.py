@@ -4,7 +4,6 @@ from patchright.async_api import async_playwright
 from loguru import logger
 import random
 import primp
-from web3 import AsyncWeb3
 from src.utils.config import Config
 from eth_account import Account
 import os
@@ -17,7 +16,7 @@ import re
 from asyncio import Lock
 import shutil
 
-from src.utils.constants import RPC_URL
+from src.utils.web3_pool import get_web3
 
 # Create file locks for thread safety
 capsolver_file_lock = Lock()
@@ -193,7 +192,7 @@ async def faucet(
     profile_dir = None
     for retry in range(config.SETTINGS.ATTEMPTS):
         try:
-            my_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+            my_web3 = get_web3()
             capsolver_path = os.path.join(os.path.dirname(__file__), "capsolver")
 
             # Update the capsolver API key in both files before launching the browser
@@ -1,4 +1,3 @@
-import asyncio
 import random
 from loguru import logger
 from eth_account import Account
@@ -8,8 +7,8 @@ from src.model.monad_xyz.bean import BeanDex
 from src.model.monad_xyz.ambient import AmbientDex
 from src.model.monad_xyz.izumi import IzumiDex
 from src.model.monad_xyz.uniswap_swaps import MonadSwap
-from src.model.monad_xyz.faucet import faucet
 from src.utils.config import Config
+from src.utils.scheduler import pause
 
 
 class MonadXYZ:
@@ -64,7 +63,7 @@ class MonadXYZ:
                             logger.success(
                                 f"[{self.account_index}] | Swapped {amount}% of balance to {random_token}. Swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
                             )
-                            await asyncio.sleep(random_pause)
+                            await pause(random_pause)
                             success = True
                             break  # 成功时中断重试循环
                             
@@ -108,7 +107,7 @@ class MonadXYZ:
                             logger.success(
                                 f"[{self.account_index}] | Completed Ambient swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
                             )
-                            await asyncio.sleep(random_pause)
+                            await pause(random_pause)
                             success = True
                             break  # 成功时中断重试循环
                             
@@ -152,7 +151,7 @@ class MonadXYZ:
                             logger.success(
                                 f"[{self.account_index}] | Completed Bean swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
                             )
-                            await asyncio.sleep(random_pause)
+                            await pause(random_pause)
                             success = True
                             break  # 成功时中断重试循环
                             
@@ -196,7 +195,7 @@ class MonadXYZ:
                             logger.success(
                                 f"[{self.account_index}] | Completed Izumi swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
                             )
-                            await asyncio.sleep(random_pause)
+                            await pause(random_pause)
                             success = True
                             break  # Break retry loop on success
                             
@@ -215,6 +214,9 @@ class MonadXYZ:
                 return True
             
             elif type == "collect_all_to_monad":
+                if self.config.FLOW.PIPELINED_COLLECT:
+                    return await self.collect_pipelined()
+
                 success = False
                 for retry in range(self.config.SETTINGS.ATTEMPTS):
                     try:
@@ -230,7 +232,7 @@ class MonadXYZ:
                         logger.success(
                             f"[{self.account_index}] | Collected all to monad.xyz. Next collect in {random_pause} seconds"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
 
                         # 尝试通过 Ambient 收集
                         ambient_swapper = AmbientDex(self.private_key, self.proxy, self.config)
@@ -244,7 +246,7 @@ class MonadXYZ:
                         logger.success(
                             f"[{self.account_index}] | Collected all tokens via Ambient. Next collect in {random_pause} seconds"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
                         
                         # 尝试通过 Bean 收集
                         bean_swapper = BeanDex(self.private_key, self.proxy, self.config)
@@ -258,7 +260,7 @@ class MonadXYZ:
                         logger.success(
                             f"[{self.account_index}] | Collected all tokens via Bean. Next collect in {random_pause} seconds"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
 
                         # 尝试通过 Izumi 收集
                         izumi_swapper = IzumiDex(self.private_key, self.proxy, self.config)
@@ -272,7 +274,7 @@ class MonadXYZ:
                         logger.success(
                             f"[{self.account_index}] | Collected all tokens via Izumi. Next collect in {random_pause} seconds"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
 
                         success = True
                         break  # 成功后打破重试循环
@@ -285,7 +287,7 @@ class MonadXYZ:
                         logger.error(
                             f"[{self.account_index}] | Error collecting tokens ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}. Next collect in {random_pause} seconds"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
                         continue
                     
                 return success  # 如果成功则返回 True，如果所有重试都失败则返回 False
@@ -293,8 +295,33 @@ class MonadXYZ:
             logger.error(f"[{self.account_index}] | Error swaps: {e}")
             return False
 
+    async def collect_pipelined(self) -> bool:
+        """collect_all_to_monad with all approve and swap transactions sent back to back"""
+        from src.model.monad_xyz.collect import PipelinedCollector
+
+        collector = PipelinedCollector(self.account_index, self.private_key, self.proxy, self.config)
+        for retry in range(self.config.SETTINGS.ATTEMPTS):
+            try:
+                # Every attempt plans from a fresh balance snapshot, collected tokens drop out
+                if await collector.collect():
+                    return True
+                raise Exception("Not every token was collected")
+            except Exception as e:
+                random_pause = random.randint(
+                    self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
+                    self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
+                )
+                logger.error(
+                    f"[{self.account_index}] | Error collecting tokens ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}. Next collect in {random_pause} seconds"
+                )
+                await pause(random_pause)
+        return False
+
     async def faucet(self):
         try:
+            # 浏览器依赖 (patchright) 只在领水时加载
+            from src.model.monad_xyz.faucet import faucet
+
             return await faucet(
                 self.session, self.account_index, self.config, self.wallet, self.proxy
             )
@@ -457,6 +484,6 @@ class MonadXYZ:
                 logger.error(
                     f"[{self.account_index}] | Error connect discord to monad.xyz ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}. Next connect in {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
                 continue
         return False
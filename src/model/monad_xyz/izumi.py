@@ -1,21 +1,28 @@
-from web3 import AsyncWeb3
 from eth_account import Account
-import asyncio
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 import random
 from loguru import logger
-from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
+from src.utils.constants import EXPLORER_URL, ERC20_ABI
+from src.utils.contracts import get_contract
+from src.utils import calldata
+from src.utils.allowance_cache import allowance_cache
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.balance_scanner import get_token_balances
 from src.model.monad_xyz.constants import IZUMI_ABI, IZUMI_TOKENS, IZUMI_CONTRACT
 import time
 from src.utils.config import Config
+from src.utils.scheduler import pause
 
 class IzumiDex:
     def __init__(self, private_key: str, proxy: Optional[str] = None, config: Config = None):
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         self.account = Account.from_key(private_key)
         self.proxy = proxy
-        self.router_contract = self.web3.eth.contract(
+        self.router_contract = get_contract(self.web3,
             address=self.web3.to_checksum_address(IZUMI_CONTRACT),
             abi=IZUMI_ABI
         )
@@ -23,15 +30,7 @@ class IzumiDex:
         self.config = config
         
     async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     def convert_to_wei(self, amount: float, token: str) -> int:
         """Convert amount to wei based on token decimals."""
@@ -51,62 +50,50 @@ class IzumiDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
         
+        # Native and token balances in one multicall
+        balances = await get_token_balances(self.web3, self.account.address, IZUMI_TOKENS)
+        
         # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
-        if native_balance > 10**14:  # More than 0.0001 MON
-            native_amount = float(self.web3.from_wei(native_balance, 'ether'))
-            tokens_with_balance.append(("native", native_amount))
+        native_balance = balances.pop("native", 0)
+        if native_balance > Decimal("0.0001"):  # More than 0.0001 MON
+            tokens_with_balance.append(("native", float(native_balance)))
         
         # Check other tokens
-        for token in IZUMI_TOKENS:
+        for token, balance in balances.items():
             if token == "wmon":  # Skip WMON as we handle it internally
                 continue
-            try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(IZUMI_TOKENS[token]["address"]),
-                    abi=ERC20_ABI
-                )
-                balance = await token_contract.functions.balanceOf(self.account.address).call()
-                
-                # Only add tokens with sufficient balance (more than 0.0001 tokens)
-                min_amount = 10 ** (IZUMI_TOKENS[token]["decimals"] - 4)
-                if balance >= min_amount:
-                    decimals = IZUMI_TOKENS[token]["decimals"]
-                    amount = float(Decimal(str(balance)) / Decimal(str(10 ** decimals)))
-                    tokens_with_balance.append((token, amount))
-                    
-            except Exception as e:
-                logger.error(f"Failed to get balance for {token}: {str(e)}")
-                continue
+            # Only add tokens with sufficient balance (more than 0.0001 tokens)
+            if balance >= Decimal("0.0001"):
+                tokens_with_balance.append((token, float(balance)))
         
         return tokens_with_balance
 
+    def token_address(self, token: str) -> Optional[str]:
+        """Checksum address of a token, None for native MON."""
+        if token == "native":
+            return None
+        return self.web3.to_checksum_address(IZUMI_TOKENS[token]["address"])
+
     async def approve_token(self, token: str, amount: int) -> Optional[str]:
         """Approve token spending for Izumi router."""
         try:
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(IZUMI_TOKENS[token]["address"]),
-                abi=ERC20_ABI
-            )
+            token_address = self.token_address(token)
             
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address,
-                IZUMI_CONTRACT
-            ).call()
-            
-            if current_allowance >= amount:
+            # Known allowances need no RPC call
+            if await allowance_cache.is_sufficient(
+                self.web3, self.account.address, token_address, IZUMI_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
             
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
+            token_contract = get_contract(self.web3, address=token_address, abi=ERC20_ABI)
             gas_params = await self.get_gas_params()
             
             approve_tx = await token_contract.functions.approve(
                 IZUMI_CONTRACT,
-                amount
+                allowance_cache.approval_amount(amount)
             ).build_transaction({
                 'from': self.account.address,
-                'nonce': nonce,
                 'type': 2,
                 'chainId': 10143,
                 **gas_params,
@@ -120,11 +107,11 @@ class IzumiDex:
 
     async def execute_transaction(self, transaction: Dict) -> str:
         """Execute a transaction and wait for confirmation."""
-        signed_txn = self.web3.eth.account.sign_transaction(transaction, self.account.key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = await sign_and_send(self.web3, transaction, self.account.key)
         
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
+        allowance_cache.record_receipt(receipt)
         
         if receipt['status'] == 1:
             logger.success(f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -153,7 +140,7 @@ class IzumiDex:
                 for token_in, balance in tokens_to_swap:
                     try:
                         # Get actual balance directly in wei
-                        token_contract = self.web3.eth.contract(
+                        token_contract = get_contract(self.web3,
                             address=self.web3.to_checksum_address(IZUMI_TOKENS[token_in]["address"]),
                             abi=ERC20_ABI
                         )
@@ -166,18 +153,21 @@ class IzumiDex:
                             self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
                         )
                         logger.info(f"Sleeping {random_pause} seconds after approve")
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
 
                         amount_token = self.convert_from_wei(amount_wei, token_in)
                         logger.info(f"Collecting {amount_token} {token_in} to native")
                         
                         # Generate and execute swap transaction
-                        tx_data = await self.generate_swap_data(token_in, "native", amount_wei)
-                        tx_hash = await self.execute_transaction(tx_data)
+                        async with allowance_cache.spending(
+                            self.account.address, self.token_address(token_in), IZUMI_CONTRACT, amount_wei
+                        ):
+                            tx_data = await self.generate_swap_data(token_in, "native", amount_wei)
+                            await self.execute_transaction(tx_data)
                         
                         # Wait between swaps
                         if token_in != tokens_to_swap[-1][0]:  # If not the last token
-                            await asyncio.sleep(random.randint(5, 10))
+                            await pause(random.randint(5, 10))
                             
                     except Exception as e:
                         logger.error(f"Failed to collect {token_in} to native: {str(e)}")
@@ -206,7 +196,7 @@ class IzumiDex:
                     amount_token = float(self.web3.from_wei(amount_wei, 'ether'))
                 else:
                     # Get actual balance directly in wei
-                    token_contract = self.web3.eth.contract(
+                    token_contract = get_contract(self.web3,
                         address=self.web3.to_checksum_address(IZUMI_TOKENS[token_in]["address"]),
                         abi=ERC20_ABI
                     )
@@ -220,13 +210,16 @@ class IzumiDex:
                         self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
                     )
                     logger.info(f"Sleeping {random_pause} seconds after approve")
-                    await asyncio.sleep(random_pause)
+                    await pause(random_pause)
                 
                 logger.info(f"Swapping {amount_token} {token_in} to {token_out}")
                 
                 # Generate and execute swap transaction
-                tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
-                return await self.execute_transaction(tx_data)
+                async with allowance_cache.spending(
+                    self.account.address, self.token_address(token_in), IZUMI_CONTRACT, amount_wei
+                ):
+                    tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
+                    return await self.execute_transaction(tx_data)
 
         except Exception as e:
             logger.error(f"Izumi swap failed: {str(e)}")
@@ -249,19 +242,17 @@ class IzumiDex:
             logger.warning(f"Gas estimation failed: {str(e)}")
 
 
-    async def generate_swap_data(self, token_in: str, token_out: str, amount_in: int) -> Dict:
-        """Generate swap transaction data."""
+    async def generate_swap_data(
+        self, token_in: str, token_out: str, amount_in: int, gas_limit: Optional[int] = None
+    ) -> Dict:
+        """Generate swap transaction data, gas_limit skips the gas estimation."""
         try:
             # Get token addresses and handle native token case
             token_in_address = IZUMI_TOKENS["wmon"]["address"] if token_in == "native" else IZUMI_TOKENS[token_in]["address"]
             token_out_address = IZUMI_TOKENS["wmon"]["address"] if token_out == "native" else IZUMI_TOKENS[token_out]["address"]
             
             # Pack addresses and fee tier: [tokenA, fee, tokenB]
-            path = bytes.fromhex(
-                self.web3.to_checksum_address(token_in_address)[2:] +  # Input token address
-                format(self.FEE_TIER, '06x') +  # 3-byte fee tier
-                self.web3.to_checksum_address(token_out_address)[2:]  # Output token address
-            )
+            path = calldata.izumi_path(token_in_address, self.FEE_TIER, token_out_address)
             
             # Parameters for swapAmount
             deadline = int(time.time() + 3600 * 6)  # 6 hours from now
@@ -271,34 +262,24 @@ class IzumiDex:
             recipient = IZUMI_CONTRACT if token_out == "native" else self.account.address
             
             # Encode swapAmount call
-            swap_data = self.router_contract.encode_abi(
-                "swapAmount",
-                [(path, recipient, amount_in, min_acquired, deadline)]
-            )
+            swap_data = calldata.izumi_swap_amount(path, recipient, amount_in, min_acquired, deadline)
             
             # Prepare multicall data array
             multicall_array = [swap_data]
             
             # Add unwrapWETH9 if receiving native token
             if token_out == "native":
-                unwrap_data = self.router_contract.encode_abi(
-                    "unwrapWETH9",
-                    [min_acquired, self.account.address]
-                )
+                unwrap_data = calldata.izumi_unwrap_weth9(min_acquired, self.account.address)
                 multicall_array.append(unwrap_data)
             
             # Add refundETH call
-            refund_data = self.router_contract.encode_abi("refundETH")
+            refund_data = calldata.izumi_refund_eth()
             multicall_array.append(refund_data)
             
             # Encode the final multicall
-            multicall_data = self.router_contract.encode_abi(
-                "multicall",
-                [multicall_array]  # Pass as a single array argument
-            )
+            multicall_data = calldata.to_hex(calldata.izumi_multicall(multicall_array))
             
             # Prepare base transaction
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
             
             tx_data = {
@@ -306,14 +287,12 @@ class IzumiDex:
                 'to': self.web3.to_checksum_address(IZUMI_CONTRACT),
                 'value': amount_in if token_in == "native" else 0,
                 'data': multicall_data,
-                'nonce': nonce,
                 'chainId': 10143,
                 **gas_params,
             }
             
             # Estimate gas for the transaction
-            gas_limit = await self.estimate_gas(tx_data)
-            tx_data['gas'] = gas_limit
+            tx_data['gas'] = gas_limit or await self.estimate_gas(tx_data)
             
             return tx_data
             
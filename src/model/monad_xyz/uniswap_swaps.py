@@ -1,14 +1,21 @@
 import random
-from web3 import AsyncWeb3
 from eth_account import Account
 import json
-import asyncio
 from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
-from src.utils.constants import TOKENS, ERC20_ABI, RPC_URL, EXPLORER_URL
+from src.utils.constants import TOKENS, ERC20_ABI, EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils import calldata
+from src.utils.allowance_cache import allowance_cache
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.balance_scanner import get_token_balances
 from loguru import logger
 from src.utils.client import create_client
 from src.utils.config import get_config
+from src.utils.scheduler import pause
 
 # Get config singleton
 config = get_config()
@@ -24,23 +31,13 @@ class MonadSwap:
             private_key: Private key for the wallet
             proxy: Optional proxy URL for API requests
         """
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         self.account = Account.from_key(private_key)
         self.proxy = proxy
 
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     async def get_token_balance_ether(self, token_out: str) -> Decimal:
         """Get balance of specified token."""
@@ -54,7 +51,7 @@ class MonadSwap:
                 else:
                     # Prepare the contract call data manually
                     contract_address = self.web3.to_checksum_address(TOKENS[token_out])
-                    contract = self.web3.eth.contract(address=contract_address, abi=ERC20_ABI)
+                    contract = get_contract(self.web3, address=contract_address, abi=ERC20_ABI)
                     balance_wei = await contract.functions.balanceOf(self.account.address).call()
                     balance_ether = Decimal(self.web3.from_wei(balance_wei, 'ether'))
                     logger.info(f"Balance: {balance_ether:.4f} {token_out}")
@@ -64,15 +61,24 @@ class MonadSwap:
                 if attempt == max_retries - 1:
                     logger.error(f"Error getting balance after {max_retries} attempts: {str(e)}")
                 else:
-                    await asyncio.sleep(1)  # Fixed 1 second pause between retries
+                    await pause(1)  # Fixed 1 second pause between retries
     
     async def get_tokens_with_balance(self) -> List[Tuple[str, Decimal]]:
         tokens_with_balance = []
-        for token in TOKENS:
+        balances = await get_token_balances(
+            self.web3,
+            self.account.address,
+            {
+                token: {"address": address, "decimals": 18}
+                for token, address in TOKENS.items()
+                if token != "native"
+            },
+        )
+        for token, balance in balances.items():
             if token == "native":
                 continue
-            balance = await self.get_token_balance_ether(token)
             if balance > 0:
+                logger.info(f"Balance: {balance:.4f} {token}")
                 tokens_with_balance.append((token, balance))
         return tokens_with_balance
     
@@ -146,12 +152,12 @@ class MonadSwap:
                     if attempt == max_retries - 1:
                         raise Exception(f"Failed to get quote after {max_retries} attempts: {str(e)}")
                     logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                    await asyncio.sleep(random.randint(
+                    await pause(random.randint(
                         config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                         config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
                     ))
 
-    async def generate_approve_transaction(self, token: str, amount: float, swap_tx_data: Dict) -> Dict:
+    async def generate_approve_transaction(self, token: str, amount: float, swap_tx_data: Dict) -> Optional[Dict]:
         """
         Generate an approve transaction for the token.
         
@@ -161,12 +167,11 @@ class MonadSwap:
             swap_tx_data: Swap transaction data containing the spender address
         
         Returns:
-            Dict containing the approval transaction data
+            Dict containing the approval transaction data, None if the
+            spender is already allowed to spend amount
         """
         try:
-            # Get the token contract
             token_address = self.web3.to_checksum_address(TOKENS[token])
-            token_contract = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
             
             # Get the spender address from swap transaction data
             spender_address = self.web3.to_checksum_address(swap_tx_data['to'])
@@ -174,17 +179,22 @@ class MonadSwap:
             # Convert amount to Wei
             amount_wei = self.web3.to_wei(amount, 'ether')
             
+            if await allowance_cache.is_sufficient(
+                self.web3, self.account.address, token_address, spender_address, amount_wei
+            ):
+                logger.info(f"Allowance sufficient for {token}")
+                return None
+            
             # Generate the approve function data
-            function_signature = self.web3.keccak(text="approve(address,uint256)")[0:4]
-            padded_address = spender_address[2:].zfill(64)
-            padded_amount = hex(amount_wei)[2:].zfill(64)
-            approve_data = function_signature.hex() + padded_address + padded_amount
+            approve_data = calldata.to_hex(
+                calldata.approve(spender_address, allowance_cache.approval_amount(amount_wei))
+            )
             
             # Estimate gas for the approval
             gas_estimate = await self.web3.eth.estimate_gas({
                 'to': token_address,
                 'from': self.account.address,
-                'data': '0x' + approve_data,
+                'data': approve_data,
                 'value': 0
             })
             
@@ -194,7 +204,7 @@ class MonadSwap:
             # Create the transaction data
             tx_data = {
                 "to": token_address,
-                "data": '0x' + approve_data,
+                "data": approve_data,
                 "value": 0,
                 "gas": gas_limit
             }
@@ -207,23 +217,21 @@ class MonadSwap:
             raise
 
     async def execute_transaction(self, tx_data: Dict) -> str:
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
         gas_params = await self.get_gas_params()
         
         transaction = {
             "from": self.account.address,
-            "nonce": nonce,
             "type": 2,
             "chainId": 10143,
             **tx_data,
             **gas_params,
         }
 
-        signed_txn = self.web3.eth.account.sign_transaction(transaction, self.account.key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = await sign_and_send(self.web3, transaction, self.account.key)
         
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
+        allowance_cache.record_receipt(receipt)
         
         if receipt['status'] == 1:
             logger.success(f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -241,15 +249,22 @@ class MonadSwap:
                 for token, balance in tokens_with_balance:
                     swap_tx_data = await self.get_swap_quote(balance, "native", token_in=token)
                     approve_tx_data = await self.generate_approve_transaction(token, balance, swap_tx_data)
-                    await self.execute_transaction(approve_tx_data)
-                    random_pause = random.randint(
-                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                    )
-                    logger.info(f"Swapping {balance} {token} to MON. Sleeping {random_pause} seconds after approve")
-                    await asyncio.sleep(random_pause)
+                    if approve_tx_data:
+                        await self.execute_transaction(approve_tx_data)
+                        random_pause = random.randint(
+                            config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                            config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                        )
+                        logger.info(f"Swapping {balance} {token} to MON. Sleeping {random_pause} seconds after approve")
+                        await pause(random_pause)
                     
-                    await self.execute_transaction(swap_tx_data)
+                    async with allowance_cache.spending(
+                        self.account.address,
+                        self.web3.to_checksum_address(TOKENS[token]),
+                        self.web3.to_checksum_address(swap_tx_data['to']),
+                        self.web3.to_wei(balance, 'ether'),
+                    ):
+                        await self.execute_transaction(swap_tx_data)
             else:
                 logger.info(f"Swapping MON to {token_out}...")
                 tx_data = await self.get_swap_quote(percentage_to_swap, token_out)
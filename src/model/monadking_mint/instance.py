@@ -1,12 +1,16 @@
-import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.utils.config import Config
+from src.utils.scheduler import pause
 from loguru import logger
 
 # 基于 Monad King NFT 交易的 ABI
@@ -82,11 +86,11 @@ class Monadking:
         self.config = config
         self.nft_contract_address = "0x5DCC4Cc8F56295Cb486809C77d476B2ea09a6938"
         self.unlocked_contract_address = "0xeC5Fc06e3C1D5d320199f1930cE3c3de9B262570"
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
-        self.nft_contract = self.web3.eth.contract(
+        self.web3 = get_web3()
+        self.nft_contract = get_contract(self.web3,
             address=self.nft_contract_address, abi=MONAD_KING_ABI
         )
-        self.unlocked_contract = self.web3.eth.contract(
+        self.unlocked_contract = get_contract(self.web3,
             address=self.unlocked_contract_address, abi=MONAD_KING_ABI
         )
 
@@ -170,26 +174,16 @@ class Monadking:
                     {
                         "from": self.account.address,
                         "value": price,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "maxFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
+                        "maxPriorityFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
                     }
                 )
 
                 # 我们签署交易
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    mint_txn, self.private_key
-                )
-
-                # 发送交易
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, mint_txn, self.private_key)
 
                 # 我们正在等待确认
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -210,7 +204,7 @@ class Monadking:
                 logger.error(
                     f"[{self.account_index}] Error in mint on Monad King: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
         return False
 
@@ -262,26 +256,16 @@ class Monadking:
                     {
                         "from": self.account.address,
                         "value": price,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "maxFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
+                        "maxPriorityFeePerGas": await get_fee_oracle(self.web3).get_gas_price(),
                     }
                 )
 
                 # 我们签署交易
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    mint_txn, self.private_key
-                )
-
-                # 发送交易
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, mint_txn, self.private_key)
 
                 # 我们正在等待确认
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -302,6 +286,6 @@ class Monadking:
                 logger.error(
                     f"[{self.account_index}] Error in mint on Unlocked Monad: {e}. Sleeping for {random_pause} seconds"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
         return False
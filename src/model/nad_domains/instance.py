@@ -1,15 +1,19 @@
-import asyncio
 import random
 import string
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from typing import Dict, Optional, Tuple
 
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.contracts import get_contract
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.model.nad_domains.constants import NAD_CONTRACT_ADDRESS, NAD_API_URL, NAD_ABI, NAD_NFT_ADDRESS, NAD_NFT_ABI
+from src.utils.scheduler import pause
 
 
 class NadDomains:
@@ -28,33 +32,23 @@ class NadDomains:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         
         # Initialize contract using constants
-        self.contract = self.web3.eth.contract(
+        self.contract = get_contract(self.web3,
             address=self.web3.to_checksum_address(NAD_CONTRACT_ADDRESS),
             abi=NAD_ABI
         )
         
         # Initialize NAD NFT contract
-        self.nft_contract = self.web3.eth.contract(
+        self.nft_contract = get_contract(self.web3,
             address=self.web3.to_checksum_address(NAD_NFT_ADDRESS),
             abi=NAD_NFT_ABI
         )
     # 获取当前网络的 gas 参数。
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     # 生成一个随机的域名。
     def generate_random_name(self, min_length=6, max_length=12) -> str:
@@ -184,21 +178,17 @@ class NadDomains:
                 'from': self.account.address,
                 'value': fee,
                 'gas': gas_with_buffer,
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address),
                 'chainId': 10143,
                 'type': 2,
                 **gas_params
             })
             
-            # Sign the transaction
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.private_key)
-            
-            # Send the transaction
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            # Sign and send the transaction
+            tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
             logger.info(f"[{self.account_index}] Registering {name} - Transaction sent: {EXPLORER_URL}{tx_hash.hex()}")
             
             # Wait for transaction receipt
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
             success = receipt['status'] == 1
             
             if success:
@@ -257,7 +247,7 @@ class NadDomains:
                         self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1]
                     )
                     logger.error(f"[{self.account_index}] Error registering domain (attempt {retry+1}/{self.config.SETTINGS.ATTEMPTS}): {str(e)}. Sleeping for {random_pause} seconds")
-                    await asyncio.sleep(random_pause)
+                    await pause(random_pause)
             
             return False
             
@@ -1,4 +1,3 @@
 SEPOLIA_EXPLORER_URL = "https://sepolia.etherscan.io/tx/0x"
-SEPOLIA_RPC_URL = "https://sepolia.drpc.org/"
 MONAD_SEPOLIA_ETHEREUM_ADDRESS = "0x836047a99e11F376522B447bffb6e3495Dd0637c"
 SEPOLIA_BRIDGE_ADDRESS="0xB5AADef97d81A77664fcc3f16Bfe328ad6CEc7ac" # Sepolia Bridge Address，未验证该合约地址的有效性
\ No newline at end of file
@@ -2,14 +2,18 @@ import random
 from typing import Dict
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
-import asyncio
 
-from src.model.orbiter.constants import SEPOLIA_EXPLORER_URL, SEPOLIA_RPC_URL, MONAD_SEPOLIA_ETHEREUM_ADDRESS, SEPOLIA_BRIDGE_ADDRESS
+from src.model.orbiter.constants import SEPOLIA_EXPLORER_URL, MONAD_SEPOLIA_ETHEREUM_ADDRESS, SEPOLIA_BRIDGE_ADDRESS
 from src.utils.client import create_client
+from src.utils.contracts import get_contract
 from src.utils.config import Config
 from loguru import logger
-from src.utils.constants import RPC_URL, ERC20_ABI
+from src.utils.constants import ERC20_ABI
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.arrival_watcher import wait_for_arrival
 
 
 class Orbiter:
@@ -28,53 +32,36 @@ class Orbiter:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(SEPOLIA_RPC_URL))
-        self.monad_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3("Sepolia")
+        self.monad_web3 = get_web3()
         
         # Initialize ERC20 contract
-        self.monad_sepolia = self.monad_web3.eth.contract(
+        self.monad_sepolia = get_contract(self.monad_web3,
             address=self.monad_web3.to_checksum_address(MONAD_SEPOLIA_ETHEREUM_ADDRESS),
             abi=ERC20_ABI
         )
         
     async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        
-        # Multiply both fees by 1.5
-        max_priority_fee = int(max_priority_fee * 1.5)
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
     
     # 等待资金到达 Monad 网络。
     async def wait_for_funds(self, initial_balance: int):
         """Wait for funds to arrive in Monad network."""
-        max_attempts = self.config.ORBITER.MAX_WAIT_TIME // 10  # 将总等待时间转换为 10 秒尝试次数
-        
-        logger.info(f"[{self.account_index}] Waiting for funds to arrive in Monad (max wait time: {self.config.ORBITER.MAX_WAIT_TIME} seconds)...")
-        for attempt in range(max_attempts):
-            try:
-                current_balance = await self.monad_sepolia.functions.balanceOf(
-                    self.account.address
-                ).call()
-                
-                if current_balance > initial_balance:
-                    logger.success(f"[{self.account_index}] Funds arrived in Monad!")
-                    return True
-                
-                logger.info(f"[{self.account_index}] Still waiting for funds... (attempt {attempt + 1}/{max_attempts}, {(max_attempts - attempt) * 10} seconds remaining)")
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"[{self.account_index}] Error checking token balance: {str(e)}")
-                await asyncio.sleep(10)
-                
-        logger.warning(f"[{self.account_index}] Timeout waiting for funds after {self.config.ORBITER.MAX_WAIT_TIME} seconds")
+        timeout = self.config.ORBITER.MAX_WAIT_TIME
+
+        logger.info(f"[{self.account_index}] Waiting for funds to arrive in Monad (max wait time: {timeout} seconds)...")
+        current_balance = await wait_for_arrival(
+            self.monad_web3,
+            self.account.address,
+            initial_balance,
+            timeout,
+            token=MONAD_SEPOLIA_ETHEREUM_ADDRESS,
+        )
+        if current_balance is not None:
+            logger.success(f"[{self.account_index}] Funds arrived in Monad!")
+            return True
+
+        logger.warning(f"[{self.account_index}] Timeout waiting for funds after {timeout} seconds")
         return False
 
     # 通过 Orbiter 将 ETH 从 Sepolia 桥接到 Monad。
@@ -136,7 +123,6 @@ class Orbiter:
                 'from': self.account.address,
                 'to': SEPOLIA_BRIDGE_ADDRESS,  # 调整成配置文件获取跨链桥地址，合约地址的合法性有待验证 "0xB5AADef97d81A77664fcc3f16Bfe328ad6CEc7ac",   #   bridge address
                 'value': amount_wei,
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address),
                 'chainId': 11155111,
                 'type': 2,
                 'gas': 21000,   # 这里用了固定的gas
@@ -145,14 +131,13 @@ class Orbiter:
 
             # 签署并发送交易
             try:
-                signed_txn = self.web3.eth.account.sign_transaction(transaction, self.private_key)
-                tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
                 tx_hash_str = tx_hash.hex()
                 if tx_hash_str.startswith('0x'):
                     tx_hash_str = tx_hash_str[2:]  # Remove '0x' prefix if present
                 
                 logger.info(f"[{self.account_index}] Waiting for bridge transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt['status'] == 1:
                     logger.success(f"[{self.account_index}] Successfully initiated bridge to Monad. TX: {SEPOLIA_EXPLORER_URL}{tx_hash_str}")
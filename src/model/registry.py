@@ -0,0 +1,206 @@
+import functools
+import importlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+
+# Protocol class of every integration, "module:attribute". Modules are only
+# imported when a task of the plan needs them, so a run that never touches
+# e.g. the browser faucet does not pay for importing it.
+PROTOCOLS = {
+    "MonadXYZ": "src.model.monad_xyz.instance:MonadXYZ",
+    "TestnetBridge": "src.model.testnet_bridge.instance:TestnetBridge",
+    "Memebridge": "src.model.memebridge.instance:Memebridge",
+    "Dusted": "src.model.dusted.instance:Dusted",
+    "Aircraft": "src.model.aircraft.instance:Aircraft",
+    "MagicEden": "src.model.magiceden.instance:MagicEden",
+    "Monadking": "src.model.monadking_mint.instance:Monadking",
+    "Demask": "src.model.demask_mint.instance:Demask",
+    "Lilchogstars": "src.model.lilchogstars_mint.instance:Lilchogstars",
+    "Kintsu": "src.model.kintsu.instance:Kintsu",
+    "Orbiter": "src.model.orbiter.instance:Orbiter",
+    "Accountable": "src.model.accountable.instance:Accountable",
+    "Shmonad": "src.model.shmonad.instance:Shmonad",
+    "Gaszip": "src.model.gaszip.instance:Gaszip",
+    "MonadverseMint": "src.model.monadverse_mint.instance:MonadverseMint",
+    "Bima": "src.model.bima.instance:Bima",
+    "Owlto": "src.model.owlto.instance:Owlto",
+    "Magma": "src.model.magma.instance:Magma",
+    "Apriori": "src.model.apriori.instance:Apriori",
+    "NadDomains": "src.model.nad_domains.instance:NadDomains",
+    "WalletStats": "src.model.help.stats:WalletStats",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_protocol(name: str):
+    """Import and return the protocol class registered under name."""
+    module_path, attribute = PROTOCOLS[name].split(":")
+    return getattr(importlib.import_module(module_path), attribute)
+
+
+# Constructor arguments of the protocol classes, taken from the Start instance
+def standard_args(start) -> Tuple:
+    return (start.account_index, start.proxy, start.private_key, start.config, start.session)
+
+
+def no_session_args(start) -> Tuple:
+    return (start.account_index, start.proxy, start.private_key, start.config)
+
+
+def monad_xyz_args(start) -> Tuple:
+    return (
+        start.account_index,
+        start.proxy,
+        start.private_key,
+        start.discord_token,
+        start.config,
+        start.session,
+    )
+
+
+def monadking_args(start) -> Tuple:
+    return (start.account_index, start.private_key, start.config)
+
+
+def magiceden_args(start) -> Tuple:
+    return (start.account_index, start.config, start.private_key, start.session)
+
+
+def wallet_stats_args(start) -> Tuple:
+    return (start.config,)
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """
+    How to run one task of tasks.py.
+
+    protocol: name in PROTOCOLS
+    entrypoint: method called on the protocol instance, or a coroutine
+        function (instance, start) for tasks made of several steps
+    args: builds the protocol constructor arguments from the Start instance
+    kwargs: keyword arguments of the entrypoint method
+    chains: chains the task talks to
+    sends_transactions: whether the task broadcasts transactions
+    rpc_cost: expected JSON-RPC calls of one run, for budgeting
+    reusable: whether one protocol instance may serve repeated tasks of the
+        same account
+    disabled: reason the task is switched off, it is skipped with a warning
+    """
+
+    protocol: str
+    entrypoint: Union[str, Callable[[Any, Any], Awaitable[Any]]]
+    args: Callable[[Any], Tuple] = standard_args
+    kwargs: Optional[Dict[str, Any]] = None
+    chains: Tuple[str, ...] = ("Monad",)
+    sends_transactions: bool = True
+    rpc_cost: int = 5
+    reusable: bool = True
+    disabled: Optional[str] = None
+
+
+async def bima_flow(bima, start):
+    result = await bima.get_faucet_tokens()  # 调用了合约（貌似是一个借贷合约），faucet操作
+    await start.sleep("bima_faucet")  # 随机停顿，停顿时间在配置文件中完成了配置
+
+    if start.config.BIMA.LEND:  # 是否借贷
+        return await bima.lend()  # 借贷操作
+    return result
+
+
+async def wallet_stats_flow(wallet_stats, start):
+    return await wallet_stats.get_wallet_stats(start.private_key, start.account_index)
+
+
+def monad_xyz_swaps(swap_type: str, rpc_cost: int) -> TaskSpec:
+    return TaskSpec(
+        "MonadXYZ",
+        "swaps",
+        monad_xyz_args,
+        kwargs={"type": swap_type},
+        rpc_cost=rpc_cost,
+    )
+
+
+TASKS: Dict[str, TaskSpec] = {
+    # 领水龙头
+    "faucet": TaskSpec(
+        "MonadXYZ", "faucet", monad_xyz_args, sends_transactions=False, rpc_cost=0
+    ),
+    # 以下是swap交易操作
+    "swaps": monad_xyz_swaps("swaps", 20),
+    "ambient": monad_xyz_swaps("ambient", 20),
+    "bean": monad_xyz_swaps("bean", 20),
+    "izumi": monad_xyz_swaps("izumi", 20),
+    "collect_all_to_monad": monad_xyz_swaps("collect_all_to_monad", 30),
+    # 加油交易（发送：Arbitrum、Optimism、Base给这个地址0x391E7C679d29bD940d63be94AD22A25d25b5A604）
+    "gaszip": TaskSpec(
+        "Gaszip",
+        "refuel",
+        no_session_args,
+        chains=("Arbitrum", "Optimism", "Base", "Monad"),
+        rpc_cost=10,
+        disabled="Gaszip is disabled~",
+    ),
+    "memebridge": TaskSpec(
+        "Memebridge",
+        "refuel",
+        no_session_args,
+        chains=("Arbitrum", "Optimism", "Base", "Monad"),
+        rpc_cost=10,
+    ),
+    # apriori 质押 MON ，质押地址（0xb2f82D0f38dc453D596Ad40A37799446Cc89274A），未验证该合约地址的有效性
+    "apriori": TaskSpec("Apriori", "stake_mon"),
+    # magma 质押 MON , 质押地址（0x2c9C959516e9AAEdB2C748224a41249202ca8BE7），未验证该合约地址的有效性
+    "magma": TaskSpec("Magma", "stake_mon"),
+    # 部署 Owlto 合约，需要更改成自己的合约字节码（在配置文件中 owlto/constants.py）
+    "owlto": TaskSpec("Owlto", "deploy_contract"),
+    "bima": TaskSpec("Bima", bima_flow, rpc_cost=15),
+    # Mint Monadverse NFT
+    "monadverse_mint": TaskSpec("MonadverseMint", "mint"),
+    # Swap shMON质押与解除质押交互，涉及买&卖swap shMON操作
+    "shmonad": TaskSpec("Shmonad", "swaps", rpc_cost=15),
+    # game.accountable.capital 1-8号NFT mint，每个账户每个id的NFT mint限制mint数量配置文件有配置
+    "accountable": TaskSpec("Accountable", "mint", rpc_cost=10),
+    # 跨桥链，通过 Orbiter 将 ETH 从 Sepolia 桥接到 Monad
+    "orbiter": TaskSpec("Orbiter", "bridge", chains=("Sepolia", "Monad"), rpc_cost=10),
+    "testnet_bridge": TaskSpec(
+        "TestnetBridge",
+        "execute",
+        chains=("Arbitrum", "Optimism", "Base", "Sepolia"),
+        rpc_cost=10,
+    ),
+    # 将钱包统计信息保存到配置中，用于事后分析（反向验证脚本可用性）
+    "logs": TaskSpec(
+        "WalletStats",
+        wallet_stats_flow,
+        wallet_stats_args,
+        sends_transactions=False,
+        rpc_cost=2,
+    ),
+    # 注册随机域名
+    "nad_domains": TaskSpec("NadDomains", "register_random_domain", rpc_cost=8),
+    # 【慎用】kintsu上面质押MON，这里只有质押操作，没有解除质押操作
+    "kintsu": TaskSpec("Kintsu", "stake_mon"),
+    # mint NFT，需要验证合约地址的有效性
+    "lilchogstars": TaskSpec("Lilchogstars", "mint"),
+    "demask": TaskSpec("Demask", "mint"),
+    "monadking": TaskSpec("Monadking", "mint", monadking_args),
+    "monadking_unlocked": TaskSpec("Monadking", "mint_unlocked", monadking_args),
+    "magiceden": TaskSpec("MagicEden", "mint", magiceden_args),
+    # 登录后的会话状态留在实例中，每次都重新创建
+    "aircraft": TaskSpec("Aircraft", "execute", rpc_cost=8, reusable=False),
+    "dusted": TaskSpec("Dusted", "execute", rpc_cost=8, reusable=False),
+}
+
+
+def plan_budget(tasks: Iterable[str]) -> Dict[str, int]:
+    """Expected JSON-RPC calls per chain of a task plan, multi-chain tasks count against each chain."""
+    budget: Dict[str, int] = {}
+    for task in tasks:
+        spec = TASKS.get(task.lower())
+        if spec is None or spec.disabled:
+            continue
+        for chain in spec.chains:
+            budget[chain] = budget.get(chain, 0) + spec.rpc_cost
+    return budget
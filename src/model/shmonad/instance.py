@@ -1,12 +1,16 @@
-import asyncio
 import random
 from loguru import logger
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from src.utils.config import Config
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.contracts import get_contract
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
 from src.model.shmonad.constants import SHMONAD_ADDRESS, SHMONAD_ABI, STAKE_POLICY_ID
+from src.utils.scheduler import pause
 from typing import Dict
 
 
@@ -26,13 +30,13 @@ class Shmonad:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
 
     # 获取shmon余额
     async def _get_shmon_balance(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
@@ -44,7 +48,7 @@ class Shmonad:
                 logger.error(
                     f"[{self.account_index}] | Error getting Shmonad balance: {e}"
                 )
-                await asyncio.sleep(1)
+                await pause(1)
         return None
 
     async def swaps(self):
@@ -100,7 +104,7 @@ class Shmonad:
                         logger.info(
                             f"[{self.account_index}] | Sleeping for {random_pause} seconds before selling Shmon"
                         )
-                        await asyncio.sleep(random_pause)
+                        await pause(random_pause)
 
                         if not await self.sell_shmon():
                             logger.error(
@@ -124,7 +128,7 @@ class Shmonad:
                     logger.info(
                         f"[{self.account_index}] | Sleeping for {random_pause} seconds before staking Shmon"
                     )
-                    await asyncio.sleep(random_pause)
+                    await pause(random_pause)
 
                     if not await self.stake_shmon(): # 质押操作
                         logger.error(f"[{self.account_index}] | Failed to stake Shmon")
@@ -147,7 +151,7 @@ class Shmonad:
                         logger.info(
                             f"[{self.account_index}] | Sleeping for {random_pause} seconds before selling Shmon"
                         )
-                        await asyncio.sleep(random_pause)  # 休眠等待一会儿，再执行下一步操作
+                        await pause(random_pause)  # 休眠等待一会儿，再执行下一步操作
 
                         if not await self.sell_shmon():  # 出售操作
                             logger.error(
@@ -176,7 +180,7 @@ class Shmonad:
                         logger.info(
                             f"[{self.account_index}] | Sleeping for {random_pause} seconds before staking Shmon"
                         )
-                        await asyncio.sleep(random_pause) # 休眠等待一会儿，再执行下一步操作
+                        await pause(random_pause) # 休眠等待一会儿，再执行下一步操作
 
                         if not await self.stake_shmon(): # 质押操作
                             logger.error(
@@ -188,7 +192,7 @@ class Shmonad:
 
             except Exception as e:
                 logger.error(f"[{self.account_index}] | Error swapping Shmonad: {e}")
-                await asyncio.sleep(1)
+                await pause(1)
                 continue
         return False
 
@@ -211,7 +215,7 @@ class Shmonad:
                     f"[{self.account_index}] | Buying Shmon with {amount_to_swap / 10**18:.6f} MON"
                 )
 
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
@@ -239,27 +243,18 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": amount_to_swap,  # 我们发送相同数量的 MON
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
                 # 发送交易
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                # 获得交易tx_hash
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 logger.info(
                     f"[{self.account_index}] | Buying Shmon with {amount_to_swap / 10**18:.6f} MON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
                 # 等待交易收据（交易广播）
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully bought Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -271,7 +266,7 @@ class Shmonad:
 
             except Exception as e:
                 logger.error(f"[{self.account_index}] | Error buying Shmon: {e}")
-                await asyncio.sleep(1)
+                await pause(1)
                 continue
         return False
 
@@ -288,7 +283,7 @@ class Shmonad:
                     f"[{self.account_index}] | Selling {shmon_balance_formatted:.6f} shMON"
                 )
 
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
@@ -319,26 +314,18 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 logger.info(
                     f"[{self.account_index}] | Selling {shmon_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully sold Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -350,7 +337,7 @@ class Shmonad:
 
             except Exception as e:
                 logger.error(f"[{self.account_index}] | Error selling Shmon: {e}")
-                await asyncio.sleep(1)
+                await pause(1)
                 continue
         return False
 
@@ -367,7 +354,7 @@ class Shmonad:
                     f"[{self.account_index}] | Bonding {shmon_balance_formatted:.6f} shMON"
                 )
 
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
@@ -397,26 +384,18 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 logger.info(
                     f"[{self.account_index}] | Bonding {shmon_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully bonded Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -428,7 +407,7 @@ class Shmonad:
 
             except Exception as e:
                 logger.error(f"[{self.account_index}] | Error bonding Shmon: {e}")
-                await asyncio.sleep(1)
+                await pause(1)
                 continue
         return False
 
@@ -437,7 +416,7 @@ class Shmonad:
         """Get bonded (staked) balance of shMON."""
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
@@ -449,7 +428,7 @@ class Shmonad:
                 logger.error(
                     f"[{self.account_index}] | Error getting bonded balance: {e}"
                 )
-                await asyncio.sleep(1)
+                await pause(1)
         return None
 
     # 取消质押股份
@@ -470,7 +449,7 @@ class Shmonad:
                     f"[{self.account_index}] | Unbonding {bonded_balance_formatted:.6f} shMON"
                 )
 
-                contract = self.web3.eth.contract(
+                contract = get_contract(self.web3,
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI  # 质押合约
                 )
 
@@ -500,26 +479,18 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 logger.info(
                     f"[{self.account_index}] | Unbonding {bonded_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] != 1:
                     logger.error(f"[{self.account_index}] | Failed to unbond Shmon")
                     return False
@@ -534,7 +505,7 @@ class Shmonad:
                 logger.info(
                     f"[{self.account_index}] | Sleeping for {random_pause} seconds before claiming Shmon"
                 )
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
 
                 # 第二步交易 - 接触质押之后，进行claim
                 logger.info(
@@ -561,26 +532,18 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
                         "gas": estimated_gas,
                         **gas_params,
                     }
                 )
 
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
+                tx_hash = await sign_and_send(self.web3, transaction, self.private_key)
 
                 logger.info(
                     f"[{self.account_index}] | Claiming {bonded_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully claimed Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -592,23 +555,13 @@ class Shmonad:
 
             except Exception as e:
                 logger.error(f"[{self.account_index}] | Error unstaking Shmon: {e}")
-                await asyncio.sleep(1)
+                await pause(1)
                 continue
         return False
 
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(self.web3).get_gas_params()
 
     # 估算交易所需的 gas 并添加一些缓冲。
     async def estimate_gas(self, transaction: dict) -> int:
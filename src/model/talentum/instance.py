@@ -1,14 +1,15 @@
-import asyncio
 from decimal import Decimal
 import random
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
 from typing import Dict
 
 from src.utils.config import Config
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.web3_pool import get_web3
+from src.utils.scheduler import pause
 
 
 class Talentum:
@@ -18,7 +19,7 @@ class Talentum:
         self.config = config
         self.session = session
 
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3()
         self.account = Account.from_key(private_key)
 
     async def login(self):
@@ -31,7 +32,7 @@ class Talentum:
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
                 )
                 logger.error(f"[{self.account_index}] Error logging in to Talentum: {e}. Sleeping {random_pause} seconds")
-                await asyncio.sleep(random_pause)
+                await pause(random_pause)
         return False
     
 
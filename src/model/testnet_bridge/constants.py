@@ -1,7 +1,8 @@
+from src.utils.constants import CHAIN_RPCS
+
+# Endpoints come from CHAIN_RPCS, only the networks are listed here
 TESTNET_BRIDGE_RPCS = {
-    "Arbitrum": "https://rpc.ankr.com/arbitrum",
-    "Optimism": "https://rpc.ankr.com/optimism",
-    "Sepolia": "https://sepolia.drpc.org",
+    network: CHAIN_RPCS[network] for network in ("Arbitrum", "Optimism", "Sepolia")
 }
 
 TESTNET_BRIDGE_EXPLORERS = {
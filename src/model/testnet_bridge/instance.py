@@ -2,15 +2,21 @@ from web3 import AsyncWeb3, Web3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 import random
-import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.contracts import get_contract
 from src.model.testnet_bridge.constants import (
     TESTNET_BRIDGE_RPCS, 
     TESTNET_BRIDGE_ADDRESS, 
     TESTNET_BRIDGE_ABI,
     TESTNET_BRIDGE_EXPLORERS
 )
+from src.utils.chain_balances import chain_balances
+from src.utils.web3_pool import get_web3
+from src.utils.fee_oracle import get_fee_oracle
+from src.utils.nonce_manager import sign_and_send
+from src.utils.receipt_watcher import wait_for_receipt
+from src.utils.arrival_watcher import wait_for_arrival
 
 
 class TestnetBridge:
@@ -31,14 +37,14 @@ class TestnetBridge:
         
         # Initialize Web3 connections for each network
         self.web3_connections = {}
-        for network, rpc in TESTNET_BRIDGE_RPCS.items():
-            self.web3_connections[network] = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc))
+        for network in TESTNET_BRIDGE_RPCS:
+            self.web3_connections[network] = get_web3(network)
             
         # Initialize contract objects for each network
         self.bridge_contracts = {}
         for network in TESTNET_BRIDGE_ADDRESS:
             if network in self.web3_connections:
-                self.bridge_contracts[network] = self.web3_connections[network].eth.contract(
+                self.bridge_contracts[network] = get_contract(self.web3_connections[network],
                     address=self.web3_connections[network].to_checksum_address(TESTNET_BRIDGE_ADDRESS[network]),
                     abi=TESTNET_BRIDGE_ABI
                 )
@@ -64,36 +70,25 @@ class TestnetBridge:
                 logger.error(f"[{self.account_index}] No web3 connection for {network}")
                 return 0
                 
-            balance_wei = await self.web3_connections[network].eth.get_balance(self.account.address)
-            return float(self.web3_connections[network].from_wei(balance_wei, 'ether'))
+            return float(await chain_balances.get_balance(network, self.account.address))
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return 0
 
-    async def wait_for_balance_increase(self, initial_balance: float) -> bool:
+    async def wait_for_balance_increase(self, initial_balance: int) -> bool:
         """Wait for Sepolia ETH balance to increase after bridge."""
-        # Use the timeout from config
         timeout = self.config.TESTNET_BRIDGE.MAX_WAIT_TIME
-        
+        web3 = self.web3_connections["Sepolia"]
+
         logger.info(f"[{self.account_index}] Waiting for Sepolia balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_sepolia_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Sepolia balance increased from {initial_balance} to {current_balance} ETH"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for Sepolia balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await wait_for_arrival(web3, self.account.address, initial_balance, timeout)
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Sepolia balance increased from {web3.from_wei(initial_balance, 'ether')} "
+                f"to {web3.from_wei(current_balance, 'ether')} ETH"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Sepolia balance didn't increase after {timeout} seconds")
         return False
 
@@ -104,7 +99,14 @@ class TestnetBridge:
         """
         try:
             # First check if current Sepolia balance is already sufficient
-            current_sepolia_balance = await self.get_sepolia_balance()
+            # Sepolia and source network balances are read in one concurrent query
+            networks = [
+                network
+                for network in self.config.TESTNET_BRIDGE.NETWORKS_TO_REFUEL_FROM
+                if network in self.web3_connections
+            ]
+            balances = await chain_balances.get_balances(self.account.address, ["Sepolia", *networks])
+            current_sepolia_balance = float(balances.get("Sepolia", 0))
             logger.info(f"[{self.account_index}] Current Sepolia balance: {current_sepolia_balance}")
             
             if current_sepolia_balance >= self.config.TESTNET_BRIDGE.MINIMUM_BALANCE_TO_REFUEL:
@@ -122,8 +124,8 @@ class TestnetBridge:
             
             logger.info(f"[{self.account_index}] Checking balances for bridging {amount_to_bridge} ETH to Sepolia")
             
-            for network in self.config.TESTNET_BRIDGE.NETWORKS_TO_REFUEL_FROM:
-                balance = await self.get_native_balance(network)
+            for network in networks:
+                balance = float(balances.get(network, 0))
                 logger.info(f"[{self.account_index}] {network} balance: {balance}")
                 
                 # Adjust the check to ensure there's enough for the bridge plus gas
@@ -145,15 +147,7 @@ class TestnetBridge:
 
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        return await get_fee_oracle(web3).get_gas_params()
     
     async def calculate_amount_out_min(self, network: str, amount_in: int) -> int:
         """
@@ -250,8 +244,7 @@ class TestnetBridge:
             # This should ideally come from config but hardcoded for now
             sepolia_chain_id = 161  # LayerZero chain ID for Sepolia
             
-            # Get nonce and gas parameters
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            # Get gas parameters
             gas_params = await self.get_gas_params(web3)
             
             # Build the transaction using the contract function
@@ -272,7 +265,6 @@ class TestnetBridge:
             built_transaction = await transaction.build_transaction({
                 "from": self.account.address,
                 "value": amount_in + bridge_fee,  # The amount plus a fee for bridging
-                "nonce": nonce,
                 "chainId": await web3.eth.chain_id,
                 "type": "0x2",  # EIP-1559 transaction
                 **gas_params
@@ -286,7 +278,6 @@ class TestnetBridge:
                     "to": contract.address,
                     "value": amount_in + bridge_fee,
                     "data": built_transaction["data"],
-                    "nonce": nonce,
                     "maxFeePerGas": gas_params["maxFeePerGas"],
                     "maxPriorityFeePerGas": gas_params["maxPriorityFeePerGas"],
                 })
@@ -319,18 +310,20 @@ class TestnetBridge:
             # Get initial Sepolia balance if we're going to wait for it to increase
             initial_balance = 0
             if self.config.TESTNET_BRIDGE.WAIT_FOR_FUNDS_TO_ARRIVE:
-                initial_balance = await self.get_sepolia_balance()
-                logger.info(f"[{self.account_index}] Initial Sepolia balance: {initial_balance}")
+                web3_destination = self.web3_connections["Sepolia"]
+                initial_balance = await web3_destination.eth.get_balance(self.account.address)
+                logger.info(
+                    f"[{self.account_index}] Initial Sepolia balance: {web3_destination.from_wei(initial_balance, 'ether')}"
+                )
             
             # Build the transaction
             built_transaction = await self.build_bridge_transaction(network, amount)
             
             # Sign and send the transaction
-            signed_tx = web3.eth.account.sign_transaction(built_transaction, self.private_key)
-            tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await sign_and_send(web3, built_transaction, self.private_key)
             
             logger.info(f"[{self.account_index}] Waiting for bridge transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{TESTNET_BRIDGE_EXPLORERS[network]}{tx_hash.hex()}"
             
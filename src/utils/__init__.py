@@ -5,7 +5,6 @@ from .output import show_dev_info, show_logo, show_menu
 from .config import get_config
 from .constants import TOKENS, ERC20_ABI, RPC_URL, EXPLORER_URL
 from .statistics import print_wallets_stats
-from .config_ui import ConfigUI
 
 
 __all__ = [
@@ -20,3 +19,12 @@ __all__ = [
     "show_menu",
     "ConfigUI",
 ]
+
+
+def __getattr__(name):
+    # ConfigUI pulls in customtkinter/Tk, only import it when the menu opens it
+    if name == "ConfigUI":
+        from .config_ui import ConfigUI
+
+        return ConfigUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+import dataclasses
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from src.utils.config import Config
+
+# Accounts shuffled together. Files up to this size are fully shuffled,
+# larger ones are read in windows of this many accounts shuffled each
+SHUFFLE_BUFFER_SIZE = 10_000
+
+# (account index, proxy, private key), the index is the line number of the key
+AccountRecord = Tuple[int, str, str]
+
+
+def iter_txt_file(file_path: str) -> Iterator[str]:
+    """Stripped lines of a file, read lazily, same as read_txt_file without the list."""
+    with open(file_path, "r") as file:
+        for line in file:
+            yield line.strip()
+
+
+def count_lines(file_path: str) -> int:
+    with open(file_path, "r") as file:
+        return sum(1 for _ in file)
+
+
+def _cycle_file(file_path: str) -> Iterator[str]:
+    """Lines of a file over and over, reopening it instead of keeping them in memory."""
+    while True:
+        empty = True
+        for line in iter_txt_file(file_path):
+            empty = False
+            yield line
+        if empty:
+            raise ValueError(f"{file_path} is empty")
+
+
+@dataclass
+class AccountSource:
+    """
+    Accounts to run, read lazily from the key and proxy files.
+
+    Iterating yields (account index, proxy, private key) records without
+    loading either file into memory: keys are streamed, proxies cycled
+    over by reopening their file and the random order comes from a
+    bounded shuffle buffer. The source is a plain picklable description,
+    so every worker process of a sharded run reads its own share.
+    """
+
+    keys_path: str
+    proxies_path: str
+    # 1-based inclusive line range, (0, 0) for every key
+    accounts_range: Tuple[int, int] = (0, 0)
+    exact_accounts: List[int] = dataclasses.field(default_factory=list)
+    shard: int = 0
+    shards: int = 1
+    shuffle_buffer: int = SHUFFLE_BUFFER_SIZE
+
+    @classmethod
+    def from_config(cls, config: Config, keys_path: str, proxies_path: str) -> "AccountSource":
+        """Accounts selected by SETTINGS.ACCOUNTS_RANGE or SETTINGS.EXACT_ACCOUNTS_TO_USE."""
+        return cls(
+            keys_path=keys_path,
+            proxies_path=proxies_path,
+            accounts_range=tuple(config.SETTINGS.ACCOUNTS_RANGE),
+            exact_accounts=list(config.SETTINGS.EXACT_ACCOUNTS_TO_USE or []),
+        )
+
+    def for_shard(self, shard: int, shards: int) -> "AccountSource":
+        """Every shards-th account of this source, starting at shard."""
+        return dataclasses.replace(self, shard=shard, shards=shards)
+
+    def uses_exact_accounts(self) -> bool:
+        return self.accounts_range[0] == 0 and self.accounts_range[1] == 0 and bool(self.exact_accounts)
+
+    def _selected_keys(self) -> Iterator[Tuple[int, str]]:
+        """(account index, private key) of the selected accounts, in selection order."""
+        if self.uses_exact_accounts():
+            # Exact accounts run in the configured order, only those lines are kept
+            wanted = set(self.exact_accounts)
+            keys: Dict[int, str] = {
+                line_number: key
+                for line_number, key in enumerate(iter_txt_file(self.keys_path), start=1)
+                if line_number in wanted
+            }
+            for account_index in self.exact_accounts:
+                yield account_index, keys[account_index]
+            return
+
+        start_index, end_index = self.accounts_range
+        if start_index == 0 and end_index == 0:
+            start_index, end_index = 1, None
+        lines = enumerate(iter_txt_file(self.keys_path), start=1)
+        yield from itertools.islice(lines, start_index - 1, end_index)
+
+    def _records(self) -> Iterator[AccountRecord]:
+        # Proxies are assigned by position among the selected accounts, as before sharding
+        proxies = _cycle_file(self.proxies_path)
+        for position, ((account_index, key), proxy) in enumerate(zip(self._selected_keys(), proxies)):
+            if position % self.shards == self.shard:
+                yield account_index, proxy, key
+
+    def __iter__(self) -> Iterator[AccountRecord]:
+        buffer: List[AccountRecord] = []
+        for record in self._records():
+            buffer.append(record)
+            if len(buffer) >= self.shuffle_buffer:
+                random.shuffle(buffer)
+                yield from buffer
+                buffer = []
+        random.shuffle(buffer)
+        yield from buffer
+
+    def count(self) -> int:
+        """Number of accounts of this source, reads the key file once."""
+        if self.uses_exact_accounts():
+            total = len(self.exact_accounts)
+        else:
+            start_index, end_index = self.accounts_range
+            lines = count_lines(self.keys_path)
+            if start_index == 0 and end_index == 0:
+                total = lines
+            else:
+                total = max(0, min(end_index, lines) - start_index + 1)
+        return len(range(self.shard, total, self.shards))
+
+    def private_keys(self) -> Iterator[str]:
+        """Private keys of the accounts, in file order."""
+        for _, key in self._selected_keys():
+            yield key
@@ -0,0 +1,105 @@
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from eth_utils import keccak, to_checksum_address
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils import calldata
+from src.utils.config import get_config
+from src.utils.state_store import StateStore, state_store
+
+MAX_UINT256 = 2**256 - 1
+# Allowances this large are treated as unlimited: ERC-20 tokens do not
+# decrease them on transferFrom
+UNLIMITED_ALLOWANCE = 2**255
+APPROVAL_TOPIC = keccak(text="Approval(address,address,uint256)")
+
+
+def _topic_address(topic: Any) -> str:
+    return to_checksum_address(bytes(topic)[-20:])
+
+
+class AllowanceCache:
+    """
+    Known ERC-20 allowances per (wallet, token, spender), persisted in the
+    state store.
+
+    An allowance read on-chain, or seen in the Approval event of a receipt,
+    is remembered, so a swap whose amount it covers skips both the
+    allowance() call and the approve transaction. With FLOW.APPROVE_MAX a
+    token is approved once for an unlimited amount and every later swap
+    through the same spender needs no RPC call at all.
+    """
+
+    def __init__(self, store: StateStore = state_store):
+        self.store = store
+
+    async def refresh(self, web3: AsyncWeb3, owner: str, token: str, spender: str) -> int:
+        """Read the allowance on-chain and remember it."""
+        raw = await web3.eth.call(
+            {"to": to_checksum_address(token), "data": calldata.allowance(owner, spender)}
+        )
+        amount = int.from_bytes(raw[:32], "big")
+        self.store.set_allowance(owner, token, spender, amount)
+        return amount
+
+    async def is_sufficient(
+        self, web3: AsyncWeb3, owner: str, token: str, spender: str, amount: int
+    ) -> bool:
+        """
+        True if spender may already spend amount. A remembered allowance
+        that covers amount is trusted, anything else is read on-chain, it
+        may have been approved from somewhere else.
+        """
+        cached = await self.store.get_allowance(owner, token, spender)
+        if cached is not None and cached >= amount:
+            return True
+        return await self.refresh(web3, owner, token, spender) >= amount
+
+    def approval_amount(self, amount: int) -> int:
+        """Amount to approve, unlimited when FLOW.APPROVE_MAX is enabled."""
+        return MAX_UINT256 if get_config().FLOW.APPROVE_MAX else amount
+
+    def record_receipt(self, receipt: Dict) -> None:
+        """Remember the allowances reported by the Approval events of a receipt."""
+        try:
+            for log in receipt.get("logs", []):
+                topics = log.get("topics", [])
+                if len(topics) != 3 or bytes(topics[0]) != APPROVAL_TOPIC:
+                    continue
+                self.store.set_allowance(
+                    _topic_address(topics[1]),
+                    log["address"],
+                    _topic_address(topics[2]),
+                    int.from_bytes(bytes(log["data"])[:32], "big"),
+                )
+        except Exception as e:
+            logger.warning(f"Failed to update allowances from receipt: {e}")
+
+    @asynccontextmanager
+    async def spending(self, owner: str, token: Optional[str], spender: str, amount: int):
+        """
+        Block swapping amount of token through spender. On success the
+        remembered allowance is decreased by amount, unless it is unlimited
+        or an Approval event of the swap already reported the new value. If
+        the block fails, e.g. reverts on a stale value, it is forgotten.
+        token None (native swaps) tracks nothing.
+        """
+        if token is None:
+            yield
+            return
+
+        before = await self.store.get_allowance(owner, token, spender)
+        try:
+            yield
+        except Exception:
+            self.store.delete_allowance(owner, token, spender)
+            raise
+
+        if before is not None and before < UNLIMITED_ALLOWANCE:
+            if await self.store.get_allowance(owner, token, spender) == before:
+                self.store.set_allowance(owner, token, spender, max(before - amount, 0))
+
+
+allowance_cache = AllowanceCache()
@@ -0,0 +1,142 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from eth_utils import to_checksum_address
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.balance_scanner import scan_raw_balances
+from src.utils.scheduler import released
+
+# Seconds between arrival checks. Bridged funds take tens of seconds to
+# arrive, so fast chains are not scanned every block
+ARRIVAL_POLL_INTERVAL = {
+    "Monad": 2,
+    "Sepolia": 12,
+}
+DEFAULT_ARRIVAL_POLL_INTERVAL = 2
+
+# (owner, token), token None for the native balance
+Holding = Tuple[str, Optional[str]]
+
+
+class ArrivalWatcher:
+    """
+    Detects incoming funds for every account waiting on one chain.
+
+    Waiting (address, token) pairs are collected in one place. Whenever the
+    chain has a new block, all of their balances are read with a single
+    Multicall3 eth_call and every waiter whose balance rose above its
+    starting value is woken up, instead of one polling loop per account.
+    """
+
+    def __init__(self, web3: AsyncWeb3, poll_interval: float = DEFAULT_ARRIVAL_POLL_INTERVAL):
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self._waiters: Dict[Holding, List[Tuple[int, asyncio.Future]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._last_block: Optional[int] = None
+
+    def watch(self, address: str, initial_balance: int, token: Optional[str] = None) -> asyncio.Future:
+        """Future resolved with the new balance once it is above initial_balance."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._task.get_loop() is not loop:
+            # Left over from a previous event loop
+            self._waiters.clear()
+            self._task = None
+
+        holding = (to_checksum_address(address), to_checksum_address(token) if token else None)
+        future = loop.create_future()
+        self._waiters.setdefault(holding, []).append((initial_balance, future))
+        if self._task is None or self._task.done():
+            self._last_block = None
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    def forget(self, future: asyncio.Future) -> None:
+        for holding, waiters in list(self._waiters.items()):
+            waiters[:] = [waiter for waiter in waiters if waiter[1] is not future]
+            if not waiters:
+                del self._waiters[holding]
+
+    async def _run(self) -> None:
+        while self._waiters:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning(f"Arrival check failed, retrying: {e}")
+
+    async def _poll(self) -> None:
+        block = await self.web3.eth.block_number
+        if block == self._last_block:
+            return
+        self._last_block = block
+
+        holdings = list(self._waiters)
+        balances = await scan_raw_balances(self.web3, holdings, block)
+        for holding, balance in zip(holdings, balances):
+            if balance is None:
+                continue
+            waiting = []
+            for initial_balance, future in self._waiters.get(holding, []):
+                if future.done():
+                    continue
+                if balance > initial_balance:
+                    future.set_result(balance)
+                else:
+                    waiting.append((initial_balance, future))
+            if waiting:
+                self._waiters[holding] = waiting
+            else:
+                self._waiters.pop(holding, None)
+
+
+_watchers: Dict[str, ArrivalWatcher] = {}
+
+
+def get_arrival_watcher(web3: AsyncWeb3) -> ArrivalWatcher:
+    """Get the process-wide arrival watcher of the chain behind a pooled AsyncWeb3."""
+    chain = getattr(web3.provider, "chain", None) or web3.provider.endpoint_uri
+    watcher = _watchers.get(chain)
+    if watcher is None:
+        watcher = ArrivalWatcher(
+            web3, ARRIVAL_POLL_INTERVAL.get(chain, DEFAULT_ARRIVAL_POLL_INTERVAL)
+        )
+        _watchers[chain] = watcher
+    return watcher
+
+
+async def wait_for_arrival(
+    web3: AsyncWeb3,
+    address: str,
+    initial_balance: int,
+    timeout: float,
+    token: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Wait until the balance of address rises above initial_balance.
+
+    The account's scheduler slot is released while waiting, so other
+    accounts can work until the funds arrive.
+
+    Args:
+        web3: AsyncWeb3 instance of the chain the funds arrive on
+        address: Receiving wallet
+        initial_balance: Balance before the transfer, in wei / token base units
+        timeout: Seconds to wait
+        token: ERC-20 address, None for the native balance
+
+    Returns:
+        New balance, or None if it did not increase within timeout
+    """
+    watcher = get_arrival_watcher(web3)
+    future = watcher.watch(address, initial_balance, token)
+    try:
+        return await released(asyncio.wait_for(asyncio.shield(future), timeout))
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        # Timed out or cancelled
+        if not future.done():
+            watcher.forget(future)
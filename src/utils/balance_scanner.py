@@ -0,0 +1,145 @@
+import asyncio
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.types import BlockIdentifier
+
+from src.utils.constants import MULTICALL3_ADDRESS
+
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector(
+    "aggregate3((address,bool,bytes)[])"
+)
+GET_ETH_BALANCE_SELECTOR = function_signature_to_4byte_selector("getEthBalance(address)")
+BALANCE_OF_SELECTOR = function_signature_to_4byte_selector("balanceOf(address)")
+
+# Calls per aggregate3 eth_call, keeps requests under RPC gas and size limits
+MAX_CALLS_PER_MULTICALL = 500
+
+NATIVE = "native"
+NATIVE_DECIMALS = 18
+
+
+def _balance_call(selector: bytes, target: str, owner: str) -> Tuple[str, bool, bytes]:
+    return (target, True, selector + encode(["address"], [owner]))
+
+
+async def _aggregate3(
+    web3: AsyncWeb3, calls: List[Tuple[str, bool, bytes]], block_identifier: BlockIdentifier
+) -> List[Optional[int]]:
+    """Run balance calls through Multicall3, None for calls that reverted."""
+    results: List[Optional[int]] = []
+    for i in range(0, len(calls), MAX_CALLS_PER_MULTICALL):
+        chunk = calls[i : i + MAX_CALLS_PER_MULTICALL]
+        data = AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [chunk])
+        raw = await web3.eth.call({"to": MULTICALL3_ADDRESS, "data": data}, block_identifier)
+        (returned,) = decode(["(bool,bytes)[]"], raw)
+        for success, return_data in returned:
+            if success and len(return_data) >= 32:
+                results.append(int.from_bytes(return_data[:32], "big"))
+            else:
+                results.append(None)
+    return results
+
+
+async def _single_calls(
+    web3: AsyncWeb3, calls: List[Tuple[str, bool, bytes]], block_identifier: BlockIdentifier
+) -> List[Optional[int]]:
+    """Fallback for chains without Multicall3: one eth_call per balance."""
+
+    async def call(target: str, data: bytes) -> Optional[int]:
+        try:
+            if data[:4] == GET_ETH_BALANCE_SELECTOR:
+                (owner,) = decode(["address"], data[4:])
+                return await web3.eth.get_balance(to_checksum_address(owner), block_identifier)
+            raw = await web3.eth.call({"to": target, "data": data}, block_identifier)
+            return int.from_bytes(raw[:32], "big") if len(raw) >= 32 else None
+        except Exception as e:
+            logger.error(f"Failed to get balance from {target}: {e}")
+            return None
+
+    return await asyncio.gather(*[call(target, data) for target, _, data in calls])
+
+
+async def scan_balances(
+    web3: AsyncWeb3,
+    owners: List[str],
+    tokens: Dict[str, Dict],
+    block_identifier: BlockIdentifier = "latest",
+) -> Dict[str, Dict[str, Decimal]]:
+    """
+    Get native and ERC-20 balances of many wallets in one Multicall3 eth_call.
+
+    Args:
+        web3: AsyncWeb3 instance of the chain to scan
+        owners: Wallet addresses
+        tokens: Token name -> {"address": ..., "decimals": ...}, the native
+            token is always included under "native"
+        block_identifier: Block to read the balances at
+
+    Returns:
+        Owner address -> token name -> balance in token units. Tokens whose
+        balanceOf reverted are left out.
+    """
+    token_list = [(name, info) for name, info in tokens.items() if name != NATIVE]
+
+    calls = []
+    for owner in owners:
+        calls.append(_balance_call(GET_ETH_BALANCE_SELECTOR, MULTICALL3_ADDRESS, owner))
+        for _, info in token_list:
+            calls.append(
+                _balance_call(BALANCE_OF_SELECTOR, to_checksum_address(info["address"]), owner)
+            )
+
+    try:
+        results = await _aggregate3(web3, calls, block_identifier)
+    except Exception as e:
+        logger.warning(f"Multicall balance scan failed, falling back to single calls: {e}")
+        results = await _single_calls(web3, calls, block_identifier)
+
+    decimals = [NATIVE_DECIMALS] + [info["decimals"] for _, info in token_list]
+    names = [NATIVE] + [name for name, _ in token_list]
+    per_owner = len(names)
+
+    balances = {}
+    for i, owner in enumerate(owners):
+        owner_results = results[i * per_owner : (i + 1) * per_owner]
+        balances[owner] = {
+            name: Decimal(raw) / Decimal(10**token_decimals)
+            for name, token_decimals, raw in zip(names, decimals, owner_results)
+            if raw is not None
+        }
+    return balances
+
+
+async def get_token_balances(
+    web3: AsyncWeb3, owner: str, tokens: Dict[str, Dict]
+) -> Dict[str, Decimal]:
+    """Native and ERC-20 balances of one wallet, see scan_balances."""
+    return (await scan_balances(web3, [owner], tokens))[owner]
+
+
+async def scan_raw_balances(
+    web3: AsyncWeb3,
+    holdings: List[Tuple[str, Optional[str]]],
+    block_identifier: BlockIdentifier = "latest",
+) -> List[Optional[int]]:
+    """
+    Balances in wei / token base units of (owner, token) pairs in one
+    Multicall3 eth_call, token None for the native balance. None for
+    balances that could not be read.
+    """
+    calls = [
+        _balance_call(GET_ETH_BALANCE_SELECTOR, MULTICALL3_ADDRESS, owner)
+        if token is None
+        else _balance_call(BALANCE_OF_SELECTOR, to_checksum_address(token), owner)
+        for owner, token in holdings
+    ]
+    try:
+        return await _aggregate3(web3, calls, block_identifier)
+    except Exception as e:
+        logger.warning(f"Multicall balance scan failed, falling back to single calls: {e}")
+        return await _single_calls(web3, calls, block_identifier)
@@ -0,0 +1,125 @@
+"""
+Calldata of the calls on the hot swap paths.
+
+Selectors are computed and eth_abi encoders built once at import time, so
+encoding a call is a single encoder pass with no keccak, ABI lookup or
+contract object involved. Every function returns the raw calldata bytes,
+use to_hex() where a 0x string is needed.
+"""
+
+from typing import Callable, List, Sequence, Tuple
+
+from eth_abi.encoding import TupleEncoder
+from eth_abi.registry import registry
+from eth_utils import function_signature_to_4byte_selector
+
+
+def _encoder(*types: str) -> Callable[[Sequence], bytes]:
+    return TupleEncoder(encoders=[registry.get_encoder(type_str) for type_str in types])
+
+
+# ERC-20
+APPROVE_SELECTOR = function_signature_to_4byte_selector("approve(address,uint256)")
+TRANSFER_SELECTOR = function_signature_to_4byte_selector("transfer(address,uint256)")
+BALANCE_OF_SELECTOR = function_signature_to_4byte_selector("balanceOf(address)")
+ALLOWANCE_SELECTOR = function_signature_to_4byte_selector("allowance(address,address)")
+
+# Multicall3
+AGGREGATE3_VALUE_SELECTOR = function_signature_to_4byte_selector(
+    "aggregate3Value((address,bool,uint256,bytes)[])"
+)
+
+# Ambient (CrocSwapDex)
+USER_CMD_SELECTOR = function_signature_to_4byte_selector("userCmd(uint16,bytes)")
+
+# Izumi router
+SWAP_AMOUNT_SELECTOR = function_signature_to_4byte_selector(
+    "swapAmount((bytes,address,uint128,uint256,uint256))"
+)
+UNWRAP_WETH9_SELECTOR = function_signature_to_4byte_selector("unwrapWETH9(uint256,address)")
+REFUND_ETH_SELECTOR = function_signature_to_4byte_selector("refundETH()")
+MULTICALL_SELECTOR = function_signature_to_4byte_selector("multicall(bytes[])")
+
+_address_uint256 = _encoder("address", "uint256")
+_address = _encoder("address")
+_address_address = _encoder("address", "address")
+_user_cmd = _encoder("uint16", "bytes")
+# Ambient swap command: base, quote, poolIdx, isBuy, inBaseQty, qty, tip,
+# limitPrice, minOut, reserveFlags, as packed by the Ambient web app
+_ambient_swap = _encoder(
+    "address", "address", "uint16", "bool", "bool", "uint256", "uint8", "uint256", "uint256", "uint8"
+)
+_swap_amount = _encoder("(bytes,address,uint128,uint256,uint256)")
+_uint256_address = _encoder("uint256", "address")
+_bytes_array = _encoder("bytes[]")
+_call3_values = _encoder("(address,bool,uint256,bytes)[]")
+
+
+def to_hex(data: bytes) -> str:
+    return "0x" + data.hex()
+
+
+def approve(spender: str, amount: int) -> bytes:
+    return APPROVE_SELECTOR + _address_uint256((spender, amount))
+
+
+def transfer(to: str, amount: int) -> bytes:
+    return TRANSFER_SELECTOR + _address_uint256((to, amount))
+
+
+def balance_of(owner: str) -> bytes:
+    return BALANCE_OF_SELECTOR + _address((owner,))
+
+
+def allowance(owner: str, spender: str) -> bytes:
+    return ALLOWANCE_SELECTOR + _address_address((owner, spender))
+
+
+def ambient_swap_cmd(
+    base: str,
+    quote: str,
+    pool_idx: int,
+    is_buy: bool,
+    in_base_qty: bool,
+    qty: int,
+    tip: int,
+    limit_price: int,
+    min_out: int,
+    reserve_flags: int,
+) -> bytes:
+    """Inner swap command of an Ambient userCmd, without selector."""
+    return _ambient_swap(
+        (base, quote, pool_idx, is_buy, in_base_qty, qty, tip, limit_price, min_out, reserve_flags)
+    )
+
+
+def ambient_user_cmd(callpath: int, cmd: bytes) -> bytes:
+    return USER_CMD_SELECTOR + _user_cmd((callpath, cmd))
+
+
+def izumi_path(token_in: str, fee: int, token_out: str) -> bytes:
+    """Packed swap path: tokenIn (20 bytes), fee (3 bytes), tokenOut (20 bytes)."""
+    return bytes.fromhex(token_in[2:]) + fee.to_bytes(3, "big") + bytes.fromhex(token_out[2:])
+
+
+def izumi_swap_amount(
+    path: bytes, recipient: str, amount: int, min_acquired: int, deadline: int
+) -> bytes:
+    return SWAP_AMOUNT_SELECTOR + _swap_amount(((path, recipient, amount, min_acquired, deadline),))
+
+
+def izumi_unwrap_weth9(min_amount: int, recipient: str) -> bytes:
+    return UNWRAP_WETH9_SELECTOR + _uint256_address((min_amount, recipient))
+
+
+def izumi_refund_eth() -> bytes:
+    return REFUND_ETH_SELECTOR
+
+
+def izumi_multicall(calls: List[bytes]) -> bytes:
+    return MULTICALL_SELECTOR + _bytes_array((calls,))
+
+
+def multicall3_aggregate3_value(calls: List[Tuple[str, bool, int, bytes]]) -> bytes:
+    """aggregate3Value of (target, allowFailure, value, callData) calls, msg.value must be the sum of the values."""
+    return AGGREGATE3_VALUE_SELECTOR + _call3_values((calls,))
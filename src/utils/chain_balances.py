@@ -0,0 +1,143 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from eth_utils import to_checksum_address
+from loguru import logger
+
+from src.utils.balance_scanner import NATIVE, scan_balances
+from src.utils.receipt_watcher import DEFAULT_RECEIPT_POLL_INTERVAL, RECEIPT_POLL_INTERVAL
+from src.utils.web3_pool import get_web3
+
+WEI_PER_ETHER = Decimal(10**18)
+
+
+class ChainBalances:
+    """
+    Native balances of wallets on several chains, read concurrently through
+    the pooled providers and cached per block.
+
+    The head of a chain is asked at most once per block time, however many
+    accounts look it up, and balances are read at that block. A balance is
+    served from the cache until the chain moves to a new block, so the
+    network discovery of a bridge task costs one round trip for all its
+    source chains and nothing when repeated within the same block.
+    """
+
+    def __init__(self):
+        # chain -> (block number, monotonic time it was read)
+        self._heads: Dict[str, Tuple[int, float]] = {}
+        self._head_requests: Dict[str, asyncio.Future] = {}
+        # (chain, lowercase address) -> (block number, balance in ether)
+        self._balances: Dict[Tuple[str, str], Tuple[int, Decimal]] = {}
+
+    async def _fetch_head(self, chain: str) -> int:
+        try:
+            number = await get_web3(chain).eth.block_number
+        finally:
+            self._head_requests.pop(chain, None)
+        self._heads[chain] = (number, time.monotonic())
+        return number
+
+    async def head(self, chain: str) -> int:
+        """Latest block number of chain, re-read at most once per block time."""
+        cached = self._heads.get(chain)
+        block_time = RECEIPT_POLL_INTERVAL.get(chain, DEFAULT_RECEIPT_POLL_INTERVAL)
+        if cached is not None and time.monotonic() - cached[1] < block_time:
+            return cached[0]
+
+        # Concurrent callers share one eth_blockNumber
+        request = self._head_requests.get(chain)
+        if request is None or request.get_loop() is not asyncio.get_running_loop():
+            request = self._head_requests[chain] = asyncio.ensure_future(self._fetch_head(chain))
+        return await asyncio.shield(request)
+
+    async def get_balance(self, chain: str, address: str) -> Decimal:
+        """Native balance of address on chain in ether, cached for the current block."""
+        block = await self.head(chain)
+        key = (chain, address.lower())
+        cached = self._balances.get(key)
+        if cached is not None and cached[0] >= block:
+            return cached[1]
+
+        wei = await get_web3(chain).eth.get_balance(
+            to_checksum_address(address), block_identifier=block
+        )
+        balance = Decimal(wei) / WEI_PER_ETHER
+        self._balances[key] = (block, balance)
+        return balance
+
+    async def get_balances(self, address: str, chains: Iterable[str]) -> Dict[str, Decimal]:
+        """
+        Native balance of address on every chain, queried concurrently.
+        Chains whose RPC failed are logged and left out.
+        """
+        chains = list(chains)
+        results = await asyncio.gather(
+            *[self.get_balance(chain, address) for chain in chains], return_exceptions=True
+        )
+        balances = {}
+        for chain, result in zip(chains, results):
+            if isinstance(result, BaseException):
+                logger.error(f"{address} | Failed to get balance on {chain}: {result}")
+            else:
+                balances[chain] = result
+        return balances
+
+    async def _scan_chain(self, chain: str, addresses: List[str]) -> Dict[str, Decimal]:
+        block = await self.head(chain)
+        scanned = await scan_balances(get_web3(chain), addresses, {}, block_identifier=block)
+        balances = {}
+        for address, tokens in scanned.items():
+            if NATIVE in tokens:
+                balances[address] = tokens[NATIVE]
+                self._balances[(chain, address.lower())] = (block, tokens[NATIVE])
+        return balances
+
+    async def scan(
+        self, addresses: List[str], chains: Iterable[str]
+    ) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Native balances of a whole fleet on every chain: one Multicall3 scan
+        per chain, all chains at once. The results also fill the cache.
+
+        Returns:
+            Chain -> address -> balance in ether, failed chains are left out
+        """
+        chains = list(chains)
+        results = await asyncio.gather(
+            *[self._scan_chain(chain, addresses) for chain in chains], return_exceptions=True
+        )
+        balances = {}
+        for chain, result in zip(chains, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to scan balances on {chain}: {result}")
+            else:
+                balances[chain] = result
+        return balances
+
+    async def funding_networks(
+        self, addresses: List[str], networks: Iterable[str], amount: float
+    ) -> Dict[str, List[str]]:
+        """
+        Networks holding more than amount, for every address, in one pass
+        over the fleet.
+
+        Returns:
+            Address -> networks that can fund amount, in the order given
+        """
+        networks = list(networks)
+        balances = await self.scan(addresses, networks)
+        threshold = Decimal(str(amount))
+        return {
+            address: [
+                network
+                for network in networks
+                if balances.get(network, {}).get(address, Decimal(0)) > threshold
+            ]
+            for address in addresses
+        }
+
+
+chain_balances = ChainBalances()
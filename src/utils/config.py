@@ -1,9 +1,12 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import yaml
+from loguru import logger
 from pathlib import Path
 import asyncio
 
+from src.utils.constants import GAS_MULTIPLIERS, RPC_URL
+
 
 @dataclass
 class SettingsConfig:
@@ -19,6 +22,7 @@ class SettingsConfig:
     RANDOM_INITIALIZATION_PAUSE: Tuple[int, int]
     TELEGRAM_USERS_IDS: List[int]
     TELEGRAM_BOT_TOKEN: str
+    PROCESSES: int = 1
 
 @dataclass
 class FaucetConfig:
@@ -30,6 +34,8 @@ class FlowConfig:
     TASKS: List
     NUMBER_OF_SWAPS: Tuple[int, int]
     PERCENT_OF_BALANCE_TO_SWAP: Tuple[int, int]
+    APPROVE_MAX: bool = False
+    PIPELINED_COLLECT: bool = False
 
 
 @dataclass
@@ -53,6 +59,22 @@ class BimaConfig:
     PERCENT_OF_BALANCE_TO_LEND: Tuple[int, int]
 
 
+@dataclass
+class RpcConfig:
+    MONAD_RPC_URLS: List[str]
+    BATCH_WINDOW_MS: float
+
+
+@dataclass
+class GasConfig:
+    MULTIPLIERS: Dict[str, Tuple[float, float]]
+
+
+@dataclass
+class StateConfig:
+    SKIP_COMPLETED_WITHIN_HOURS: float
+
+
 @dataclass
 class WalletInfo:
     account_index: int
@@ -117,6 +139,8 @@ class OrbiterConfig:
 @dataclass
 class DisperseConfig:
     MIN_BALANCE_FOR_DISPERSE: Tuple[float, float]
+    MULTI_SEND: bool = False
+    MULTI_SEND_CHUNK_SIZE: int = 100
 
 
 @dataclass
@@ -159,12 +183,17 @@ class Config:
     MAGICEDEN: MagicEdenConfig
     MEMEBRIDGE: MemebridgeConfig
     TESTNET_BRIDGE: TestnetBridgeConfig
+    RPC: RpcConfig
+    GAS: GasConfig
+    STATE: StateConfig
     WALLETS: WalletsConfig = field(default_factory=WalletsConfig)
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
     @classmethod
-    def load(cls, path: str = "config.yaml") -> "Config":
-        """Load configuration from yaml file"""
+    def load(
+        cls, path: str = "config.yaml", presets: Optional[List[str]] = None
+    ) -> "Config":
+        """Load configuration from yaml file, presets override TASKS of tasks.py"""
         with open(path, "r", encoding="utf-8") as file:
             data = yaml.safe_load(file)
 
@@ -173,9 +202,11 @@ class Config:
             # 尝试使用常规导入从tasks.py导入任务
             import tasks
 
-            if hasattr(tasks, "TASKS"):
+            if presets or hasattr(tasks, "TASKS"):
                 # TASKS 现在包含预设名称
-                preset_names = [preset_name.upper() for preset_name in tasks.TASKS]
+                preset_names = [
+                    preset_name.upper() for preset_name in (presets or tasks.TASKS)
+                ]
 
                 # 合并所有指定预设中的任务
                 combined_tasks = []
@@ -184,21 +215,21 @@ class Config:
                         preset_tasks = getattr(tasks, preset_name)
                         combined_tasks.extend(preset_tasks)
                     else:
-                        print(f"Warning: Preset {preset_name} not found in tasks.py")
+                        logger.warning(f"Preset {preset_name} not found in tasks.py")
 
                 if combined_tasks:
                     tasks_list = combined_tasks
                 else:
                     error_msg = "No valid presets found in tasks.py"
-                    print(f"Error: {error_msg}")
+                    logger.error(error_msg)
                     raise ValueError(error_msg)
             else:
                 error_msg = "No TASKS list found in tasks.py"
-                print(f"Error: {error_msg}")
+                logger.error(error_msg)
                 raise ValueError(error_msg)
         except ImportError as e:
             error_msg = f"Could not import tasks.py: {e}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             raise ImportError(error_msg) from e
 
         return cls(
@@ -223,6 +254,7 @@ class Config:
                 BROWSER_PAUSE_MULTIPLIER=data["SETTINGS"]["BROWSER_PAUSE_MULTIPLIER"],
                 TELEGRAM_USERS_IDS=data["SETTINGS"]["TELEGRAM_USERS_IDS"],
                 TELEGRAM_BOT_TOKEN=data["SETTINGS"]["TELEGRAM_BOT_TOKEN"],
+                PROCESSES=data["SETTINGS"].get("PROCESSES", 1),
             ),
             FAUCET=FaucetConfig(
                 CAPSOLVER_API_KEY=data["FAUCET"]["CAPSOLVER_API_KEY"],
@@ -233,6 +265,8 @@ class Config:
                 PERCENT_OF_BALANCE_TO_SWAP=tuple(
                     data["FLOW"]["PERCENT_OF_BALANCE_TO_SWAP"]
                 ),
+                APPROVE_MAX=data["FLOW"].get("APPROVE_MAX", False),
+                PIPELINED_COLLECT=data["FLOW"].get("PIPELINED_COLLECT", False),
             ),
             APRIORI=AprioriConfig(
                 AMOUNT_TO_STAKE=tuple(data["APRIORI"]["AMOUNT_TO_STAKE"]),
@@ -298,6 +332,8 @@ class Config:
                 MIN_BALANCE_FOR_DISPERSE=tuple(
                     data["DISPERSE"]["MIN_BALANCE_FOR_DISPERSE"]
                 ),
+                MULTI_SEND=data["DISPERSE"].get("MULTI_SEND", False),
+                MULTI_SEND_CHUNK_SIZE=data["DISPERSE"].get("MULTI_SEND_CHUNK_SIZE", 100),
             ),
             LILCHOGSTARS=LilchogstarsConfig(
                 MAX_AMOUNT_FOR_EACH_ACCOUNT=tuple(
@@ -317,6 +353,24 @@ class Config:
             MAGICEDEN=MagicEdenConfig(
                 NFT_CONTRACTS=data["MAGICEDEN"]["NFT_CONTRACTS"],
             ),
+            RPC=RpcConfig(
+                MONAD_RPC_URLS=data.get("RPC", {}).get("MONAD_RPC_URLS") or [RPC_URL],
+                BATCH_WINDOW_MS=data.get("RPC", {}).get("BATCH_WINDOW_MS", 5),
+            ),
+            GAS=GasConfig(
+                MULTIPLIERS={
+                    chain: tuple(multipliers)
+                    for chain, multipliers in {
+                        **GAS_MULTIPLIERS,
+                        **data.get("GAS", {}).get("MULTIPLIERS", {}),
+                    }.items()
+                },
+            ),
+            STATE=StateConfig(
+                SKIP_COMPLETED_WITHIN_HOURS=data.get("STATE", {}).get(
+                    "SKIP_COMPLETED_WITHIN_HOURS", 0
+                ),
+            ),
         )
 
 
@@ -2,6 +2,27 @@ EXPLORER_URL = "https://testnet.monadexplorer.com/tx/0x"
 RPC_URL = "https://testnet-rpc.monad.xyz/"
 # RPC_URL = "https://monad-testnet.drpc.org/" 
 
+# RPC endpoints for every chain the farm talks to
+CHAIN_RPCS = {
+    "Monad": RPC_URL,
+    "Sepolia": "https://sepolia.drpc.org/",
+    "Arbitrum": "https://rpc.ankr.com/arbitrum",
+    "Optimism": "https://rpc.ankr.com/optimism",
+    "Base": "https://rpc.ankr.com/base",
+}
+
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# EIP-1559 fee multipliers per chain: [priority fee, max fee]
+GAS_MULTIPLIERS = {
+    "Monad": [1, 1],
+    "Sepolia": [1.5, 1.5],
+    "Arbitrum": [1, 1.5],
+    "Optimism": [1, 1.5],
+    "Base": [1, 1.5],
+}
+
 TOKENS = {
     "native": "native",  # MON
     "DAK": "0x0F0BDEbF0F83cD1EE3974779Bcb7315f9808c714",
@@ -0,0 +1,79 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from web3 import AsyncWeb3, Web3
+from web3.contract import AsyncContract, Contract
+
+# Encoding-only contracts (build_transaction is never awaited on them) share
+# one offline Web3 instead of creating a new Web3() per call
+OFFLINE_WEB3 = Web3()
+
+Abi = Union[str, List[Dict[str, Any]]]
+
+
+class ParsedAbi:
+    """ABI parsed once, with the 4-byte selector of every function."""
+
+    __slots__ = ("source", "abi", "selectors")
+
+    def __init__(self, source: Abi):
+        # Keeps list ABIs alive so the id() cache key is never reused
+        self.source = source
+        self.abi: List[Dict[str, Any]] = (
+            json.loads(source) if isinstance(source, str) else source
+        )
+        self.selectors: Dict[str, bytes] = {}
+        for entry in self.abi:
+            # Overloaded functions keep the selector of their first definition
+            if entry.get("type") == "function" and entry["name"] not in self.selectors:
+                self.selectors[entry["name"]] = function_abi_to_4byte_selector(entry)
+
+
+_parsed_abis: Dict[Any, ParsedAbi] = {}
+_contracts: Dict[Tuple[Any, str, int], Union[AsyncContract, Contract]] = {}
+
+
+def _abi_key(abi: Abi) -> Any:
+    # JSON strings are hashed by value, lists are module constants shared by identity
+    return abi if isinstance(abi, str) else id(abi)
+
+
+def parse_abi(abi: Abi) -> ParsedAbi:
+    """Parsed form of abi, computed on first use and cached for the process."""
+    key = _abi_key(abi)
+    parsed = _parsed_abis.get(key)
+    if parsed is None:
+        parsed = _parsed_abis[key] = ParsedAbi(abi)
+    return parsed
+
+
+def selector(abi: Abi, function_name: str) -> bytes:
+    """4-byte selector of function_name in abi."""
+    return parse_abi(abi).selectors[function_name]
+
+
+def _web3_key(web3: Union[AsyncWeb3, Web3]) -> Any:
+    # Pooled providers are per chain singletons, see get_web3
+    return getattr(web3.provider, "chain", None) or id(web3)
+
+
+def get_contract(
+    web3: Optional[Union[AsyncWeb3, Web3]], address: str, abi: Abi
+) -> Union[AsyncContract, Contract]:
+    """
+    Contract object for (chain, address, abi), built once and shared by all
+    accounts.
+
+    Contract objects hold no account state, so one instance per chain serves
+    every wallet. Pass web3=None for contracts only used to encode calldata.
+    """
+    web3 = web3 or OFFLINE_WEB3
+    parsed = parse_abi(abi)
+    address = to_checksum_address(address)
+    key = (_web3_key(web3), address, id(parsed))
+
+    contract = _contracts.get(key)
+    if contract is None:
+        contract = _contracts[key] = web3.eth.contract(address=address, abi=parsed.abi)
+    return contract
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from web3 import AsyncWeb3
+
+from src.utils.constants import GAS_MULTIPLIERS
+
+# Seconds a fee snapshot is reused, roughly one block of the chain
+FEE_CACHE_TTL = {
+    "Monad": 1,
+    "Sepolia": 12,
+    "Arbitrum": 1,
+    "Optimism": 2,
+    "Base": 2,
+}
+DEFAULT_FEE_CACHE_TTL = 1
+
+
+class FeeOracle:
+    """
+    Serves EIP-1559 fee parameters of one chain to every account.
+
+    The latest base fee and priority fee are fetched at most once per
+    block; concurrent callers wait for the same fetch instead of sending
+    their own.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        priority_multiplier: float = 1,
+        max_fee_multiplier: float = 1,
+        ttl: float = DEFAULT_FEE_CACHE_TTL,
+    ):
+        self.web3 = web3
+        self.priority_multiplier = priority_multiplier
+        self.max_fee_multiplier = max_fee_multiplier
+        self.ttl = ttl
+        self._fees: Optional[Tuple[int, int]] = None
+        self._fees_at = 0.0
+        self._gas_price: Optional[int] = None
+        self._gas_price_at = 0.0
+        self._fees_lock = asyncio.Lock()
+        self._gas_price_lock = asyncio.Lock()
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at < self.ttl
+
+    async def get_base_and_priority_fee(self) -> Tuple[int, int]:
+        if self._fees is not None and self._fresh(self._fees_at):
+            return self._fees
+        async with self._fees_lock:
+            if self._fees is None or not self._fresh(self._fees_at):
+                latest_block, max_priority_fee = await asyncio.gather(
+                    self.web3.eth.get_block("latest"),
+                    self.web3.eth.max_priority_fee,
+                )
+                self._fees = (latest_block["baseFeePerGas"], max_priority_fee)
+                self._fees_at = time.monotonic()
+        return self._fees
+
+    async def get_gas_params(self) -> Dict[str, int]:
+        """Cached maxFeePerGas and maxPriorityFeePerGas with the chain multipliers applied."""
+        base_fee, max_priority_fee = await self.get_base_and_priority_fee()
+        max_priority_fee = int(max_priority_fee * self.priority_multiplier)
+        max_fee = int((base_fee + max_priority_fee) * self.max_fee_multiplier)
+
+        return {
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": max_priority_fee,
+        }
+
+    async def get_gas_price(self) -> int:
+        if self._gas_price is not None and self._fresh(self._gas_price_at):
+            return self._gas_price
+        async with self._gas_price_lock:
+            if self._gas_price is None or not self._fresh(self._gas_price_at):
+                self._gas_price = await self.web3.eth.gas_price
+                self._gas_price_at = time.monotonic()
+        return self._gas_price
+
+
+_oracles: Dict[str, FeeOracle] = {}
+
+
+def _chain_multipliers(chain: str) -> Tuple[float, float]:
+    """Fee multipliers for a chain: GAS.MULTIPLIERS from config.yaml, GAS_MULTIPLIERS otherwise."""
+    from src.utils.config import get_config
+
+    try:
+        multipliers = get_config().GAS.MULTIPLIERS
+    except FileNotFoundError:
+        multipliers = GAS_MULTIPLIERS
+    return tuple(multipliers.get(chain, (1, 1)))
+
+
+def get_fee_oracle(web3: AsyncWeb3) -> FeeOracle:
+    """Get the process-wide fee oracle of the chain behind a pooled AsyncWeb3."""
+    chain = getattr(web3.provider, "chain", None) or web3.provider.endpoint_uri
+    oracle = _oracles.get(chain)
+    if oracle is None:
+        priority_multiplier, max_fee_multiplier = _chain_multipliers(chain)
+        oracle = FeeOracle(
+            web3,
+            priority_multiplier,
+            max_fee_multiplier,
+            FEE_CACHE_TTL.get(chain, DEFAULT_FEE_CACHE_TTL),
+        )
+        _oracles[chain] = oracle
+    return oracle
+
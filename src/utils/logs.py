@@ -1,7 +1,56 @@
 import os
+import sys
+from dataclasses import dataclass
 from typing import Dict, Any
 from asyncio import Lock
 
+from loguru import logger
+
+LOG_FILE = "logs/app.log"
+log_format = (
+    "<light-blue>[</light-blue><yellow>{time:HH:mm:ss}</yellow><light-blue>]</light-blue> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{file}:{line}</cyan> | "
+    "<level>{message}</level>"
+)
+file_log_format = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{line} - {message}"
+
+
+@dataclass
+class LogSettings:
+    """Console handler of the run, picklable so worker processes can install the same one."""
+
+    # "stdout" or "stderr"
+    console: str = "stdout"
+    level: str = "DEBUG"
+
+
+# Settings of the last configure_logging() call
+log_settings = LogSettings()
+
+
+def configure_logging(settings: LogSettings, prefix: str = "", rotate: bool = True) -> None:
+    """
+    Replace the loguru handlers with a colored console handler and the
+    logs/app.log file handler.
+
+    Args:
+        settings: Console stream and level
+        prefix: Prepended to every console line, e.g. the shard of a worker process
+        rotate: Rotate and clean up the log file, only one process appending to it may
+    """
+    global log_settings
+    log_settings = settings
+    logger.remove()
+    logger.add(
+        getattr(sys, settings.console),
+        colorize=True,
+        format=prefix + log_format,
+        level=settings.level,
+    )
+    file_options = {"rotation": "10 MB", "retention": "1 month"} if rotate else {}
+    logger.add(LOG_FILE, format=file_log_format, level="INFO", **file_options)
+
 
 async def report_success(
     lock: Lock, private_key: str, proxy: str, discord_token: str
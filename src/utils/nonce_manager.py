@@ -0,0 +1,108 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from eth_account import Account
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.state_store import state_store
+
+# Substrings of node errors meaning our local nonce is out of sync with the chain
+NONCE_ERRORS = (
+    "nonce too low",
+    "already known",
+    "invalid nonce",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(substring in message for substring in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Hands out nonces per (chain, address) from a local counter.
+
+    The pending nonce is fetched from the node once; after that every
+    successful broadcast bumps the counter locally. A nonce is only
+    consumed when the node accepted the transaction, so failed sends never
+    leave gaps.
+    """
+
+    def __init__(self):
+        self._nonces: Dict[Tuple[str, str], int] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @staticmethod
+    def _key(web3: AsyncWeb3, address: str) -> Tuple[str, str]:
+        chain = getattr(web3.provider, "chain", None) or web3.provider.endpoint_uri
+        return chain, address.lower()
+
+    def lock(self, web3: AsyncWeb3, address: str) -> asyncio.Lock:
+        """Lock serializing nonce assignment and broadcast for one wallet."""
+        return self._locks[self._key(web3, address)]
+
+    async def get_nonce(self, web3: AsyncWeb3, address: str) -> int:
+        """Next nonce to use for the address, fetching the pending nonce on first use."""
+        key = self._key(web3, address)
+        if key not in self._nonces:
+            self._nonces[key] = await web3.eth.get_transaction_count(address, "pending")
+        return self._nonces[key]
+
+    def mark_used(self, web3: AsyncWeb3, address: str, nonce: int) -> None:
+        """Record that a transaction with this nonce was accepted by the node."""
+        key = self._key(web3, address)
+        self._nonces[key] = max(self._nonces.get(key, 0), nonce + 1)
+
+    def resync(self, web3: AsyncWeb3, address: str) -> None:
+        """Drop the local counter so the next get_nonce asks the node again."""
+        self._nonces.pop(self._key(web3, address), None)
+
+
+nonce_manager = NonceManager()
+
+
+async def sign_and_send(
+    web3: AsyncWeb3,
+    transaction: Dict,
+    private_key: str,
+    address: Optional[str] = None,
+) -> HexBytes:
+    """
+    Sign and broadcast a transaction using the managed nonce of the sender.
+
+    A nonce already present in the transaction is respected, otherwise the
+    assigned one is written into the dict, so re-sending the same dict
+    never broadcasts a second transaction. On nonce errors the local
+    counter is resynced before the error is re-raised. Accepted hashes are
+    recorded against the task being executed in the state store.
+
+    Args:
+        web3: AsyncWeb3 instance of the chain to send on
+        transaction: Transaction dict, without nonce
+        private_key: Sender private key
+        address: Sender address, derived from the key if not given
+
+    Returns:
+        Transaction hash
+    """
+    address = address or transaction.get("from") or Account.from_key(private_key).address
+
+    async with nonce_manager.lock(web3, address):
+        if "nonce" not in transaction:
+            transaction["nonce"] = await nonce_manager.get_nonce(web3, address)
+        signed_tx = web3.eth.account.sign_transaction(transaction, private_key)
+        try:
+            tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            if is_nonce_error(e):
+                logger.warning(f"{address} | Nonce out of sync, resyncing: {e}")
+                nonce_manager.resync(web3, address)
+            raise
+        nonce_manager.mark_used(web3, address, transaction["nonce"])
+    state_store.record_tx(tx_hash.to_0x_hex())
+    return tx_hash
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Dict, List, Optional, Union
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+# Seconds between receipt polls, roughly one block of the chain
+RECEIPT_POLL_INTERVAL = {
+    "Monad": 0.5,
+    "Sepolia": 4,
+    "Arbitrum": 1,
+    "Optimism": 1,
+    "Base": 1,
+}
+DEFAULT_RECEIPT_POLL_INTERVAL = 1
+# Hashes per eth_getTransactionReceipt batch, public RPCs reject larger batches
+RECEIPT_BATCH_SIZE = 100
+RECEIPT_TIMEOUT = 120
+
+
+class ReceiptWatcher:
+    """
+    Resolves transaction receipts of every account of one chain.
+
+    Pending hashes are collected in one place and polled with a single
+    JSON-RPC batch of eth_getTransactionReceipt per interval, instead of
+    one polling loop per transaction.
+    """
+
+    def __init__(self, web3: AsyncWeb3, poll_interval: float = DEFAULT_RECEIPT_POLL_INTERVAL):
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Callers waiting on each pending hash
+        self._waiters: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(self, tx_hash: Union[HexBytes, str]) -> asyncio.Future:
+        """Future resolved with the receipt once the transaction is mined."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._task.get_loop() is not loop:
+            # Left over from a previous event loop
+            self._pending.clear()
+            self._waiters.clear()
+            self._task = None
+
+        key = HexBytes(tx_hash).to_0x_hex()
+        future = self._pending.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._pending[key] = future
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    def forget(self, tx_hash: Union[HexBytes, str], future: asyncio.Future) -> None:
+        """
+        One caller stops waiting for the future watch() returned. The hash
+        is only dropped once no caller waits on it anymore.
+        """
+        key = HexBytes(tx_hash).to_0x_hex()
+        if self._pending.get(key) is not future:
+            return
+        self._waiters[key] -= 1
+        if self._waiters[key] <= 0:
+            del self._pending[key]
+            del self._waiters[key]
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            hashes = list(self._pending)
+            for i in range(0, len(hashes), RECEIPT_BATCH_SIZE):
+                try:
+                    await self._poll(hashes[i : i + RECEIPT_BATCH_SIZE])
+                except Exception as e:
+                    logger.warning(f"Receipt poll failed, retrying: {e}")
+
+    async def _poll(self, hashes: List[str]) -> None:
+        responses = await self.web3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+        )
+        if not isinstance(responses, list):
+            raise ValueError(responses.get("error", responses))
+
+        for tx_hash, response in zip(hashes, responses):
+            raw_receipt = response.get("result")
+            if not raw_receipt:
+                continue
+            future = self._pending.pop(tx_hash, None)
+            self._waiters.pop(tx_hash, None)
+            if future is not None and not future.done():
+                future.set_result(AttributeDict.recursive(receipt_formatter(raw_receipt)))
+
+
+_watchers: Dict[str, ReceiptWatcher] = {}
+
+
+def get_receipt_watcher(web3: AsyncWeb3) -> ReceiptWatcher:
+    """Get the process-wide receipt watcher of the chain behind a pooled AsyncWeb3."""
+    chain = getattr(web3.provider, "chain", None) or web3.provider.endpoint_uri
+    watcher = _watchers.get(chain)
+    if watcher is None:
+        watcher = ReceiptWatcher(
+            web3, RECEIPT_POLL_INTERVAL.get(chain, DEFAULT_RECEIPT_POLL_INTERVAL)
+        )
+        _watchers[chain] = watcher
+    return watcher
+
+
+async def wait_for_receipt(
+    web3: AsyncWeb3,
+    tx_hash: Union[HexBytes, str],
+    timeout: float = RECEIPT_TIMEOUT,
+) -> TxReceipt:
+    """
+    Drop-in replacement for eth.wait_for_transaction_receipt.
+
+    Args:
+        web3: AsyncWeb3 instance of the chain the transaction was sent on
+        tx_hash: Transaction hash
+        timeout: Seconds to wait before raising TimeExhausted
+
+    Returns:
+        Transaction receipt
+    """
+    watcher = get_receipt_watcher(web3)
+    future = watcher.watch(tx_hash)
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+    except asyncio.TimeoutError:
+        raise TimeExhausted(
+            f"Transaction {HexBytes(tx_hash).to_0x_hex()} is not in the chain "
+            f"after {timeout} seconds"
+        )
+    finally:
+        if not future.done():
+            watcher.forget(tx_hash, future)
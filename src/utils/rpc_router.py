@@ -0,0 +1,130 @@
+import statistics
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+# Number of recent requests used for latency percentiles and error rate
+STATS_WINDOW = 200
+# Endpoints with fewer samples than this are tried before scoring kicks in
+MIN_SAMPLES = 5
+# Latency samples recorded between two p95 recomputations
+P95_REFRESH_SAMPLES = 10
+# Weight of the error rate in the endpoint score
+ERROR_PENALTY = 10
+EJECT_BASE_SECONDS = 2
+EJECT_MAX_SECONDS = 120
+
+
+class EndpointStats:
+    """
+    Rolling latency and error statistics of one RPC endpoint. The p95
+    latency is cached and recomputed every P95_REFRESH_SAMPLES samples,
+    select() runs on every request and must not sort the window.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latencies: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self.outcomes: Deque[bool] = deque(maxlen=STATS_WINDOW)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self._p95: Optional[float] = None
+        self._samples_since_p95 = 0
+
+    def add_latency(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self._samples_since_p95 += 1
+        if (
+            len(self.latencies) < P95_REFRESH_SAMPLES
+            or self._samples_since_p95 >= P95_REFRESH_SAMPLES
+        ):
+            self._p95 = None
+
+    @property
+    def p50(self) -> float:
+        return statistics.median(self.latencies) if self.latencies else 0.0
+
+    @property
+    def p95(self) -> float:
+        if self._p95 is None:
+            if len(self.latencies) < 2:
+                self._p95 = self.p50
+            else:
+                self._p95 = statistics.quantiles(self.latencies, n=20)[-1]
+            self._samples_since_p95 = 0
+        return self._p95
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def score(self) -> float:
+        """Lower is healthier."""
+        return self.p95 * (1 + self.error_rate * ERROR_PENALTY)
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class RpcRouter:
+    """
+    Picks the healthiest endpoint for every request and ejects endpoints
+    that rate-limit or fail, with exponential backoff.
+    """
+
+    def __init__(self, urls: Iterable[str]):
+        self.endpoints: List[EndpointStats] = [EndpointStats(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError("RpcRouter needs at least one endpoint")
+
+    def select(self, exclude: Iterable[EndpointStats] = ()) -> EndpointStats:
+        """Return the best endpoint, skipping ejected and excluded ones if possible."""
+        now = time.monotonic()
+        excluded = set(id(endpoint) for endpoint in exclude)
+        candidates = [e for e in self.endpoints if id(e) not in excluded] or self.endpoints
+
+        available = [e for e in candidates if e.is_available(now)]
+        if not available:
+            # Everything is ejected - use the one that comes back first
+            return min(candidates, key=lambda e: e.ejected_until)
+
+        warming_up = [e for e in available if len(e.latencies) < MIN_SAMPLES]
+        if warming_up:
+            return min(warming_up, key=lambda e: len(e.outcomes))
+
+        return min(available, key=lambda e: e.score)
+
+    def record_success(self, endpoint: EndpointStats, latency: float) -> None:
+        endpoint.add_latency(latency)
+        endpoint.outcomes.append(True)
+        endpoint.consecutive_failures = 0
+
+    def record_failure(self, endpoint: EndpointStats, reason: str) -> None:
+        endpoint.outcomes.append(False)
+        endpoint.consecutive_failures += 1
+        backoff = min(
+            EJECT_MAX_SECONDS,
+            EJECT_BASE_SECONDS * 2 ** (endpoint.consecutive_failures - 1),
+        )
+        endpoint.ejected_until = time.monotonic() + backoff
+        if len(self.endpoints) > 1:
+            logger.warning(f"RPC {endpoint.url} ejected for {backoff}s: {reason}")
+
+    def snapshot(self) -> List[Dict]:
+        """Current statistics of every endpoint, for logging."""
+        now = time.monotonic()
+        return [
+            {
+                "url": e.url,
+                "p50": round(e.p50, 3),
+                "p95": round(e.p95, 3),
+                "error_rate": round(e.error_rate, 3),
+                "ejected": not e.is_available(now),
+            }
+            for e in self.endpoints
+        ]
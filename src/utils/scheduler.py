@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, List, Optional, Tuple, TypeVar
+
+# Accounts coming back from a pause are served before accounts that have not started
+RESUME_PRIORITY = 0
+START_PRIORITY = 1
+
+T = TypeVar("T")
+
+
+class Slot:
+    """Concurrency slot of one account, shared by the coroutines it spawns."""
+
+    __slots__ = ("scheduler", "held")
+
+    def __init__(self, scheduler: "Scheduler"):
+        self.scheduler = scheduler
+        self.held = False
+
+
+current_slot: contextvars.ContextVar[Optional[Slot]] = contextvars.ContextVar(
+    "current_slot", default=None
+)
+
+
+class Scheduler:
+    """
+    Hands out THREADS concurrency slots to accounts.
+
+    A slot is only held while the account is doing work: pause() gives it
+    back for the duration of the sleep and queues the account to get one
+    again when the sleep ends. Waiting accounts are served from a priority
+    queue, accounts resuming after a pause first and by wake-up time, so
+    running accounts finish before new ones start.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._free = slots
+        self._waiters: List[Tuple[int, float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int = START_PRIORITY) -> None:
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (priority, time.monotonic(), next(self._counter), future)
+        )
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we got cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[-1]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Run the block as one account, holding a slot whenever it is not paused."""
+        slot = Slot(self)
+        await self.acquire(START_PRIORITY)
+        slot.held = True
+        token = current_slot.set(slot)
+        try:
+            yield slot
+        finally:
+            current_slot.reset(token)
+            if slot.held:
+                slot.held = False
+                self.release()
+
+
+async def released(awaitable: Awaitable[T]) -> T:
+    """
+    Await awaitable with the account's slot released, like pause() does for
+    a sleep. The slot is re-acquired before returning or raising, unless the
+    account is cancelled. Outside of a scheduler slot this is a plain await.
+    """
+    slot = current_slot.get()
+    if slot is None or not slot.held:
+        return await awaitable
+
+    slot.held = False
+    slot.scheduler.release()
+    try:
+        result = await awaitable
+    except asyncio.CancelledError:
+        raise
+    except BaseException:
+        await slot.scheduler.acquire(RESUME_PRIORITY)
+        slot.held = True
+        raise
+    await slot.scheduler.acquire(RESUME_PRIORITY)
+    slot.held = True
+    return result
+
+
+async def pause(seconds: float) -> None:
+    """
+    Drop-in replacement for asyncio.sleep in account code.
+
+    The account's slot is released while sleeping and re-acquired before
+    returning. Outside of a scheduler slot this is a plain sleep.
+    """
+    if seconds <= 0:
+        await asyncio.sleep(seconds)
+        return
+    await released(asyncio.sleep(seconds))
@@ -0,0 +1,233 @@
+import asyncio
+import contextvars
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+STATE_DB_PATH = "data/state.db"
+# Seconds the writer thread waits for another shard's write lock
+STATE_DB_BUSY_TIMEOUT = 2
+# Tasks that report the current state of a wallet and are never skipped
+ALWAYS_RUN_TASKS = {"logs"}
+
+# (address, task, occurrence) of the task the current coroutine is executing
+current_task: contextvars.ContextVar[Optional[Tuple[str, str, int]]] = (
+    contextvars.ContextVar("current_task", default=None)
+)
+
+
+class StateStore:
+    """
+    Per-account, per-task progress kept in SQLite, along with the known
+    ERC-20 allowances of the accounts.
+
+    Every task run records its status, attempt count, timestamps and the
+    hashes of the transactions it sent, so a restarted run can skip what
+    already completed. The database is opened in WAL mode, writers never
+    block readers and each update is a single small transaction.
+
+    All queries run in order on one writer thread, never on the event
+    loop: updates are queued without waiting, reads are awaited and see
+    every update queued before them. Shards of a sharded run share the
+    file, a shard waiting for another one's lock only stalls its thread.
+    """
+
+    def __init__(self, path: str = STATE_DB_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=STATE_DB_BUSY_TIMEOUT, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS task_runs (
+                    address TEXT NOT NULL,
+                    task TEXT NOT NULL,
+                    occurrence INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    tx_hashes TEXT NOT NULL DEFAULT '',
+                    error TEXT,
+                    started_at REAL,
+                    finished_at REAL,
+                    PRIMARY KEY (address, task, occurrence)
+                )
+                """
+            )
+            # uint256 amounts do not fit SQLite integers, kept as decimal text
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS allowances (
+                    owner TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    spender TEXT NOT NULL,
+                    amount TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (owner, token, spender)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, query: str, params: tuple) -> List[tuple]:
+        conn = self._connect()
+        rows = conn.execute(query, params).fetchall()
+        conn.commit()
+        return rows
+
+    def _submit(self, query: str, params: tuple) -> Future:
+        """Queue a query on the writer thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-store")
+        return self._executor.submit(self._execute, query, params)
+
+    def _write(self, query: str, params: tuple, description: str) -> None:
+        """Queue an update without waiting for it, failures are logged."""
+
+        def done(future: Future) -> None:
+            if future.exception() is not None:
+                logger.warning(f"Failed to save {description}: {future.exception()}")
+
+        self._submit(query, params).add_done_callback(done)
+
+    async def _read(self, query: str, params: tuple) -> List[tuple]:
+        return await asyncio.wrap_future(self._submit(query, params))
+
+    async def is_completed(self, address: str, task: str, occurrence: int, window: float) -> bool:
+        """True if the task finished successfully less than window seconds ago."""
+        rows = await self._read(
+            "SELECT finished_at FROM task_runs "
+            "WHERE address = ? AND task = ? AND occurrence = ? AND status = 'success'",
+            (address.lower(), task, occurrence),
+        )
+        return bool(rows) and time.time() - rows[0][0] < window
+
+    def start(self, address: str, task: str, occurrence: int) -> None:
+        self._write(
+            """
+            INSERT INTO task_runs (address, task, occurrence, status, attempts, tx_hashes, started_at)
+            VALUES (?, ?, ?, 'running', 1, '', ?)
+            ON CONFLICT (address, task, occurrence) DO UPDATE SET
+                status = 'running',
+                attempts = attempts + 1,
+                tx_hashes = '',
+                error = NULL,
+                started_at = excluded.started_at,
+                finished_at = NULL
+            """,
+            (address.lower(), task, occurrence, time.time()),
+            f"start of {task} for {address}",
+        )
+
+    def finish(
+        self,
+        address: str,
+        task: str,
+        occurrence: int,
+        success: bool,
+        error: Optional[str] = None,
+    ) -> None:
+        self._write(
+            "UPDATE task_runs SET status = ?, error = ?, finished_at = ? "
+            "WHERE address = ? AND task = ? AND occurrence = ?",
+            (
+                "success" if success else "failed",
+                error,
+                time.time(),
+                address.lower(),
+                task,
+                occurrence,
+            ),
+            f"result of {task} for {address}",
+        )
+
+    def record_tx(self, tx_hash: str) -> None:
+        """Attach a sent transaction to the task the current coroutine is running."""
+        key = current_task.get()
+        if key is None:
+            return
+        address, task, occurrence = key
+        self._write(
+            "UPDATE task_runs SET tx_hashes = CASE WHEN tx_hashes = '' THEN ? "
+            "ELSE tx_hashes || ',' || ? END "
+            "WHERE address = ? AND task = ? AND occurrence = ?",
+            (tx_hash, tx_hash, address.lower(), task, occurrence),
+            f"transaction {tx_hash} of {address}",
+        )
+
+    async def get_allowance(self, owner: str, token: str, spender: str) -> Optional[int]:
+        rows = await self._read(
+            "SELECT amount FROM allowances WHERE owner = ? AND token = ? AND spender = ?",
+            (owner.lower(), token.lower(), spender.lower()),
+        )
+        return int(rows[0][0]) if rows else None
+
+    def set_allowance(self, owner: str, token: str, spender: str, amount: int) -> None:
+        self._write(
+            """
+            INSERT INTO allowances (owner, token, spender, amount, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (owner, token, spender) DO UPDATE SET
+                amount = excluded.amount,
+                updated_at = excluded.updated_at
+            """,
+            (owner.lower(), token.lower(), spender.lower(), str(amount), time.time()),
+            f"allowance of {owner}",
+        )
+
+    def delete_allowance(self, owner: str, token: str, spender: str) -> None:
+        self._write(
+            "DELETE FROM allowances WHERE owner = ? AND token = ? AND spender = ?",
+            (owner.lower(), token.lower(), spender.lower()),
+            f"allowance of {owner}",
+        )
+
+    def summary(self) -> Dict[str, int]:
+        """Number of task runs per status, waits for the queued updates. Called once the run is over."""
+        rows = self._submit(
+            "SELECT status, COUNT(*) FROM task_runs GROUP BY status", ()
+        ).result()
+        return dict(rows)
+
+    @contextmanager
+    def track(self, address: str, task: str, occurrence: int):
+        """
+        Mark the task running and route transactions sent inside to it.
+        The task is marked failed if the block raises, the caller calls
+        finish() otherwise.
+        """
+        self.start(address, task, occurrence)
+        token = current_task.set((address, task, occurrence))
+        try:
+            yield
+        except Exception as e:
+            self.finish(address, task, occurrence, False, str(e))
+            raise
+        finally:
+            current_task.reset(token)
+
+    def close(self) -> None:
+        """Write the queued updates and close the database."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+state_store = StateStore()
@@ -0,0 +1,279 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+
+from aiohttp import (
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
+from loguru import logger
+from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3._utils.batching import sort_batch_response_by_response_ids
+from web3.providers.rpc.utils import check_if_retry_on_failure
+from web3.types import RPCEndpoint, RPCResponse
+
+from src.utils.constants import CHAIN_RPCS
+from src.utils.rpc_router import RpcRouter
+
+# Upper bound of open sockets per provider, shared by all accounts of the process
+POOL_CONNECTIONS_LIMIT = 100
+POOL_CONNECTIONS_PER_HOST = 50
+POOL_KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 30
+# Concurrent requests of these methods are coalesced into one JSON-RPC batch
+BATCHED_METHODS = {
+    "eth_call",
+    "eth_getBalance",
+    "eth_getTransactionCount",
+    "eth_estimateGas",
+}
+BATCH_WINDOW_MS = 5
+MAX_BATCH_SIZE = 50
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends every request through one keep-alive
+    aiohttp session with a bounded connection pool, routing each call to
+    the healthiest of the configured endpoints.
+
+    Read calls issued within batch_window_ms of each other, by any account,
+    are sent as a single JSON-RPC batch and the responses handed back to
+    their callers. A window of 0 disables batching.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        chain: str,
+        limit: int = POOL_CONNECTIONS_LIMIT,
+        limit_per_host: int = POOL_CONNECTIONS_PER_HOST,
+        batch_window_ms: float = BATCH_WINDOW_MS,
+        **kwargs: Any,
+    ):
+        super().__init__(endpoints[0], **kwargs)
+        self.chain = chain
+        self.router = RpcRouter(endpoints)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session: Optional[ClientSession] = None
+        self.batch_window = batch_window_ms / 1000
+        self._queue: List[Tuple[RPCEndpoint, Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Batches being sent, referenced until they finish
+        self._send_tasks: Set[asyncio.Task] = set()
+
+    def _get_session(self) -> ClientSession:
+        """Return the pooled session, recreating it if its loop has gone away."""
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session._loop is not asyncio.get_running_loop()
+        ):
+            self._session = ClientSession(
+                raise_for_status=True,
+                timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+                connector=TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=300,
+                ),
+            )
+        return self._session
+
+    async def _post(self, endpoint_uri: str, request_data: bytes) -> bytes:
+        session = self._get_session()
+        async with session.post(
+            endpoint_uri, data=request_data, **self.get_request_kwargs()
+        ) as response:
+            return await response.read()
+
+    async def _post_routed(self, request_data: bytes) -> bytes:
+        """Send the request to the best endpoint, failing over on 429/5xx and network errors."""
+        tried = []
+        last_error: Optional[Exception] = None
+        for _ in range(len(self.router.endpoints)):
+            endpoint = self.router.select(exclude=tried)
+            tried.append(endpoint)
+            started = time.monotonic()
+            try:
+                raw_response = await self._post(endpoint.url, request_data)
+            except ClientResponseError as e:
+                if e.status != 429 and e.status < 500:
+                    raise
+                self.router.record_failure(endpoint, f"HTTP {e.status}")
+                last_error = e
+            except (ClientError, asyncio.TimeoutError) as e:
+                self.router.record_failure(endpoint, type(e).__name__)
+                last_error = e
+            else:
+                self.router.record_success(endpoint, time.monotonic() - started)
+                return raw_response
+        raise last_error
+
+    async def _make_request(self, method: RPCEndpoint, request_data: bytes) -> bytes:
+        return await self._post_with_retries([method], request_data)
+
+    async def _post_with_retries(self, methods: List[RPCEndpoint], request_data: bytes) -> bytes:
+        """
+        Send a request with web3's retry and backoff, if every method in it
+        is on the retry allowlist. Used for single requests and batches.
+        """
+        retry_configuration = self.exception_retry_configuration
+        if retry_configuration is None or not all(
+            check_if_retry_on_failure(method, retry_configuration.method_allowlist)
+            for method in methods
+        ):
+            return await self._post_routed(request_data)
+
+        for i in range(retry_configuration.retries):
+            try:
+                return await self._post_routed(request_data)
+            except tuple(retry_configuration.errors):
+                if i < retry_configuration.retries - 1:
+                    await asyncio.sleep(retry_configuration.backoff_factor * 2**i)
+                    continue
+                raise
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if not self.batch_window or method not in BATCHED_METHODS:
+            return await super().make_request(method, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((method, params, future))
+        if len(self._queue) >= MAX_BATCH_SIZE:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queued, self._queue = self._queue, []
+        if queued:
+            task = asyncio.ensure_future(self._send_queued(queued))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+    async def _send_single(self, method: RPCEndpoint, params: Any, future: asyncio.Future) -> None:
+        try:
+            response = await super().make_request(method, params)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(response)
+
+    async def _send_queued(self, queued: List[Tuple[RPCEndpoint, Any, asyncio.Future]]) -> None:
+        """Send coalesced requests as one batch and hand each caller its response."""
+        if len(queued) == 1:
+            await self._send_single(*queued[0])
+            return
+
+        try:
+            responses = await self.make_batch_request(
+                [(method, params) for method, params, _ in queued]
+            )
+        except Exception as e:
+            logger.warning(f"RPC batch of {len(queued)} calls failed, sending one by one: {e}")
+            responses = None
+
+        if not isinstance(responses, list) or len(responses) != len(queued):
+            # The batch failed, or the endpoint rejected or mangled it - send one by one
+            await asyncio.gather(*[self._send_single(*request) for request in queued])
+            return
+
+        for (_, _, future), response in zip(queued, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def make_batch_request(
+        self, batch_requests: List[Tuple[RPCEndpoint, Any]]
+    ) -> Union[List[RPCResponse], RPCResponse]:
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = await self._post_with_retries(
+            [method for method, _ in batch_requests], request_data
+        )
+        response = self.decode_rpc_response(raw_response)
+        if not isinstance(response, list):
+            # RPC errors return only one response with the error object
+            return response
+        return sort_batch_response_by_response_ids(cast(List[RPCResponse], response))
+
+    async def disconnect(self) -> None:
+        # Queued calls are sent and in-flight batches finish before the session closes
+        self._flush()
+        if self._send_tasks:
+            await asyncio.gather(*self._send_tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_pool: Dict[str, AsyncWeb3] = {}
+
+
+def _rpc_config():
+    """RPC section of config.yaml, None when running without a config file."""
+    from src.utils.config import get_config
+
+    try:
+        return get_config().RPC
+    except FileNotFoundError:
+        return None
+
+
+def _chain_endpoints(chain: str) -> List[str]:
+    """Endpoints for a chain: RPC.MONAD_RPC_URLS from config.yaml for Monad, CHAIN_RPCS otherwise."""
+    if chain not in CHAIN_RPCS:
+        raise ValueError(f"Unknown chain: {chain}")
+    if chain == "Monad":
+        rpc_config = _rpc_config()
+        if rpc_config is not None and rpc_config.MONAD_RPC_URLS:
+            return list(rpc_config.MONAD_RPC_URLS)
+    return [CHAIN_RPCS[chain]]
+
+
+def get_web3(chain: str = "Monad") -> AsyncWeb3:
+    """
+    Get the process-wide AsyncWeb3 instance for a chain.
+
+    Args:
+        chain: Chain name from CHAIN_RPCS (Monad, Sepolia, Arbitrum, Optimism, Base)
+
+    Returns:
+        AsyncWeb3 backed by a shared pooled provider
+    """
+    web3 = _pool.get(chain)
+    if web3 is None:
+        rpc_config = _rpc_config()
+        batch_window_ms = (
+            rpc_config.BATCH_WINDOW_MS if rpc_config is not None else BATCH_WINDOW_MS
+        )
+        web3 = AsyncWeb3(
+            PooledHTTPProvider(
+                _chain_endpoints(chain), chain, batch_window_ms=batch_window_ms
+            )
+        )
+        _pool[chain] = web3
+    return web3
+
+
+async def close_web3_pool() -> None:
+    """Close the pooled sessions of every chain."""
+    for chain, web3 in list(_pool.items()):
+        if len(web3.provider.router.endpoints) > 1:
+            logger.info(f"{chain} RPC stats: {web3.provider.router.snapshot()}")
+        try:
+            await web3.provider.disconnect()
+        except Exception as e:
+            logger.error(f"Failed to close {chain} RPC session: {e}")
+    _pool.clear()
@@ -0,0 +1,4 @@
+from starlabs.cli import main
+
+if __name__ == "__main__":
+    main()
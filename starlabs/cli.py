@@ -0,0 +1,162 @@
+"""
+Headless entry point, runs the farm without the interactive menu.
+
+    python -m starlabs run --profile FULL_TASK --accounts 1-500 --threads 64
+    python -m starlabs stats --keys data/private_keys.txt
+
+Logs go to stderr and logs/app.log, stdout only carries JSON lines
+progress events, one object per line with an "event" field.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List, Tuple
+
+import urllib3
+
+import src.utils
+from process import run_farm
+from src.model.help.stats import collect_fleet_stats
+from src.utils.config import Config, get_config
+from src.utils.logs import LogSettings, configure_logging
+from src.utils.state_store import state_store
+from src.utils.web3_pool import close_web3_pool
+
+
+def emit(event: str, **fields) -> None:
+    """Write one progress event to stdout."""
+    print(json.dumps({"event": event, "time": round(time.time(), 3), **fields}), flush=True)
+
+
+def setup_logging(level: str) -> None:
+    urllib3.disable_warnings()
+    configure_logging(LogSettings(console="stderr", level=level))
+
+
+def parse_accounts(value: str) -> Tuple[Tuple[int, int], List[int]]:
+    """
+    "1-500" -> ACCOUNTS_RANGE, "3,7,9" -> EXACT_ACCOUNTS_TO_USE, "all" -> every account.
+    """
+    value = value.strip().lower()
+    try:
+        if value == "all":
+            return (0, 0), []
+        if "-" in value:
+            start, end = (int(part) for part in value.split("-", 1))
+            if start < 1 or end < start:
+                raise ValueError
+            return (start, end), []
+        return (0, 0), [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid accounts {value!r}, expected 1-500, 3,7,9 or all"
+        )
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="starlabs", description="StarLabs Monad headless runner")
+    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument("--log-level", default="INFO")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the tasks of a profile")
+    run.add_argument(
+        "--profile",
+        action="append",
+        help="Preset from tasks.py, can be repeated (default: TASKS of tasks.py)",
+    )
+    run.add_argument(
+        "--accounts",
+        type=parse_accounts,
+        help="Accounts to use: 1-500, 3,7,9 or all (default: config.yaml)",
+    )
+    run.add_argument("--threads", type=int, help="Accounts processed at once (default: config.yaml)")
+    run.add_argument(
+        "--processes",
+        type=int,
+        help="Worker processes the accounts are split across (default: config.yaml)",
+    )
+    run.add_argument("--keys", default="data/private_keys.txt")
+    run.add_argument("--proxies", default="data/proxies.txt")
+    run.add_argument("--faucet-keys", default="data/keys_for_faucet.txt")
+
+    stats = commands.add_parser("stats", help="Print balance and transaction count of every wallet")
+    stats.add_argument("--keys", default="data/private_keys.txt")
+
+    return parser.parse_args(argv)
+
+
+def load_config(args: argparse.Namespace) -> Config:
+    """Load config.yaml once and make it the process-wide config."""
+    config = Config.load(args.config, presets=getattr(args, "profile", None))
+    if getattr(args, "accounts", None) is not None:
+        config.SETTINGS.ACCOUNTS_RANGE, config.SETTINGS.EXACT_ACCOUNTS_TO_USE = args.accounts
+    if getattr(args, "threads", None):
+        config.SETTINGS.THREADS = args.threads
+    if getattr(args, "processes", None):
+        config.SETTINGS.PROCESSES = args.processes
+    get_config._config = config
+    return config
+
+
+async def run(args: argparse.Namespace) -> int:
+    config = load_config(args)
+    started = time.monotonic()
+    done = 0
+
+    def on_account_done(account_index: int, success: bool) -> None:
+        nonlocal done
+        done += 1
+        emit("account", account=account_index, success=success, done=done)
+
+    emit(
+        "started",
+        profiles=args.profile,
+        accounts_range=list(config.SETTINGS.ACCOUNTS_RANGE),
+        exact_accounts=config.SETTINGS.EXACT_ACCOUNTS_TO_USE,
+        threads=config.SETTINGS.THREADS,
+        processes=config.SETTINGS.PROCESSES,
+    )
+    result = await run_farm(
+        config,
+        keys_path=args.keys,
+        proxies_path=args.proxies,
+        faucet_keys_path=args.faucet_keys,
+        on_account_done=on_account_done,
+    )
+    succeeded, failed = result or (0, 0)
+    emit(
+        "finished",
+        succeeded=succeeded,
+        failed=failed,
+        elapsed=round(time.monotonic() - started, 1),
+        tasks=state_store.summary(),
+    )
+    state_store.close()
+    return 0 if result is not None and not failed else 1
+
+
+async def stats(args: argparse.Namespace) -> int:
+    config = load_config(args)
+    private_keys = src.utils.read_txt_file("private keys", args.keys)
+    success = await collect_fleet_stats(config, private_keys)
+    await close_web3_pool()
+    for wallet in sorted(config.WALLETS.wallets, key=lambda wallet: wallet.account_index):
+        emit(
+            "wallet",
+            account=wallet.account_index,
+            address=wallet.address,
+            balance=wallet.balance,
+            transactions=wallet.transactions,
+        )
+    return 0 if success else 1
+
+
+def main(argv: List[str] = None) -> None:
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+    command = run if args.command == "run" else stats
+    sys.exit(asyncio.run(command(args)))